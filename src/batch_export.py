@@ -0,0 +1,342 @@
+"""Batch export of many months into one directory on a process pool.
+
+The ledger is read and bucketed by month once in the parent process; savings
+balances for every requested month come from the same sweep. Each worker then
+receives only the rows of its month (and the month before, for comparisons)
+plus those precomputed balances, and writes CSV, PNG and/or PDF files with the
+headless report engine. Workers are spawned rather than forked so they never
+inherit a live Qt application.
+
+Given a ``RenderCache``, the parent looks every month up by a content key (its
+rows, balances, budgets and formats) before submitting it. A month whose
+inputs have not changed since an earlier export has its files copied out of
+the cache, and the pool is not started at all when every month is cached.
+
+    python batch_export.py --from 2025-01 --to 2025-12 --formats csv,pdf --output-dir reports/
+    python batch_export.py --from 2025-01 --to 2025-12 --output-dir reports/ --cache-dir ~/.finfix_data/render_cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+
+from finfix.core import (
+    DEFAULT_DATA_DIR,
+    group_by_month,
+    month_range,
+    month_summary,
+    previous_period,
+    read_budgets,
+    read_transactions,
+    savings_snapshots,
+)
+from finfix.export import export_csv
+from render_cache import RenderCache, cache_key
+
+FORMATS = ("csv", "png", "pdf")
+
+
+@dataclass
+class MonthJob:
+    year: int
+    month: int
+    rows: list[dict]
+    previous_rows: list[dict]
+    savings: dict[str, Decimal]
+    previous_savings: dict[str, Decimal]
+    budgets: dict[str, Decimal]
+    formats: tuple[str, ...]
+    output_dir: Path
+    compare: bool = False
+    today: date | None = None
+
+
+@dataclass
+class MonthResult:
+    year: int
+    month: int
+    files: list[Path] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def period(self) -> str:
+        return f"{self.year}-{self.month:02d}"
+
+
+def plan_jobs(
+    transactions: list[dict],
+    budgets: dict[str, Decimal],
+    periods: list[tuple[int, int]],
+    formats: tuple[str, ...],
+    output_dir: Path,
+    compare: bool = False,
+    today: date | None = None,
+) -> list[MonthJob]:
+    """Split one loaded ledger into per-month jobs with shared aggregates attached."""
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"unsupported format(s): {', '.join(sorted(unknown))}")
+    today = today or date.today()
+    groups = group_by_month(transactions)
+    wanted = set(periods) | {previous_period(*period) for period in periods}
+    snapshots = savings_snapshots(groups, list(wanted))
+    jobs = []
+    for year, month in periods:
+        previous = previous_period(year, month)
+        jobs.append(
+            MonthJob(
+                year=year,
+                month=month,
+                rows=groups.get((year, month), []),
+                previous_rows=groups.get(previous, []) if compare else [],
+                savings=snapshots[(year, month)],
+                previous_savings=snapshots[previous],
+                budgets=budgets,
+                formats=formats,
+                output_dir=Path(output_dir),
+                compare=compare,
+                today=today,
+            )
+        )
+    return jobs
+
+
+def export_month(job: MonthJob) -> MonthResult:
+    """Write every requested format for one month; runs inside a worker process."""
+    started = time.perf_counter()
+    result = MonthResult(job.year, job.month)
+    stem = f"finfix_{job.year}_{job.month:02d}"
+    try:
+        job.output_dir.mkdir(parents=True, exist_ok=True)
+        if "csv" in job.formats:
+            stage = time.perf_counter()
+            target = job.output_dir / f"{stem}.csv"
+            export_csv(job.rows, target)
+            result.files.append(target)
+            result.timings["csv"] = time.perf_counter() - stage
+        if "png" in job.formats or "pdf" in job.formats:
+            import report_pdf
+
+            stage = time.perf_counter()
+            summary = month_summary(
+                job.previous_rows + job.rows,
+                job.budgets,
+                job.year,
+                job.month,
+                compare=job.compare,
+                today=job.today,
+                savings=job.savings,
+                previous_savings=job.previous_savings,
+            )
+            result.timings["summary"] = time.perf_counter() - stage
+            if "pdf" in job.formats:
+                stage = time.perf_counter()
+                result.files.append(report_pdf.render_report_pdf(job.output_dir / f"{stem}.pdf", [summary]))
+                result.timings["pdf"] = time.perf_counter() - stage
+            if "png" in job.formats:
+                stage = time.perf_counter()
+                result.files.extend(report_pdf.render_report_png(job.output_dir / f"{stem}.png", summary))
+                result.timings["png"] = time.perf_counter() - stage
+    except Exception as exc:
+        result.error = str(exc) or exc.__class__.__name__
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def job_cache_key(job: MonthJob) -> str:
+    """Content key of everything a month's files are made from; the output folder is not part of it."""
+    payload = {
+        "formats": list(job.formats),
+        "rows": job.rows,
+        "previous_rows": job.previous_rows,
+        "savings": job.savings,
+        "previous_savings": job.previous_savings,
+        "budgets": job.budgets,
+        "compare": job.compare,
+        "today": job.today,
+    }
+    return cache_key("batch", f"{job.year}-{job.month:02d}", "", (0, 0), 0, payload)
+
+
+def restore_cached(job: MonthJob, key: str, cache: RenderCache) -> MonthResult | None:
+    """Write a month's files from ``cache``; ``None`` when any of them is missing."""
+    started = time.perf_counter()
+    manifest = cache.get(key)
+    if manifest is None:
+        return None
+    names = json.loads(manifest)
+    contents = [cache.get(f"{key}-{index}") for index in range(len(names))]
+    if any(data is None for data in contents):
+        return None
+    result = MonthResult(job.year, job.month)
+    try:
+        job.output_dir.mkdir(parents=True, exist_ok=True)
+        for name, data in zip(names, contents):
+            target = job.output_dir / name
+            target.write_bytes(data)
+            result.files.append(target)
+    except OSError as exc:
+        result.error = str(exc)
+    result.elapsed = result.timings["cache"] = time.perf_counter() - started
+    return result
+
+
+def store_cached(key: str, result: MonthResult, cache: RenderCache) -> None:
+    """Keep a successfully exported month's files under ``key``; the manifest goes in last."""
+    if result.error:
+        return
+    try:
+        contents = [path.read_bytes() for path in result.files]
+    except OSError:
+        return
+    for index, data in enumerate(contents):
+        cache.put(f"{key}-{index}", data)
+    cache.put(key, json.dumps([path.name for path in result.files]).encode("utf-8"))
+
+
+def describe_result(result: MonthResult) -> str:
+    """One log line for a finished month, e.g. ``2025-03 412 ms (csv 3 ms, pdf 40 ms)``."""
+    if result.error:
+        return f"{result.period} FAILED: {result.error}"
+    stages = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in result.timings.items())
+    return f"{result.period} {result.elapsed * 1000:.0f} ms ({stages})"
+
+
+def _init_worker() -> None:
+    # Workers only paint offscreen; they must never try to reach a display.
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+
+def default_workers(job_count: int) -> int:
+    return max(1, min(job_count, (os.cpu_count() or 2) - 1, 8))
+
+
+def run_batch(
+    jobs: list[MonthJob],
+    max_workers: int | None = None,
+    progress: Callable[[int, int, MonthResult], None] | None = None,
+    cancelled: threading.Event | None = None,
+    cache: RenderCache | None = None,
+) -> list[MonthResult]:
+    """Run ``jobs`` on a spawned process pool; results come back in month order.
+
+    ``progress(done, total, result)`` is called from the calling thread as each
+    month finishes. Setting ``cancelled`` stops queued months from starting.
+    Months found in ``cache`` are copied out of it instead of being rendered.
+    """
+    if not jobs:
+        return []
+    results: list[MonthResult] = []
+
+    def finish(result: MonthResult) -> None:
+        results.append(result)
+        if progress is not None:
+            progress(len(results), len(jobs), result)
+
+    to_render: list[tuple[MonthJob, str | None]] = []
+    for job in jobs:
+        key = None
+        if cache is not None:
+            key = job_cache_key(job)
+            cached = restore_cached(job, key, cache)
+            if cached is not None:
+                finish(cached)
+                continue
+        to_render.append((job, key))
+    if not to_render:  # nothing changed: skip spawning the pool altogether
+        results.sort(key=lambda result: (result.year, result.month))
+        return results
+
+    workers = max_workers or default_workers(len(to_render))
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        submitted = {pool.submit(export_month, job): (job, key) for job, key in to_render}
+        pending = set(submitted)
+        while pending:
+            done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                job, key = submitted[future]
+                try:
+                    result = future.result()
+                except Exception as exc:  # a worker died; keep the rest of the batch going
+                    result = MonthResult(job.year, job.month, error=str(exc) or exc.__class__.__name__)
+                if key is not None and cache is not None:
+                    store_cached(key, result, cache)
+                finish(result)
+            if cancelled is not None and cancelled.is_set():
+                for future in pending:
+                    future.cancel()
+    results.sort(key=lambda result: (result.year, result.month))
+    return results
+
+
+def _parse_period(text: str) -> tuple[int, int]:
+    year_text, _, month_text = text.partition("-")
+    try:
+        year, month = int(year_text), int(month_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {text!r}") from None
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(f"invalid month: {text}")
+    return year, month
+
+
+def _parse_formats(text: str) -> tuple[str, ...]:
+    formats = tuple(dict.fromkeys(part.strip().lower() for part in text.split(",") if part.strip()))
+    unknown = set(formats) - set(FORMATS)
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(f"formats must be a comma list of {', '.join(FORMATS)}")
+    return formats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export many FinFix months at once.")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="folder holding transactions.csv and budgets.csv")
+    parser.add_argument("--from", dest="start", type=_parse_period, required=True, help="first month, YYYY-MM")
+    parser.add_argument("--to", dest="end", type=_parse_period, help="last month, YYYY-MM (defaults to --from)")
+    parser.add_argument("--formats", type=_parse_formats, default=("csv", "pdf"), help="comma list of csv,png,pdf")
+    parser.add_argument("--output-dir", type=Path, required=True)
+    parser.add_argument("--compare", action="store_true", help="show deltas against the previous month")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPUs - 1, max 8)")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="reuse files of unchanged months kept in this folder")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    transactions = read_transactions(args.data_dir / "transactions.csv")
+    budgets = read_budgets(args.data_dir / "budgets.csv")
+    periods = month_range(args.start, args.end or args.start)
+    jobs = plan_jobs(transactions, budgets, periods, args.formats, args.output_dir, compare=args.compare)
+    prepared = time.perf_counter() - started
+
+    def report(done: int, total: int, result: MonthResult) -> None:
+        print(f"[{done}/{total}] {describe_result(result)}", flush=True)
+
+    cache = RenderCache(disk_dir=args.cache_dir) if args.cache_dir else None
+    results = run_batch(jobs, args.workers, progress=report, cache=cache)
+    failures = [result for result in results if result.error]
+    total = time.perf_counter() - started
+    print(
+        f"Exported {len(results) - len(failures)}/{len(jobs)} month(s) to {args.output_dir} "
+        f"in {total:.2f} s (ledger load {prepared * 1000:.0f} ms)"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
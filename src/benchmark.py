@@ -0,0 +1,424 @@
+"""Headless performance benchmarks for FinFix.
+
+For each ledger size a seeded synthetic data folder is generated (see
+``finfix.synth``), the app is pointed at it, and the storage helpers, the
+main window's load/aggregate/summary paths, transaction removal and the
+exports are timed. Everything runs offscreen; results are written as JSON so
+runs from different commits can be compared.
+
+With ``--baseline`` the run is also checked against stored per-scenario
+(rows x operation) results. A scenario regresses when its median exceeds the
+baseline median by more than both the noise band (a multiple of the MAD) and
+its budget (a fraction of the baseline median); the run then exits with
+status 1 and prints a diff report.
+
+    QT_QPA_PLATFORM=offscreen python benchmark.py --rows 10000,100000 --repeat 5 --output bench.json
+    python benchmark.py --rows 10000 --baseline bench_baseline.json --update-baseline
+    python benchmark.py --rows 10000 --baseline bench_baseline.json --budget load_ledger=0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from finfix.synth import write_data_dir
+
+RESULTS_VERSION = 1
+BASELINE_VERSION = 1
+DEFAULT_ROWS = (10_000, 100_000)
+DEFAULT_TOLERANCE = 0.10  # allowed slowdown as a fraction of the baseline median
+DEFAULT_MAD_FACTOR = 3.0
+MIN_DELTA_SECONDS = 0.001  # never flag sub-millisecond differences
+MAD_TO_SIGMA = 1.4826  # scales a MAD to a normal standard deviation
+
+
+@dataclass
+class Operation:
+    name: str
+    run: Callable[[], object]
+    setup: Callable[[], None] | None = None
+    teardown: Callable[[], None] | None = None
+
+
+def summarize(samples: list[float]) -> dict:
+    """Median-centred statistics for one scenario's timings (seconds)."""
+    median = statistics.median(samples)
+    return {
+        "samples": samples,
+        "median": median,
+        "mad": statistics.median(abs(sample - median) for sample in samples),
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+    }
+
+
+def scenario_key(rows: int, operation: str) -> str:
+    return f"{operation}[{rows}]"
+
+
+def git_revision() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def point_app_at(app_module, data_dir: Path) -> None:
+    """Redirect ``main``'s storage paths to ``data_dir`` and turn off on-disk caches."""
+    app_module.DATA_DIR = data_dir
+    app_module.LEGACY_DATA_DIR = data_dir / "legacy"
+    app_module.LEDGER_CSV = data_dir / "transactions.csv"
+    app_module.BUDGET_CSV = data_dir / "budgets.csv"
+    app_module.LEGACY_LEDGER_CSV = app_module.LEGACY_DATA_DIR / "transactions.csv"
+    app_module.LEGACY_BUDGET_CSV = app_module.LEGACY_DATA_DIR / "budgets.csv"
+    app_module.CURRENCY_JSON = data_dir / "rates.json"
+    app_module.RENDER_CACHE_DIR = data_dir / "render_cache"
+    app_module.IMPORT_MAPPING_JSON = data_dir / "import_mapping.json"
+    app_module.SEARCH_INDEX_JSON = data_dir / "search_index.json"
+    app_module.ENABLE_RENDER_DISK_CACHE = False
+    app_module.ENABLE_SEARCH_INDEX_CACHE = False
+
+
+def _last_period(ledger: Path) -> tuple[int, int]:
+    with ledger.open("rb") as f:
+        f.seek(max(0, ledger.stat().st_size - 4096))
+        last_line = f.read().decode("utf-8").strip().splitlines()[-1]
+    day = date.fromisoformat(last_line.split(",")[1])
+    return day.year, day.month
+
+
+def build_operations(app_module, window, data_dir: Path, pristine: Path, output_dir: Path) -> list[Operation]:
+    from finfix import columnar
+    from finfix.core import month_summary
+    from finfix.history import Command
+    from finfix.export import export_csv, export_ledger_csv
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    from report_pdf import render_report_pdf, render_report_png
+
+    ledger = app_module.LEDGER_CSV
+    year, month = _last_period(ledger)
+    month_start = date(year, month, 1)
+    month_end = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    middle_id = window.transactions[len(window.transactions) // 2]["tx_id"] if window.transactions else "TX001"
+
+    def restore_ledger() -> None:
+        shutil.copyfile(pristine, ledger)
+
+    def restore_window() -> None:
+        restore_ledger()
+        window.load_ledger()
+
+    def add_transaction() -> None:
+        window.amount_input.setText("12.50")
+        window.desc_input.setText("Benchmark entry")
+        window.category_input.setEditText("Benchmark")
+        window.add_tx("expense")
+
+    def delete_transaction() -> None:
+        window.run_command(lambda: Command.deletion("delete", window.ledger, window.ledger.index_of(middle_id)))
+
+    def summary_png() -> int:
+        encoded = QByteArray()
+        buffer = QBuffer(encoded)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        window.summary_card.grab().save(buffer, "PNG")
+        buffer.close()
+        return encoded.size()
+
+    def summary() -> dict:
+        return month_summary(window.transactions, window.budget_map, year, month, today=month_end)
+
+    operations = [
+        Operation("ensure_storage", app_module.ensure_storage),
+        Operation("migrate_ledger_schema", app_module.migrate_ledger_schema),
+        Operation("next_tx_id", app_module.next_tx_id),
+        Operation("load_ledger", window.load_ledger),
+        Operation("load_budgets", window.load_budgets),
+        Operation("_aggregate_month", lambda: window._aggregate_month(year, month)),
+        Operation("update_summary", window.update_summary),
+        Operation("add_transaction", add_transaction, setup=restore_ledger, teardown=restore_window),
+        Operation("delete_transaction", delete_transaction, setup=restore_window, teardown=restore_window),
+        Operation(
+            "export_month_csv",
+            lambda: export_csv(window.transactions, output_dir / "month.csv", start=month_start, end=month_end),
+        ),
+        Operation("export_ledger_csv", lambda: export_ledger_csv(ledger, output_dir / "ledger.csv")),
+        Operation("export_summary_png", summary_png),
+        Operation("export_report_pdf", lambda: render_report_pdf(output_dir / "report.pdf", [summary()])),
+        Operation("export_report_png", lambda: render_report_png(output_dir / "report.png", summary())),
+    ]
+    if columnar.PARQUET_AVAILABLE:
+        operations.append(
+            Operation("export_parquet", lambda: columnar.export_ledger_columnar(ledger, output_dir / "ledger.parquet", "parquet"))
+        )
+    return operations
+
+
+def _select_period(window, year: int, month: int) -> None:
+    window.year_combo.setCurrentText(str(year))
+    index = window.month_combo.findData(month)
+    if index >= 0:
+        window.month_combo.setCurrentIndex(index)
+
+
+def time_operation(operation: Operation, repeat: int, warmup: int, drain: Callable[[], None]) -> list[float]:
+    samples = []
+    for iteration in range(warmup + repeat):
+        if operation.setup is not None:
+            operation.setup()
+        gc.collect()
+        started = time.perf_counter()
+        operation.run()
+        elapsed = time.perf_counter() - started
+        drain()
+        if operation.teardown is not None:
+            operation.teardown()
+        if iteration >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def run_suite(
+    rows_list: list[int],
+    repeat: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+    only: set[str] | None = None,
+    workdir: Path | None = None,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Time every operation for every ledger size; return the results document."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    import main as app_module
+
+    def drain() -> None:
+        # Let queued chart renders and animations settle outside the timed region.
+        app.processEvents()
+
+    results = []
+    root = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix="finfix_bench_"))
+    try:
+        for rows in rows_list:
+            data_dir = root / f"rows_{rows}"
+            output_dir = data_dir / "exports"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            started = time.perf_counter()
+            write_data_dir(data_dir, rows, seed)
+            pristine = data_dir / "transactions.pristine.csv"
+            shutil.copyfile(data_dir / "transactions.csv", pristine)
+            log(f"[{rows} rows] generated in {time.perf_counter() - started:.1f} s")
+
+            point_app_at(app_module, data_dir)
+            window = app_module.BudgetTracker()
+            _select_period(window, *_last_period(pristine))
+            drain()
+            for operation in build_operations(app_module, window, data_dir, pristine, output_dir):
+                if only and operation.name not in only:
+                    continue
+                samples = time_operation(operation, repeat, warmup, drain)
+                stats = summarize(samples)
+                results.append({"rows": rows, "operation": operation.name, **stats})
+                log(f"[{rows} rows] {operation.name:<28} median {stats['median'] * 1000:10.2f} ms  mad {stats['mad'] * 1000:8.2f} ms")
+            window.close()
+            window.deleteLater()
+            drain()
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def write_results(document: dict, path: Path) -> None:
+    Path(path).write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    """Stored scenarios keyed by ``scenario_key``; empty when the file does not exist yet."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path}: unsupported baseline version {data.get('version')!r}")
+    return data["scenarios"]
+
+
+def update_baseline(path: Path, document: dict) -> int:
+    """Store (or replace) every scenario of ``document`` in the baseline file; return how many."""
+    scenarios = load_baseline(path)
+    meta = document.get("meta", {})
+    for result in document["results"]:
+        scenarios[scenario_key(result["rows"], result["operation"])] = {
+            **result,
+            "commit": meta.get("commit"),
+            "created": meta.get("created"),
+        }
+    Path(path).write_text(json.dumps({"version": BASELINE_VERSION, "scenarios": scenarios}, indent=2), encoding="utf-8")
+    return len(document["results"])
+
+
+@dataclass
+class Comparison:
+    key: str
+    status: str  # "ok", "regressed", "improved", "new"
+    baseline: float | None = None
+    current: float | None = None
+    allowed: float | None = None
+
+    @property
+    def change(self) -> float | None:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1.0
+
+
+def compare_results(
+    document: dict,
+    baseline: dict[str, dict],
+    tolerance: float = DEFAULT_TOLERANCE,
+    mad_factor: float = DEFAULT_MAD_FACTOR,
+    budgets: dict[str, float] | None = None,
+) -> list[Comparison]:
+    """Judge each scenario of ``document`` against its baseline median.
+
+    The allowed slowdown is the largest of the operation's budget (``budgets``
+    or ``tolerance``, as a fraction of the baseline median), ``mad_factor``
+    noise sigmas estimated from the larger of the two MADs, and
+    ``MIN_DELTA_SECONDS``.
+    """
+    budgets = budgets or {}
+    comparisons = []
+    for result in document["results"]:
+        key = scenario_key(result["rows"], result["operation"])
+        stored = baseline.get(key)
+        current = result["median"]
+        if stored is None:
+            comparisons.append(Comparison(key, "new", current=current))
+            continue
+        base = stored["median"]
+        noise = mad_factor * MAD_TO_SIGMA * max(stored.get("mad", 0.0), result.get("mad", 0.0))
+        budget = budgets.get(result["operation"], tolerance) * base
+        allowed = max(budget, noise, MIN_DELTA_SECONDS)
+        if current > base + allowed:
+            status = "regressed"
+        elif current < base - allowed:
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(key, status, base, current, allowed))
+    return comparisons
+
+
+def format_report(comparisons: list[Comparison]) -> str:
+    """Fixed-width diff table, regressions first."""
+    order = {"regressed": 0, "improved": 1, "new": 2, "ok": 3}
+    lines = [f"{'scenario':<42} {'baseline':>12} {'current':>12} {'change':>9} {'allowed':>11}  status"]
+    for item in sorted(comparisons, key=lambda item: (order[item.status], item.key)):
+        baseline = f"{item.baseline * 1000:.2f} ms" if item.baseline is not None else "-"
+        current = f"{item.current * 1000:.2f} ms" if item.current is not None else "-"
+        change = f"{item.change:+.1%}" if item.change is not None else "-"
+        allowed = f"+{item.allowed * 1000:.2f} ms" if item.allowed is not None else "-"
+        lines.append(f"{item.key:<42} {baseline:>12} {current:>12} {change:>9} {allowed:>11}  {item.status.upper()}")
+    regressed = sum(item.status == "regressed" for item in comparisons)
+    lines.append(f"{regressed} regression(s) in {len(comparisons)} scenario(s)")
+    return "\n".join(lines)
+
+
+def _parse_budget(text: str) -> tuple[str, float]:
+    operation, _, fraction = text.partition("=")
+    try:
+        value = float(fraction)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected OPERATION=FRACTION, got {text!r}") from None
+    if not operation or value < 0:
+        raise argparse.ArgumentTypeError(f"expected OPERATION=FRACTION, got {text!r}")
+    return operation, value
+
+
+def _parse_rows(text: str) -> list[int]:
+    try:
+        rows = [int(part.replace("_", "")) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a comma list of row counts, got {text!r}") from None
+    if not rows or min(rows) <= 0:
+        raise argparse.ArgumentTypeError("row counts must be positive")
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FinFix on synthetic ledgers.")
+    parser.add_argument("--rows", type=_parse_rows, default=list(DEFAULT_ROWS), help="comma list, e.g. 10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per operation")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before measuring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", action="append", help="operation to run; repeat for several (default: all)")
+    parser.add_argument("--workdir", type=Path, help="keep generated data here instead of a temp folder")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    gate = parser.add_argument_group("regression gate")
+    gate.add_argument("--baseline", type=Path, help="baseline JSON to compare against")
+    gate.add_argument("--update-baseline", action="store_true", help="store this run's scenarios in --baseline instead of gating")
+    gate.add_argument("--results", type=Path, help="compare an existing results JSON instead of running the suite")
+    gate.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown fraction (default 0.10)")
+    gate.add_argument("--mad-factor", type=float, default=DEFAULT_MAD_FACTOR, help="noise band in MAD-derived sigmas (default 3)")
+    gate.add_argument("--budget", type=_parse_budget, action="append", default=[], help="per-operation budget, e.g. update_summary=0.05")
+    args = parser.parse_args(argv)
+    if (args.update_baseline or args.results) and not args.baseline:
+        parser.error("--update-baseline and --results need --baseline")
+
+    if args.results:
+        document = json.loads(args.results.read_text(encoding="utf-8"))
+    else:
+        document = run_suite(args.rows, args.repeat, args.warmup, args.seed, set(args.only or ()), args.workdir)
+        write_results(document, args.output)
+        print(f"Wrote {len(document['results'])} result(s) to {args.output}")
+    if not args.baseline:
+        return 0
+    if args.update_baseline:
+        count = update_baseline(args.baseline, document)
+        print(f"Stored {count} scenario(s) in {args.baseline}")
+        return 0
+
+    comparisons = compare_results(document, load_baseline(args.baseline), args.tolerance, args.mad_factor, dict(args.budget))
+    print(format_report(comparisons))
+    return 1 if any(item.status == "regressed" for item in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
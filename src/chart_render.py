@@ -0,0 +1,233 @@
+"""Off-thread chart rasterization.
+
+Charts are built with the pure Agg backend on a worker thread and handed back
+to the GUI thread as a ``QImage`` that wraps Agg's RGBA buffer without copying
+it. Each chart key only ever has one live render; submitting a new request for
+the same key cancels the previous one. With a ``RenderCache`` attached,
+identical requests are answered from the cache instead of being redrawn.
+"""
+
+from __future__ import annotations
+
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import charts
+from finfix.instrument import span
+from render_cache import RenderCache, cache_key
+
+_RGBA_HEADER = struct.Struct("<4sII")
+
+
+class RenderCancelled(Exception):
+    """Raised inside a worker when a newer request superseded the render."""
+
+
+@dataclass(frozen=True)
+class ChartRequest:
+    kind: str
+    categories: tuple[str, ...]
+    values: tuple[float, ...]
+    period_label: str
+    dark_mode: bool
+    width_px: int = 720
+    height_px: int = 480
+    dpi: float = 100.0
+
+
+def request_cache_key(request: ChartRequest) -> str:
+    return cache_key(
+        request.kind,
+        request.period_label,
+        "dark" if request.dark_mode else "light",
+        (request.width_px, request.height_px),
+        request.dpi,
+        {"categories": request.categories, "values": request.values},
+    )
+
+
+class RenderedChart:
+    """A finished render: the QImage plus the buffer it points into."""
+
+    def __init__(
+        self,
+        request: ChartRequest,
+        buffer: memoryview,
+        width: int,
+        height: int,
+        elapsed: float,
+        cached: bool = False,
+    ):
+        self.request = request
+        self.elapsed = elapsed
+        self.cached = cached
+        # QImage does not own the pixels, so the buffer must outlive the image.
+        self._buffer = buffer
+        self.image = QImage(buffer, width, height, width * 4, QImage.Format.Format_RGBA8888)
+
+
+def render_rgba(request: ChartRequest, cancelled: threading.Event | None = None) -> tuple[memoryview, int, int]:
+    """Build the chart on a private Agg canvas and return its RGBA buffer."""
+
+    def check_cancelled() -> None:
+        if cancelled is not None and cancelled.is_set():
+            raise RenderCancelled()
+
+    painter_cls = charts.CHART_PAINTERS[request.kind]
+    dpi = request.dpi or 100.0
+    with span(f"chart.build.{request.kind}"):
+        fig = Figure(figsize=(max(request.width_px, 1) / dpi, max(request.height_px, 1) / dpi), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        painter = painter_cls(fig)
+        check_cancelled()
+        painter.update(list(request.categories), list(request.values), request.period_label, request.dark_mode)
+    check_cancelled()
+    with span(f"chart.draw.{request.kind}"):
+        canvas.draw()
+    check_cancelled()
+    width, height = canvas.get_width_height()
+    return canvas.buffer_rgba(), width, height
+
+
+def pack_rgba(buffer: memoryview, width: int, height: int) -> bytes:
+    return _RGBA_HEADER.pack(b"RGBA", width, height) + bytes(buffer)
+
+
+def unpack_rgba(data: bytes) -> tuple[memoryview, int, int] | None:
+    if len(data) < _RGBA_HEADER.size:
+        return None
+    magic, width, height = _RGBA_HEADER.unpack_from(data)
+    pixels = memoryview(data)[_RGBA_HEADER.size:]
+    if magic != b"RGBA" or len(pixels) != width * height * 4:
+        return None
+    return pixels, width, height
+
+
+def cached_chart(request: ChartRequest, data: bytes | None) -> RenderedChart | None:
+    unpacked = unpack_rgba(data) if data is not None else None
+    if unpacked is None:
+        return None
+    pixels, width, height = unpacked
+    return RenderedChart(request, pixels, width, height, 0.0, cached=True)
+
+
+def render_chart(
+    request: ChartRequest,
+    cancelled: threading.Event | None = None,
+    cache: RenderCache | None = None,
+) -> RenderedChart:
+    started = time.perf_counter()
+    key = request_cache_key(request) if cache is not None else ""
+    if cache is not None:
+        hit = cached_chart(request, cache.get(key))
+        if hit is not None:
+            hit.elapsed = time.perf_counter() - started
+            return hit
+    buffer, width, height = render_rgba(request, cancelled)
+    if cache is not None:
+        cache.put(key, pack_rgba(buffer, width, height))
+    return RenderedChart(request, buffer, width, height, time.perf_counter() - started)
+
+
+class _RenderSignals(QObject):
+    finished = pyqtSignal(str, int, object)
+
+
+class _RenderTask(QRunnable):
+    def __init__(
+        self,
+        key: str,
+        generation: int,
+        request: ChartRequest,
+        cancelled: threading.Event,
+        signals: _RenderSignals,
+        cache: RenderCache | None,
+    ):
+        super().__init__()
+        self.setAutoDelete(True)
+        self._cache = cache
+        self._key = key
+        self._generation = generation
+        self._request = request
+        self._cancelled = cancelled
+        self._signals = signals
+
+    def run(self) -> None:
+        if self._cancelled.is_set():
+            return
+        try:
+            result: object = render_chart(self._request, self._cancelled, self._cache)
+        except RenderCancelled:
+            return
+        except Exception as exc:
+            result = exc
+        self._signals.finished.emit(self._key, self._generation, result)
+
+
+class ChartRenderService(QObject):
+    """Renders chart requests on a background thread pool.
+
+    ``rendered`` and ``failed`` are emitted on the thread that owns the
+    service, and only for the most recent request of each key.
+    """
+
+    rendered = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, parent: QObject | None = None, max_threads: int = 1, cache: RenderCache | None = None):
+        super().__init__(parent)
+        self.cache = cache
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_threads))
+        self._signals = _RenderSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._generations: dict[str, int] = {}
+        self._cancel_flags: dict[str, threading.Event] = {}
+
+    def submit(self, key: str, request: ChartRequest) -> int:
+        self.cancel(key)
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        if self.cache is not None:
+            # Memory hits are answered immediately; disk lookups stay on the worker.
+            hit = cached_chart(request, self.cache.get(request_cache_key(request), memory_only=True))
+            if hit is not None:
+                self.rendered.emit(key, hit)
+                return generation
+        cancelled = threading.Event()
+        self._cancel_flags[key] = cancelled
+        self._pool.start(_RenderTask(key, generation, request, cancelled, self._signals, self.cache))
+        return generation
+
+    def cancel(self, key: str) -> None:
+        flag = self._cancel_flags.pop(key, None)
+        if flag is not None:
+            flag.set()
+        if key in self._generations:
+            # Results already queued for delivery are dropped as stale.
+            self._generations[key] += 1
+
+    def is_pending(self, key: str) -> bool:
+        return key in self._cancel_flags
+
+    def shutdown(self, timeout_ms: int = 2000) -> None:
+        for key in list(self._cancel_flags):
+            self.cancel(key)
+        self._pool.clear()
+        self._pool.waitForDone(timeout_ms)
+
+    def _on_finished(self, key: str, generation: int, result: object) -> None:
+        if generation != self._generations.get(key):
+            return
+        self._cancel_flags.pop(key, None)
+        if isinstance(result, Exception):
+            self.failed.emit(key, str(result))
+            return
+        self.rendered.emit(key, result)
@@ -0,0 +1,295 @@
+"""Persistent matplotlib chart painters.
+
+Each chart owns one figure and keeps its artists alive between refreshes, so a
+period, theme or data change only mutates existing artists (``set_data``,
+wedge angles, rectangle widths) and costs a redraw instead of a figure build.
+The painters only need a ``matplotlib.figure.Figure`` and never import Qt.
+"""
+
+from __future__ import annotations
+
+from matplotlib.patches import Rectangle, Wedge
+
+
+def chart_palette(dark_mode: bool) -> dict:
+    return {
+        "text": "#E0E0E0" if dark_mode else "#212121",
+        "background": "#121212" if dark_mode else "#FFFFFF",
+        "panel": "#1C1C21" if dark_mode else "#FFFFFF",
+        "legend_face": "#1F1F26" if dark_mode else "#F2F2F2",
+        "legend_border": "#2E2E38" if dark_mode else "#D0D0D0",
+        "outline": "#29B6F6" if dark_mode else "#1565C0",
+        "wedge_edge": "#121212" if dark_mode else "#FFFFFF",
+    }
+
+
+class SavingsBatteryChart:
+    """Battery-style savings cells, one row per category."""
+
+    BATTERY_HEIGHT = 0.6
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.ax = figure.add_subplot(111)
+        self.ax.set_xticks([])
+        self.ax.tick_params(axis="x", length=0)
+        for spine in self.ax.spines.values():
+            spine.set_visible(False)
+        self._rows: list[tuple[Rectangle, Rectangle, Rectangle, object]] = []
+        self._empty_note = self.ax.text(
+            0.5, 0.5, "", transform=self.ax.transAxes, ha="center", va="center", visible=False
+        )
+        self._layout_key: tuple | None = None
+
+    def _ensure_rows(self, count: int) -> None:
+        while len(self._rows) < count:
+            outline = Rectangle((0, 0), 0, 0, linewidth=2, facecolor="none")
+            tip = Rectangle((0, 0), 0, 0, linewidth=0)
+            fill = Rectangle((0, 0), 0, 0, linewidth=0)
+            for patch in (outline, tip, fill):
+                self.ax.add_patch(patch)
+            label = self.ax.text(0, 0, "", va="center", fontsize=9)
+            self._rows.append((outline, tip, fill, label))
+        while len(self._rows) > count:
+            for artist in self._rows.pop():
+                artist.remove()
+
+    def update(self, categories: list[str], values: list[float], period_label: str, dark_mode: bool) -> None:
+        palette = chart_palette(dark_mode)
+        text_color = palette["text"]
+        self.figure.patch.set_facecolor(palette["background"])
+        self.ax.set_facecolor(palette["panel"])
+        self.ax.set_title(f"Monthly Savings ({period_label})", color=text_color)
+        self.ax.tick_params(axis="y", colors=text_color, length=0)
+
+        max_value = max(values) if values else 0.0
+        if max_value <= 0:
+            self._ensure_rows(0)
+            self.ax.set_yticks([])
+            self._empty_note.set_text(f"No savings balance for {period_label}.")
+            self._empty_note.set_color(text_color)
+            self._empty_note.set_visible(True)
+            self._relayout(("empty",))
+            return
+        self._empty_note.set_visible(False)
+
+        height = self.BATTERY_HEIGHT
+        tip_width = max(max_value * 0.04, 0.25)
+        fill_height = height - 0.12
+
+        def level_color(value: float) -> str:
+            ratio = value / max_value
+            if ratio >= 0.75:
+                return "#4CAF50" if dark_mode else "#2E7D32"
+            if ratio >= 0.4:
+                return "#FFD740" if dark_mode else "#F9A825"
+            return "#FF7043" if dark_mode else "#E64A19"
+
+        self._ensure_rows(len(categories))
+        for idx, value in enumerate(values):
+            outline, tip, fill, label = self._rows[idx]
+            bottom = idx - height / 2
+            outline.set_xy((0, bottom))
+            outline.set_width(max_value)
+            outline.set_height(height)
+            outline.set_edgecolor(palette["outline"])
+            tip.set_xy((max_value, idx - height / 4))
+            tip.set_width(tip_width)
+            tip.set_height(height / 2)
+            tip.set_facecolor(palette["outline"])
+            fill.set_xy((0, bottom + (height - fill_height) / 2))
+            fill.set_width(value)
+            fill.set_height(fill_height)
+            fill.set_facecolor(level_color(value))
+            label_inside = value > max_value * 0.35
+            if label_inside:
+                label.set_position((value - max_value * 0.02, idx))
+                label.set_horizontalalignment("right")
+            else:
+                label.set_position((value + max_value * 0.02, idx))
+                label.set_horizontalalignment("left")
+            label.set_color("#FFFFFF" if label_inside and not dark_mode else text_color)
+            label.set_text(f"RM {value:.2f}")
+
+        self.ax.set_yticks(list(range(len(categories))))
+        self.ax.set_yticklabels(categories, color=text_color, fontsize=9)
+        self.ax.set_xlim(0, max_value + tip_width + max_value * 0.15)
+        self.ax.set_ylim(-0.75, len(categories) - 0.25)
+        self._relayout(tuple(categories))
+
+    def _relayout(self, key: tuple) -> None:
+        # tight_layout measures every label, so only pay for it when the labels change.
+        if key == self._layout_key:
+            return
+        self._layout_key = key
+        try:
+            self.figure.tight_layout()
+        except Exception:
+            pass
+
+
+class ExpensePieChart:
+    """Expense distribution pie whose wedges are re-angled in place."""
+
+    START_ANGLE = 90.0
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.ax = figure.add_subplot(111)
+        self.ax.set_frame_on(False)
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+        self.ax.set_aspect("equal", adjustable="box")
+        self._wedges: list[Wedge] = []
+        self._legend_labels: list[str] | None = None
+        self._empty_note = self.ax.text(0, 0, "", ha="center", va="center", visible=False)
+
+    def _ensure_wedges(self, count: int) -> None:
+        while len(self._wedges) < count:
+            wedge = Wedge((0, 0), 1, 0, 0, linewidth=1.0)
+            self.ax.add_patch(wedge)
+            self._wedges.append(wedge)
+        while len(self._wedges) > count:
+            self._wedges.pop().remove()
+
+    def update(self, categories: list[str], values: list[float], period_label: str, dark_mode: bool) -> None:
+        palette = chart_palette(dark_mode)
+        text_color = palette["text"]
+        self.figure.patch.set_facecolor(palette["background"])
+        self.ax.set_facecolor(palette["panel"])
+        self.ax.set_title(f"Monthly Expenses ({period_label})", color=text_color)
+
+        total = sum(values)
+        if total <= 0:
+            self._ensure_wedges(0)
+            self._set_legend([], palette)
+            self._empty_note.set_text(f"No expenses recorded for {period_label}.")
+            self._empty_note.set_color(text_color)
+            self._empty_note.set_visible(True)
+            return
+        self._empty_note.set_visible(False)
+
+        try:
+            import matplotlib
+
+            cmap = matplotlib.colormaps["viridis"]
+            colors = [cmap(i / len(values)) for i in range(len(values))]
+        except Exception:
+            colors = [f"C{i}" for i in range(len(values))]
+
+        self._ensure_wedges(len(values))
+        theta = self.START_ANGLE
+        for wedge, value, color in zip(self._wedges, values, colors):
+            sweep = 360.0 * value / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + sweep)
+            wedge.set_facecolor(color)
+            wedge.set_edgecolor(palette["wedge_edge"])
+            theta += sweep
+        labels = [f"{cat}: RM {val:.2f}" for cat, val in zip(categories, values)]
+        self._set_legend(labels, palette)
+
+    def _set_legend(self, labels: list[str], palette: dict) -> None:
+        legend = self.ax.get_legend()
+        if labels != self._legend_labels:
+            if legend is not None:
+                legend.remove()
+                legend = None
+            if labels:
+                legend = self.ax.legend(
+                    self._wedges,
+                    labels,
+                    title="Categories",
+                    loc="center left",
+                    bbox_to_anchor=(1, 0.5),
+                )
+            self._legend_labels = labels
+            relayout = True
+        else:
+            relayout = False
+        if legend is not None:
+            frame = legend.get_frame()
+            frame.set_facecolor(palette["legend_face"])
+            frame.set_edgecolor(palette["legend_border"])
+            for text in legend.get_texts():
+                text.set_color(palette["text"])
+            legend.get_title().set_color(palette["text"])
+        if relayout:
+            try:
+                self.figure.tight_layout()
+            except Exception:
+                pass
+
+
+class SparklineChart:
+    """Cumulative daily spend line, blitted over a cached empty background."""
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.ax = figure.add_subplot(111)
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        for spine in self.ax.spines.values():
+            spine.set_visible(False)
+        self.ax.set_facecolor("none")
+        figure.patch.set_facecolor("none")
+        (self.line,) = self.ax.plot([], [], linewidth=2.2, animated=True)
+        self.fill = self.ax.fill_between([0, 1], [0, 0], alpha=0.15, animated=True)
+        self._background = None
+        self._background_size: tuple[int, int] | None = None
+        canvas = getattr(figure, "canvas", None)
+        if canvas is not None:
+            canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, _event=None) -> None:
+        canvas = self.figure.canvas
+        try:
+            self._background = canvas.copy_from_bbox(self.figure.bbox)
+            self._background_size = canvas.get_width_height()
+        except Exception:
+            self._background = None
+            return
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        self.ax.draw_artist(self.fill)
+        self.ax.draw_artist(self.line)
+
+    def update(self, x_values: list[int], cumulative: list[float], dark_mode: bool) -> None:
+        color = "#81C784" if dark_mode else "#4CAF50"
+        self.line.set_data(x_values, cumulative)
+        self.line.set_color(color)
+        if x_values:
+            verts = [(x_values[0], 0.0)]
+            verts.extend(zip(x_values, cumulative))
+            verts.append((x_values[-1], 0.0))
+        else:
+            verts = [(0.0, 0.0)]
+        self.fill.set_verts([verts])
+        self.fill.set_facecolor(color)
+        self.fill.set_alpha(0.15)
+        self.ax.set_xlim(1, max(1, len(x_values)))
+        max_value = max(cumulative) if cumulative else 0
+        self.ax.set_ylim(bottom=0, top=max(1, max_value * 1.1 if max_value else 1))
+        self.redraw()
+
+    def redraw(self) -> None:
+        canvas = self.figure.canvas
+        # The background holds no ticks or spines, so limit changes never invalidate it.
+        if self._background is not None and self._background_size == canvas.get_width_height():
+            try:
+                canvas.restore_region(self._background)
+                self._draw_animated()
+                canvas.blit(self.figure.bbox)
+                return
+            except Exception:
+                self._background = None
+        canvas.draw_idle()
+
+
+CHART_PAINTERS = {
+    "savings_chart": SavingsBatteryChart,
+    "expense_pie_chart": ExpensePieChart,
+}
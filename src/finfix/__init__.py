@@ -0,0 +1 @@
+"""Qt-free FinFix domain logic shared by the GUI, reports and scripts."""
@@ -0,0 +1,7 @@
+"""``python -m finfix``: the headless command-line interface (see ``finfix.cli``)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
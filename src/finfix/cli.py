@@ -0,0 +1,351 @@
+"""Headless ``finfix`` commands for scripts, shell loops and cron.
+
+    python -m finfix summary --month 2025-03
+    python -m finfix summary --month 2025-03 --compare --format csv
+    python -m finfix export --from 2025-01-01 --to 2025-03-31 --type expense --output q1.csv
+    python -m finfix import statement.csv --dry-run
+    python -m finfix budgets --month 2025-03
+    python -m finfix balance
+    python -m finfix summary --source Alice=~/alice --source Club=/srv/club
+    python -m finfix journal start
+    python -m finfix balance --as-of 2025-03-31
+    python -m finfix journal show --since 2025-03-01
+
+``--source NAME=FOLDER`` (repeatable) reads several ledgers as one: rows are
+merged in date order and tagged with their source (see ``finfix.consolidate``).
+
+``journal start`` keeps an append-only journal of every change from then on
+(see ``finfix.events``). ``--as-of`` then reports the ledger as it stood at
+that date or time, undoing any edits and deletes made since.
+
+Everything runs on ``finfix.core`` and the standard library: no Qt and no
+matplotlib are imported, so a command costs little more than reading the
+ledger. The numbers come from the same functions the window uses, so
+``summary`` matches the summary card and ``budgets`` the budget card.
+
+Output is JSON (default) or CSV on stdout. Amounts are written as strings with
+two decimals, so they round-trip exactly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from .consolidate import Consolidated, parse_source
+from .core import DEFAULT_DATA_DIR, TRANSACTION_TYPES, Ledger, read_budgets
+from .events import EventLog, JournalError
+from .export import SOURCE_CSV_HEADER, csv_rows, filter_transactions, iter_ledger, write_csv
+from .importer import add_mapping_arguments, import_statement, mapping_from_args, read_header
+
+
+def json_default(value):
+    if isinstance(value, Decimal):
+        return f"{value:.2f}"
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"cannot serialize {type(value).__name__}")
+
+
+def write_json(document, out: TextIO) -> None:
+    json.dump(document, out, default=json_default, indent=2)
+    out.write("\n")
+
+
+def write_table(header: list[str], rows: Iterable[list], out: TextIO) -> None:
+    writer = csv.writer(out)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(["" if value is None else f"{value:.2f}" if isinstance(value, Decimal) else value for value in row])
+
+
+def _parse_month(text: str) -> tuple[int, int]:
+    try:
+        year, month = (int(part) for part in text.split("-"))
+        date(year, month, 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {text!r}") from None
+    return year, month
+
+
+def _parse_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {text!r}") from None
+
+
+def _parse_moment(text: str) -> date | datetime:
+    """YYYY-MM-DD (the end of that day) or YYYY-MM-DDTHH:MM[:SS]."""
+    try:
+        return date.fromisoformat(text) if len(text) == 10 else datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD or YYYY-MM-DDTHH:MM, got {text!r}") from None
+
+
+def _this_month() -> tuple[int, int]:
+    today = date.today()
+    return today.year, today.month
+
+
+def _load(args: argparse.Namespace) -> Ledger | Consolidated:
+    if args.sources:
+        return Consolidated(args.sources)
+    if args.as_of is not None:
+        journal = EventLog(Path(args.data_dir) / "transactions.csv")
+        return journal.replay(args.as_of, budgets=read_budgets(Path(args.data_dir) / "budgets.csv"))
+    return Ledger.load(args.data_dir)
+
+
+def cmd_summary(args: argparse.Namespace, out: TextIO) -> int:
+    year, month = args.month or _this_month()
+    summary = _load(args).summary(year, month, compare=args.compare)
+    if args.format == "json":
+        write_json(summary, out)
+        return 0
+    rows: list[list] = [["total", name, amount, None, None] for name, amount in summary["totals"].items()]
+    rows.append(["total", "net", summary["net"], None, None])
+    if summary["previous_totals"]:
+        rows.extend(["previous", name, amount, None, None] for name, amount in summary["previous_totals"].items())
+    rows.extend(
+        ["category", item["category"], item["spent"], item["budget"], item["used_percent"]] for item in summary["categories"]
+    )
+    rows.extend(["savings", category, amount, None, None] for category, amount in summary["savings_by_category"])
+    rows.extend(["source", item["source"], item["net"], None, None] for item in summary.get("sources", ()))
+    write_table(["section", "name", "amount_rm", "budget_rm", "used_percent"], rows, out)
+    return 0
+
+
+def cmd_export(args: argparse.Namespace, out: TextIO) -> int:
+    if args.sources:
+        transactions = Consolidated(args.sources).transactions(
+            start=args.start, end=args.end, types=args.types, categories=args.categories
+        )
+    else:
+        ledger_path = Path(args.data_dir) / "transactions.csv"
+        if args.as_of is not None:
+            rows = iter(_load(args).transactions)
+        else:
+            rows = iter_ledger(ledger_path) if ledger_path.exists() else iter(())
+        transactions = filter_transactions(
+            rows,
+            start=args.start,
+            end=args.end,
+            types=args.types,
+            categories=args.categories,
+        )
+    target = Path(args.output).open("w", newline="", encoding="utf-8") if args.output != "-" else out
+    try:
+        if args.format == "csv":
+            if args.sources:
+                count = write_csv(csv_rows(transactions, with_source=True), target, SOURCE_CSV_HEADER)
+            else:
+                count = write_csv(csv_rows(transactions), target)
+        else:
+            # Stream the array so memory stays flat for large ledgers.
+            count = 0
+            target.write("[")
+            for tx in transactions:
+                target.write(",\n  " if count else "\n  ")
+                target.write(json.dumps(tx, default=json_default))
+                count += 1
+            target.write("\n]\n" if count else "]\n")
+    finally:
+        if target is not out:
+            target.close()
+    if args.output != "-":
+        print(f"Exported {count} transaction(s) to {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace, out: TextIO) -> int:
+    header = read_header(args.statement, args.delimiter)
+    mapping = mapping_from_args(args, header)
+    if not mapping.date or not mapping.description:
+        print(f"could not guess the date/description columns from {header}; pass --date and --description", file=sys.stderr)
+        return 2
+    ledger_path = Path(args.data_dir) / "transactions.csv"
+    if not ledger_path.exists():
+        print(f"No ledger at {ledger_path}; open FinFix once to create it.", file=sys.stderr)
+        return 2
+    try:
+        result = import_statement(args.statement, mapping, ledger_path, dry_run=args.dry_run)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    if args.format == "csv":
+        write_csv(csv_rows(result.transactions), out)
+    else:
+        write_json(
+            {
+                "dry_run": args.dry_run,
+                "rows_read": result.rows_read,
+                "imported": len(result.transactions),
+                "duplicates": result.duplicates,
+                "errors": [{"line": line, "message": message} for line, message in result.errors],
+                "elapsed_s": round(result.elapsed, 4),
+                "transactions": result.transactions,
+            },
+            out,
+        )
+    return 0
+
+
+def cmd_budgets(args: argparse.Namespace, out: TextIO) -> int:
+    year, month = args.month or _this_month()
+    rows = _load(args).budget_status(year, month)
+    if args.format == "json":
+        write_json({"year": year, "month": month, "budgets": rows}, out)
+    else:
+        write_table(
+            ["category", "budget_rm", "spent_rm", "remaining_rm", "used_percent"],
+            ([row["category"], row["budget"], row["spent"], row["remaining"], row["used_percent"]] for row in rows),
+            out,
+        )
+    return 0
+
+
+def cmd_balance(args: argparse.Namespace, out: TextIO) -> int:
+    ledger = _load(args)
+    savings = {category: amount for category, amount in sorted(ledger.savings_totals().items(), key=lambda item: item[0].lower())}
+    document = {
+        "net_position": ledger.balance,
+        "savings_balance": sum(savings.values(), Decimal("0.00")),
+        "savings": savings,
+        "transactions": len(ledger),
+    }
+    if args.format == "json":
+        write_json(document, out)
+    else:
+        rows = [["net_position", document["net_position"]], ["savings_balance", document["savings_balance"]]]
+        rows.extend([f"savings:{category}", amount] for category, amount in savings.items())
+        write_table(["name", "amount_rm"], rows, out)
+    return 0
+
+
+def cmd_journal(args: argparse.Namespace, out: TextIO) -> int:
+    ledger_path = Path(args.data_dir) / "transactions.csv"
+    if args.action == "start":
+        if not ledger_path.exists():
+            print(f"No ledger at {ledger_path}; open FinFix once to create it.", file=sys.stderr)
+            return 2
+        journal = EventLog.start(ledger_path)
+        write_json({"journal": str(journal.path), "events": journal.last_event()["seq"] + 1}, out)
+        return 0
+    journal = EventLog.existing(ledger_path)
+    if journal is None:
+        print(f"{ledger_path.parent} keeps no journal; run `finfix journal start` first.", file=sys.stderr)
+        return 2
+    if args.action == "verify":
+        problems = journal.verify()
+        write_json({"ok": not problems, "problems": problems}, out)
+        return 1 if problems else 0
+    if args.action == "snapshot":
+        snapshot = journal.snapshot()
+        write_json({"seq": snapshot.seq, "at": snapshot.at.isoformat(), "path": str(snapshot.path)}, out)
+        return 0
+    since = args.since
+    if since is not None and not isinstance(since, datetime):
+        since = datetime.combine(since, datetime.min.time())  # a date here means from the start of that day
+    events = (event for event in journal.events() if since is None or datetime.fromisoformat(event["at"]) >= since)
+    if args.format == "json":
+        write_json(list(events), out)
+    else:
+        writer = csv.writer(out)
+        writer.writerow(["seq", "at", "kind", "change", "tx_id", "date", "type", "category", "amount_rm", "desc"])
+        for event in events:
+            for sign, key in (("-", "removed"), ("+", "added")):
+                for _, row in event.get(key, ()):
+                    writer.writerow([event["seq"], event["at"], event["kind"], sign, *row])
+    return 0
+
+
+def _common_arguments(
+    parser: argparse.ArgumentParser, default_format: str = "json", sources: bool = True
+) -> argparse.ArgumentParser:
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="folder with transactions.csv and budgets.csv")
+    parser.add_argument("--format", choices=("json", "csv"), default=default_format)
+    if sources:
+        parser.add_argument(
+            "--source",
+            dest="sources",
+            action="append",
+            type=parse_source,
+            help="NAME=FOLDER; repeat to combine several ledgers (replaces --data-dir)",
+        )
+        parser.add_argument(
+            "--as-of",
+            type=_parse_moment,
+            help="YYYY-MM-DD[THH:MM]: the ledger as it stood then, from its journal (see `journal start`)",
+        )
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="finfix", description="FinFix reports without the window.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = _common_arguments(commands.add_parser("summary", help="month totals, categories, alerts and forecast"))
+    summary.add_argument("--month", type=_parse_month, help="YYYY-MM (default: this month)")
+    summary.add_argument("--compare", action="store_true", help="include the previous month's totals")
+    summary.set_defaults(handler=cmd_summary)
+
+    export = _common_arguments(commands.add_parser("export", help="transactions, filtered by date, type and category"), "csv")
+    export.add_argument("--from", dest="start", type=_parse_date, help="first date, YYYY-MM-DD")
+    export.add_argument("--to", dest="end", type=_parse_date, help="last date, YYYY-MM-DD")
+    export.add_argument("--type", dest="types", action="append", choices=TRANSACTION_TYPES, help="repeat to allow several")
+    export.add_argument("--category", dest="categories", action="append", help="repeat to allow several")
+    export.add_argument("--output", default="-", help="file to write, or - for stdout")
+    export.set_defaults(handler=cmd_export)
+
+    importer = _common_arguments(commands.add_parser("import", help="append a bank CSV statement to the ledger"), sources=False)
+    importer.add_argument("statement", type=Path)
+    add_mapping_arguments(importer)
+    importer.add_argument("--dry-run", action="store_true", help="report what would be imported without writing")
+    importer.set_defaults(handler=cmd_import)
+
+    budgets = _common_arguments(commands.add_parser("budgets", help="spending against each monthly budget"))
+    budgets.add_argument("--month", type=_parse_month, help="YYYY-MM (default: this month)")
+    budgets.set_defaults(handler=cmd_budgets)
+
+    balance = _common_arguments(commands.add_parser("balance", help="net position and savings balances"))
+    balance.set_defaults(handler=cmd_balance)
+
+    journal = _common_arguments(commands.add_parser("journal", help="the append-only change journal"), sources=False)
+    journal.add_argument("action", choices=("start", "show", "verify", "snapshot"))
+    journal.add_argument("--since", type=_parse_moment, help="show: events from this date or time on")
+    journal.set_defaults(handler=cmd_journal)
+    return parser
+
+
+def main(argv: list[str] | None = None, out: TextIO | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    names = [source.name for source in getattr(args, "sources", None) or ()]
+    if len(set(names)) != len(names):
+        parser.error(f"--source names must be unique: {', '.join(names)}")
+    if getattr(args, "as_of", None) is not None:
+        if names:
+            parser.error("--as-of reads one ledger's journal; it cannot be combined with --source")
+        if EventLog.existing(Path(args.data_dir) / "transactions.csv") is None:
+            parser.error(f"{args.data_dir} keeps no journal; run `finfix journal start` first")
+    try:
+        return args.handler(args, out or sys.stdout)
+    except JournalError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # `finfix export | head` closes stdout early; that is not an error.
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+"""Anonymized aggregates across a directory of FinFix ledgers.
+
+Every folder under ``root`` that holds a ``transactions.csv`` counts as one
+student's ledger (the layout of ``~/.finfix_data``, the API server's
+``--root`` or a folder of exported profiles). Folders are discovered lazily
+and handed to a process pool in chunks. Each worker streams its ledgers row
+by row and returns one merged ``CohortTotals`` per chunk. The parent keeps
+only a bounded number of chunks in flight and folds results in as they
+finish. Memory therefore depends on months x categories, not on the number
+of ledgers or rows.
+
+Per month the report has:
+
+* the number of active ledgers and the cohort's income, expense and savings;
+* expense totals per category;
+* the savings rate (savings / income) for the whole cohort, its mean over
+  students, and a histogram;
+* for each budgeted category, how many students went over budget and by how
+  much.
+
+``min_cell`` (k-anonymity) drops every cell built from fewer than ``k``
+ledgers, and whole months with fewer than ``k`` active ledgers. A month's
+expense is the sum of its category cells, so a lone dropped category would be
+the expense minus the published ones. The next-smallest category is then
+dropped with it, or the expense itself when there is no other category.
+
+    python -m finfix.cohort report /srv/finfix --workers 8 --min-cell 5 --output cohort.json
+    python -m finfix.cohort bench --ledgers 2000 --rows 600
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .cli import json_default, write_table
+from .core import read_budgets
+from .export import iter_ledger
+
+DEFAULT_CHUNK_SIZE = 16
+MAX_ERRORS_KEPT = 50
+# Upper bounds (exclusive) of the savings-rate histogram buckets; the last bucket is open-ended.
+RATE_BUCKETS = (0.0, 0.05, 0.10, 0.20, 0.30, 0.50)
+RATE_LABELS = ("<0%", "0-5%", "5-10%", "10-20%", "20-30%", "30-50%", ">=50%")
+ZERO = Decimal("0.00")
+
+
+def _bucket(rate: float) -> int:
+    for index, upper in enumerate(RATE_BUCKETS):
+        if rate < upper:
+            return index
+    return len(RATE_BUCKETS)
+
+
+@dataclass
+class MonthTotals:
+    ledgers: int = 0
+    income: Decimal = ZERO
+    expense: Decimal = ZERO
+    savings: Decimal = ZERO
+    categories: dict[str, list] = field(default_factory=dict)  # category -> [total, ledgers]
+    rate_sum: float = 0.0
+    rate_ledgers: int = 0
+    rate_histogram: list[int] = field(default_factory=lambda: [0] * len(RATE_LABELS))
+    budgets: dict[str, list] = field(default_factory=dict)  # category -> [budgeted, over, overrun_total]
+
+    def merge(self, other: "MonthTotals") -> None:
+        self.ledgers += other.ledgers
+        self.income += other.income
+        self.expense += other.expense
+        self.savings += other.savings
+        for category, (total, ledgers) in other.categories.items():
+            cell = self.categories.setdefault(category, [ZERO, 0])
+            cell[0] += total
+            cell[1] += ledgers
+        self.rate_sum += other.rate_sum
+        self.rate_ledgers += other.rate_ledgers
+        self.rate_histogram = [mine + theirs for mine, theirs in zip(self.rate_histogram, other.rate_histogram)]
+        for category, (budgeted, over, overrun) in other.budgets.items():
+            cell = self.budgets.setdefault(category, [0, 0, ZERO])
+            cell[0] += budgeted
+            cell[1] += over
+            cell[2] += overrun
+
+
+@dataclass
+class CohortTotals:
+    """Mergeable per-month sums over any number of ledgers; what workers send back to the parent."""
+
+    months: dict[str, MonthTotals] = field(default_factory=dict)
+    ledgers: int = 0
+    rows: int = 0
+    errors: list[tuple[str, str]] = field(default_factory=list)
+    failed: int = 0
+
+    def add_ledger(self, data_dir: Path) -> None:
+        """Stream one ledger and add its per-month figures, counting the ledger once per active month."""
+        budgets = {category: amount for category, amount in read_budgets(data_dir / "budgets.csv").items() if amount > 0}
+        per_month: defaultdict[str, list] = defaultdict(lambda: [ZERO, ZERO, ZERO, defaultdict(lambda: ZERO)])
+        rows = 0
+        for tx in iter_ledger(data_dir / "transactions.csv"):
+            rows += 1
+            sums = per_month[tx["date"][:7]]
+            if tx["type"] == "income":
+                sums[0] += tx["amount"]
+            elif tx["type"] == "savings":
+                sums[2] += tx["amount"]
+            else:
+                sums[1] += tx["amount"]
+                sums[3][tx["category"] or "Uncategorised"] += tx["amount"]
+        for key, (income, expense, savings, categories) in per_month.items():
+            month = self.months.get(key)
+            if month is None:
+                month = self.months[key] = MonthTotals()
+            month.ledgers += 1
+            month.income += income
+            month.expense += expense
+            month.savings += savings
+            for category, amount in categories.items():
+                cell = month.categories.setdefault(category, [ZERO, 0])
+                cell[0] += amount
+                cell[1] += 1
+            if income > 0:
+                rate = float(savings / income)
+                month.rate_sum += rate
+                month.rate_ledgers += 1
+                month.rate_histogram[_bucket(rate)] += 1
+            for category, budget in budgets.items():
+                cell = month.budgets.setdefault(category, [0, 0, ZERO])
+                cell[0] += 1
+                spent = categories.get(category, ZERO)
+                if spent > budget:
+                    cell[1] += 1
+                    cell[2] += spent - budget
+        self.ledgers += 1
+        self.rows += rows
+
+    def merge(self, other: "CohortTotals") -> None:
+        for key, month in other.months.items():
+            mine = self.months.get(key)
+            if mine is None:
+                self.months[key] = month
+            else:
+                mine.merge(month)
+        self.ledgers += other.ledgers
+        self.rows += other.rows
+        self.failed += other.failed
+        self.errors.extend(other.errors[: max(0, MAX_ERRORS_KEPT - len(self.errors))])
+
+
+def summarize_chunk(folders: list[str]) -> CohortTotals:
+    """Worker entry point: one merged result per chunk keeps pickling small."""
+    totals = CohortTotals()
+    for folder in folders:
+        try:
+            totals.add_ledger(Path(folder))
+        except (OSError, ValueError, csv.Error) as exc:
+            totals.failed += 1
+            if len(totals.errors) < MAX_ERRORS_KEPT:
+                totals.errors.append((folder, str(exc) or exc.__class__.__name__))
+    return totals
+
+
+def iter_ledger_dirs(root: Path) -> Iterator[str]:
+    """Folders under ``root`` (including ``root``) holding a ``transactions.csv``, found lazily in sorted order."""
+    stack = [str(root)]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                children = sorted(entries, key=lambda entry: entry.name, reverse=True)
+        except OSError:
+            continue
+        if any(entry.name == "transactions.csv" and entry.is_file() for entry in children):
+            yield folder
+        stack.extend(entry.path for entry in children if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."))
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def default_workers() -> int:
+    return max(1, min((os.cpu_count() or 2) - 1, 16))
+
+
+def aggregate(
+    root: Path,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[CohortTotals, float], None] | None = None,
+) -> tuple[CohortTotals, dict]:
+    """Aggregate every ledger under ``root``; returns the totals and run statistics.
+
+    At most ``2 * workers`` chunks are queued at a time, so discovery and
+    results never pile up in memory however many ledgers there are.
+    ``workers=0`` runs in this process, which is handy for profiling.
+    """
+    workers = default_workers() if workers is None else workers
+    chunk_size = max(1, chunk_size)
+    started = time.perf_counter()
+    totals = CohortTotals()
+    chunks = _chunks(iter_ledger_dirs(root), chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            totals.merge(summarize_chunk(chunk))
+            if progress is not None:
+                progress(totals, time.perf_counter() - started)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(summarize_chunk, chunk))
+                if len(pending) < workers * 2:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    totals.merge(future.result())
+                if progress is not None:
+                    progress(totals, time.perf_counter() - started)
+            for future in wait(pending).done:
+                totals.merge(future.result())
+    elapsed = time.perf_counter() - started
+    stats = {
+        "ledgers": totals.ledgers,
+        "failed": totals.failed,
+        "rows": totals.rows,
+        "months": len(totals.months),
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "elapsed_s": round(elapsed, 3),
+        "ledgers_per_second": round(totals.ledgers / elapsed, 1) if elapsed else 0.0,
+        "rows_per_second": round(totals.rows / elapsed) if elapsed else 0,
+    }
+    return totals, stats
+
+
+def _share(part: int, whole: int) -> float | None:
+    return round(part / whole * 100, 1) if whole else None
+
+
+def build_report(totals: CohortTotals, min_cell: int = 1) -> dict:
+    """The JSON-ready report; cells from fewer than ``min_cell`` ledgers are left out and counted."""
+    months = []
+    suppressed_months = 0
+    suppressed_cells = 0
+    for key in sorted(totals.months):
+        month = totals.months[key]
+        if month.ledgers < min_cell:
+            suppressed_months += 1
+            continue
+        cells = sorted(month.categories.items(), key=lambda item: item[1][0], reverse=True)
+        shown = [cell for cell in cells if cell[1][1] >= min_cell]
+        hidden = len(cells) - len(shown)
+        if hidden == 1 and shown:
+            shown.pop()  # complementary suppression: the smallest published cell hides the lone dropped one
+            hidden += 1
+        suppressed_cells += hidden
+        categories = [
+            {"category": category, "total": total, "ledgers": ledgers, "mean_per_ledger": total / ledgers}
+            for category, (total, ledgers) in shown
+        ]
+        histogram = {}
+        for label, count in zip(RATE_LABELS, month.rate_histogram):
+            if 0 < count < min_cell:
+                suppressed_cells += 1
+                count = None
+            histogram[label] = count
+        budgets = []
+        for category, (budgeted, over, overrun) in sorted(month.budgets.items()):
+            if budgeted < min_cell:
+                suppressed_cells += 1
+                continue
+            small = 0 < over < min_cell
+            suppressed_cells += small
+            budgets.append(
+                {
+                    "category": category,
+                    "budgeted_ledgers": budgeted,
+                    "over_budget_ledgers": None if small else over,
+                    "over_budget_percent": None if small else _share(over, budgeted),
+                    "mean_overrun": None if small or not over else overrun / over,
+                }
+            )
+        rate_ok = month.rate_ledgers >= min_cell
+        suppressed_cells += 0 < month.rate_ledgers < min_cell
+        months.append(
+            {
+                "month": key,
+                "ledgers": month.ledgers,
+                "income": month.income,
+                "expense": None if hidden == 1 else month.expense,
+                "savings": month.savings,
+                "savings_rate_percent": round(float(month.savings / month.income) * 100, 1) if month.income > 0 else None,
+                "mean_savings_rate_percent": round(month.rate_sum / month.rate_ledgers * 100, 1) if rate_ok else None,
+                "savings_rate_histogram": histogram,
+                "categories": categories,
+                "budgets": budgets,
+            }
+        )
+    return {
+        "ledgers": totals.ledgers,
+        "min_cell": min_cell,
+        "suppressed_months": suppressed_months,
+        "suppressed_cells": suppressed_cells,
+        "months": months,
+    }
+
+
+def write_report_csv(report: dict, out: TextIO) -> None:
+    """One row per month and cell: ``month,section,name,value,ledgers``."""
+    rows: list[list] = []
+    for month in report["months"]:
+        key = month["month"]
+        rows.append([key, "total", "ledgers", month["ledgers"], month["ledgers"]])
+        for name in ("income", "expense", "savings"):
+            rows.append([key, "total", name, month[name], month["ledgers"]])
+        rows.append([key, "savings_rate", "cohort_percent", month["savings_rate_percent"], month["ledgers"]])
+        rows.append([key, "savings_rate", "mean_percent", month["mean_savings_rate_percent"], None])
+        rows.extend([key, "savings_rate_histogram", label, count, None] for label, count in month["savings_rate_histogram"].items())
+        rows.extend([key, "category", item["category"], item["total"], item["ledgers"]] for item in month["categories"])
+        rows.extend(
+            [key, "over_budget_percent", item["category"], item["over_budget_percent"], item["budgeted_ledgers"]]
+            for item in month["budgets"]
+        )
+    write_table(["month", "section", "name", "value", "ledgers"], rows, out)
+
+
+def _progress_printer(interval: float = 2.0) -> Callable[[CohortTotals, float], None]:
+    last = [0.0]
+
+    def report(totals: CohortTotals, elapsed: float) -> None:
+        if elapsed - last[0] < interval:
+            return
+        last[0] = elapsed
+        print(f"... {totals.ledgers} ledger(s), {totals.rows} row(s), {totals.ledgers / elapsed:.0f} ledgers/s", file=sys.stderr, flush=True)
+
+    return report
+
+
+def _describe(stats: dict) -> str:
+    return (
+        f"Aggregated {stats['ledgers']} ledger(s) ({stats['rows']} rows, {stats['failed']} failed) in {stats['elapsed_s']:.2f} s "
+        f"with {stats['workers']} worker(s): {stats['ledgers_per_second']:.0f} ledgers/s, {stats['rows_per_second']} rows/s"
+    )
+
+
+def _write_synthetic(root: Path, ledgers: int, rows: int) -> None:
+    from .synth import write_data_dir
+
+    for number in range(ledgers):
+        folder = root / f"student{number:05d}"
+        if not (folder / "transactions.csv").exists():
+            write_data_dir(folder, rows, seed=number, span_months=12)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m finfix.cohort", description="Anonymized aggregates across many FinFix ledgers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report = commands.add_parser("report", help="aggregate every ledger folder under ROOT")
+    report.add_argument("root", type=Path)
+    report.add_argument("--min-cell", type=int, default=1, help="suppress cells built from fewer ledgers than this (k-anonymity)")
+    report.add_argument("--format", choices=("json", "csv"), default="json")
+    report.add_argument("--output", default="-", help="file to write, or - for stdout")
+    bench = commands.add_parser("bench", help="measure throughput on synthetic ledgers")
+    bench.add_argument("--root", type=Path, help="folder to (re)use for the synthetic ledgers (default: a temp folder)")
+    bench.add_argument("--ledgers", type=int, default=1000)
+    bench.add_argument("--rows", type=int, default=500)
+    for command in (report, bench):
+        command.add_argument("--workers", type=int, default=None, help="worker processes (default: CPUs - 1, max 16; 0 runs inline)")
+        command.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="ledgers per worker task")
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        if args.root is not None:
+            args.root.mkdir(parents=True, exist_ok=True)
+            _write_synthetic(args.root, args.ledgers, args.rows)
+            _, stats = aggregate(args.root, args.workers, args.chunk_size)
+        else:
+            with tempfile.TemporaryDirectory(prefix="finfix_cohort_") as tmp:
+                _write_synthetic(Path(tmp), args.ledgers, args.rows)
+                _, stats = aggregate(Path(tmp), args.workers, args.chunk_size)
+        print(_describe(stats), file=sys.stderr)
+        print(json.dumps(stats, indent=2))
+        return 0
+
+    if not args.root.is_dir():
+        print(f"{args.root} is not a folder", file=sys.stderr)
+        return 2
+    totals, stats = aggregate(args.root, args.workers, args.chunk_size, progress=_progress_printer())
+    document = build_report(totals, max(1, args.min_cell))
+    document["run"] = stats
+    document["errors"] = [{"ledger": folder, "message": message} for folder, message in totals.errors]
+    target = Path(args.output).open("w", newline="", encoding="utf-8") if args.output != "-" else sys.stdout
+    try:
+        if args.format == "csv":
+            write_report_csv(document, target)
+        else:
+            json.dump(document, target, default=json_default, indent=2)
+            target.write("\n")
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    print(_describe(stats), file=sys.stderr)
+    return 1 if totals.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
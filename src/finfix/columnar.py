@@ -0,0 +1,187 @@
+"""Arrow IPC / Feather and Parquet export for analysis tools.
+
+Columns are typed so pandas, Polars and DuckDB can load them without parsing:
+``date`` is ``date32``, amounts are ``int64`` cents, and ``type`` / ``category``
+are dictionary-encoded. Transactions are written in record batches as they
+stream through the ``finfix.export`` filters, so large ranges never have to be
+held in memory. Requires the optional ``pyarrow`` package.
+
+    python -m finfix.columnar --from 2016-01-01 --format parquet --output ledger.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .core import DEFAULT_DATA_DIR, TRANSACTION_TYPES
+from .export import filter_transactions, iter_ledger
+
+try:
+    import pyarrow as pa
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+try:
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pq = None
+    PARQUET_AVAILABLE = False
+
+BATCH_ROWS = 64 * 1024
+FORMAT_SUFFIXES = {"arrow": ".arrow", "feather": ".feather", "parquet": ".parquet"}
+
+
+class ColumnarUnavailable(RuntimeError):
+    """Raised when the requested format needs pyarrow (or its parquet module) and it is missing."""
+
+
+def available_formats() -> list[str]:
+    formats = []
+    if PYARROW_AVAILABLE:
+        formats += ["arrow", "feather"]
+    if PARQUET_AVAILABLE:
+        formats.append("parquet")
+    return formats
+
+
+def ledger_schema():
+    _require("arrow")
+    return pa.schema(
+        [
+            pa.field("tx_id", pa.string()),
+            pa.field("date", pa.date32()),
+            pa.field("type", pa.dictionary(pa.int8(), pa.string())),
+            pa.field("category", pa.dictionary(pa.int32(), pa.string())),
+            pa.field("amount_cents", pa.int64()),
+            pa.field("desc", pa.string()),
+        ],
+        metadata={"source": "finfix", "amount_unit": "MYR cents"},
+    )
+
+
+def _require(fmt: str) -> None:
+    if not PYARROW_AVAILABLE:
+        raise ColumnarUnavailable("Arrow/Feather/Parquet export needs pyarrow (pip install pyarrow).")
+    if fmt == "parquet" and not PARQUET_AVAILABLE:
+        raise ColumnarUnavailable("Parquet export needs pyarrow built with Parquet support.")
+
+
+def _chunks(transactions: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for tx in transactions:
+        chunk.append(tx)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def record_batches(transactions: Iterable[dict], batch_rows: int = BATCH_ROWS):
+    """Yield ``pyarrow.RecordBatch`` objects for ``transactions`` in ledger order.
+
+    Category codes come from one dictionary that only grows, so every batch
+    shares it and IPC writers can emit dictionary deltas instead of
+    replacements.
+    """
+    _require("arrow")
+    schema = ledger_schema()
+    type_codes = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+    type_dictionary = pa.array(TRANSACTION_TYPES, pa.string())
+    category_codes: dict[str, int] = {}
+    epoch = date(1970, 1, 1).toordinal()
+    for chunk in _chunks(transactions, batch_rows):
+        categories = []
+        for tx in chunk:
+            code = category_codes.get(tx["category"])
+            if code is None:
+                code = category_codes[tx["category"]] = len(category_codes)
+            categories.append(code)
+        columns = [
+            pa.array([tx["tx_id"] for tx in chunk], pa.string()),
+            pa.array([date.fromisoformat(tx["date"]).toordinal() - epoch for tx in chunk], pa.int32()).cast(pa.date32()),
+            pa.DictionaryArray.from_arrays(pa.array([type_codes[tx["type"]] for tx in chunk], pa.int8()), type_dictionary),
+            pa.DictionaryArray.from_arrays(pa.array(categories, pa.int32()), pa.array(list(category_codes), pa.string())),
+            pa.array([int(tx["amount"] * 100) for tx in chunk], pa.int64()),
+            pa.array([tx["desc"] for tx in chunk], pa.string()),
+        ]
+        yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def export_columnar(transactions: Iterable[dict], path: Path, fmt: str, batch_rows: int = BATCH_ROWS, **filters) -> int:
+    """Write matching ``transactions`` to ``path`` as ``arrow``, ``feather`` or ``parquet``; return the row count."""
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(f"unknown columnar format: {fmt}")
+    _require(fmt)
+    schema = ledger_schema()
+    batches = record_batches(filter_transactions(transactions, **filters), batch_rows)
+    count = 0
+    if fmt == "parquet":
+        with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
+    # Feather v2 is the Arrow IPC file format; the suffix only differs by convention.
+    options = pa.ipc.IpcWriteOptions(
+        compression="lz4" if fmt == "feather" else None,
+        emit_dictionary_deltas=True,
+    )
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
+
+
+def export_ledger_columnar(ledger_path: Path, path: Path, fmt: str, **filters) -> int:
+    """Stream a ledger file on disk into a columnar file."""
+    return export_columnar(iter_ledger(ledger_path), path, fmt, **filters)
+
+
+def _parse_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {text!r}") from None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m finfix.columnar", description="Export FinFix transactions to Arrow/Parquet.")
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_DATA_DIR / "transactions.csv", help="ledger CSV to read")
+    parser.add_argument("--format", dest="fmt", choices=sorted(FORMAT_SUFFIXES), default="parquet")
+    parser.add_argument("--from", dest="start", type=_parse_date, help="first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=_parse_date, help="last date, YYYY-MM-DD")
+    parser.add_argument("--type", dest="types", action="append", choices=TRANSACTION_TYPES, help="repeat to allow several")
+    parser.add_argument("--category", dest="categories", action="append", help="repeat to allow several")
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    try:
+        count = export_ledger_columnar(
+            args.ledger,
+            args.output,
+            args.fmt,
+            start=args.start,
+            end=args.end,
+            types=args.types,
+            categories=args.categories,
+        )
+    except ColumnarUnavailable as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    print(f"Exported {count} transaction(s) to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""A combined, read-only view over several ledgers without copying rows.
+
+Each source is a FinFix data folder with a name, e.g. ``Alice=~/alice`` and
+``Club=/srv/club``. ``Consolidated.transactions`` streams every source in
+date order and k-way merges the streams with ``heapq.merge``. Each row is a
+copy tagged with ``"source"``. Only one pending row per source is held, so
+memory grows with the number of sources, not the number of rows.
+
+A first pass over each source (``scan_source``) records per-month totals,
+running savings balances, the net balance, budgets and whether the file is
+already in date order. That pass is cached per source and redone only when
+the source's files change. Balances, savings and per-source totals come
+from it directly. Month summaries read just that month's rows from the
+merged stream and hand them to ``month_summary``, so the numbers follow the
+same rules as a single ledger.
+
+Rows appended out of date order, e.g. a back-dated entry, make a file
+unsorted. Such a source is sorted in memory, but only for the date window
+being read.
+"""
+
+from __future__ import annotations
+
+import calendar
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from itertools import dropwhile, takewhile
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .core import aggregate_month, month_forecast, month_summary, previous_period, read_budgets
+from .export import filter_transactions, iter_ledger
+from .ledger_cache import file_stamp
+
+ZERO = Decimal("0.00")
+_by_date = itemgetter("date")
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    data_dir: Path
+
+
+def parse_source(text: str) -> Source:
+    """``NAME=FOLDER`` or just ``FOLDER`` (named after the folder)."""
+    name, sep, folder = text.partition("=")
+    if not sep:
+        folder, name = text, ""
+    path = Path(folder).expanduser()
+    name = name.strip() or path.name or str(path)
+    return Source(name, path)
+
+
+@dataclass
+class SourceStats:
+    """What one streaming pass over a source learns; small (months x categories), cached per source."""
+
+    stamp: tuple
+    rows: int = 0
+    in_order: bool = True
+    balance: Decimal = ZERO
+    budgets: dict[str, Decimal] = field(default_factory=dict)
+    months: dict[tuple[int, int], list] = field(default_factory=dict)  # (year, month) -> [income, expense, savings, rows]
+    savings_keys: list[tuple[int, int]] = field(default_factory=list)
+    savings_running: list[dict[str, Decimal]] = field(default_factory=list)
+
+    def savings_at(self, period: tuple[int, int] | None = None) -> dict[str, Decimal]:
+        """Savings per category at the end of ``period`` (default: after the last row)."""
+        if not self.savings_keys:
+            return {}
+        if period is None:
+            return dict(self.savings_running[-1])
+        index = bisect_right(self.savings_keys, period) - 1
+        return dict(self.savings_running[index]) if index >= 0 else {}
+
+
+def scan_source(data_dir: Path) -> SourceStats:
+    data_dir = Path(data_dir)
+    stats = SourceStats(stamp=file_stamp(data_dir), budgets=read_budgets(data_dir / "budgets.csv"))
+    savings_by_month: defaultdict[tuple[int, int], defaultdict[str, Decimal]] = defaultdict(lambda: defaultdict(lambda: ZERO))
+    ledger_path = data_dir / "transactions.csv"
+    previous = ""
+    for tx in iter_ledger(ledger_path) if ledger_path.exists() else ():
+        tx_date = tx["date"]
+        if tx_date < previous:
+            stats.in_order = False
+        previous = max(previous, tx_date)
+        stats.rows += 1
+        key = (int(tx_date[:4]), int(tx_date[5:7]))
+        sums = stats.months.get(key)
+        if sums is None:
+            sums = stats.months[key] = [ZERO, ZERO, ZERO, 0]
+        sums[3] += 1
+        if tx["type"] == "income":
+            sums[0] += tx["amount"]
+            stats.balance += tx["amount"]
+        elif tx["type"] == "savings":
+            sums[2] += tx["amount"]
+            savings_by_month[key][tx["category"] or "Savings"] += tx["amount"]
+        else:
+            sums[1] += tx["amount"]
+            stats.balance -= tx["amount"]
+    running: defaultdict[str, Decimal] = defaultdict(lambda: ZERO)
+    for key in sorted(stats.months):
+        for category, amount in savings_by_month.get(key, {}).items():
+            running[category] += amount
+        stats.savings_keys.append(key)
+        stats.savings_running.append(dict(running))
+    return stats
+
+
+def _tagged(transactions: Iterable[dict], name: str) -> Iterator[dict]:
+    for tx in transactions:
+        yield {**tx, "source": name}
+
+
+def _month_bounds(year: int, month: int) -> tuple[date, date]:
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _sum_into(target: dict[str, Decimal], values: dict[str, Decimal]) -> None:
+    for key, amount in values.items():
+        target[key] = target.get(key, ZERO) + amount
+
+
+class Consolidated:
+    """Answers the ``Ledger`` queries the CLI uses (``summary``, ``budget_status``, ``savings_totals``...) over several sources.
+
+    Budgets of the same category are added up across sources, as a household
+    sharing one grocery budget would see it.
+    """
+
+    def __init__(self, sources: Iterable[Source]):
+        self.sources = list(sources)
+        names = [source.name for source in self.sources]
+        if len(set(names)) != len(names):
+            raise ValueError(f"source names must be unique: {', '.join(names)}")
+        self._stats: dict[Path, SourceStats] = {}
+
+    def stats(self, source: Source) -> SourceStats:
+        """The cached first-pass figures for ``source``, rescanned only when its files changed."""
+        cached = self._stats.get(source.data_dir)
+        if cached is None or cached.stamp != file_stamp(source.data_dir):
+            cached = self._stats[source.data_dir] = scan_source(source.data_dir)
+        return cached
+
+    def _stream(self, source: Source, start: date | None, end: date | None) -> Iterator[dict]:
+        ledger_path = source.data_dir / "transactions.csv"
+        if not ledger_path.exists():
+            return iter(())
+        rows = iter_ledger(ledger_path)
+        if self.stats(source).in_order:
+            if start is not None:
+                low = start.isoformat()
+                rows = dropwhile(lambda tx: tx["date"] < low, rows)
+            if end is not None:
+                high = end.isoformat()
+                rows = takewhile(lambda tx: tx["date"] <= high, rows)
+            return rows
+        return iter(sorted(filter_transactions(rows, start=start, end=end), key=_by_date))
+
+    def transactions(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        types: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+    ) -> Iterator[dict]:
+        """Every source's rows in date order (ties keep source order), each tagged with ``"source"``."""
+        streams = [_tagged(self._stream(source, start, end), source.name) for source in self.sources]
+        merged = heapq.merge(*streams, key=_by_date)
+        if types or categories:
+            merged = filter_transactions(merged, types=types, categories=categories)
+        return merged
+
+    def __len__(self) -> int:
+        return sum(self.stats(source).rows for source in self.sources)
+
+    @property
+    def balance(self) -> Decimal:
+        return sum((self.stats(source).balance for source in self.sources), ZERO)
+
+    @property
+    def budgets(self) -> dict[str, Decimal]:
+        combined: dict[str, Decimal] = {}
+        for source in self.sources:
+            _sum_into(combined, self.stats(source).budgets)
+        return combined
+
+    def periods(self) -> list[tuple[int, int]]:
+        return sorted({key for source in self.sources for key in self.stats(source).months})
+
+    def savings_at(self, year: int, month: int) -> dict[str, Decimal]:
+        combined: dict[str, Decimal] = {}
+        for source in self.sources:
+            _sum_into(combined, self.stats(source).savings_at((year, month)))
+        return combined
+
+    def savings_totals(self, period_end: date | None = None) -> dict[str, Decimal]:
+        if period_end is None:
+            combined: dict[str, Decimal] = {}
+            for source in self.sources:
+                _sum_into(combined, self.stats(source).savings_at())
+            return combined
+        if period_end.day == calendar.monthrange(period_end.year, period_end.month)[1]:
+            return self.savings_at(period_end.year, period_end.month)
+        combined = self.savings_at(*previous_period(period_end.year, period_end.month))
+        for tx in self.transactions(start=date(period_end.year, period_end.month, 1), end=period_end, types=["savings"]):
+            combined[tx["category"] or "Savings"] = combined.get(tx["category"] or "Savings", ZERO) + tx["amount"]
+        return combined
+
+    def month_transactions(self, year: int, month: int, type_filter: str | None = None) -> list[dict]:
+        start, end = _month_bounds(year, month)
+        return list(self.transactions(start=start, end=end, types=[type_filter] if type_filter else None))
+
+    def source_totals(self, year: int, month: int) -> list[dict]:
+        """Per-source income/expense/savings for one month, straight from the cached first pass."""
+        rows = []
+        for source in self.sources:
+            income, expense, savings, count = self.stats(source).months.get((year, month), (ZERO, ZERO, ZERO, 0))
+            rows.append(
+                {
+                    "source": source.name,
+                    "income": income,
+                    "expense": expense,
+                    "savings": savings,
+                    "net": income - expense - savings,
+                    "transaction_count": count,
+                }
+            )
+        return rows
+
+    def aggregate_month(self, year: int, month: int):
+        return aggregate_month(self.month_transactions(year, month), year, month, self.savings_at(year, month))
+
+    def summary(self, year: int, month: int, compare: bool = False, today: date | None = None) -> dict:
+        """``month_summary`` over the merged rows of the month (and the one before), plus a per-source breakdown."""
+        previous = previous_period(year, month)
+        start, end = _month_bounds(*(previous if compare else (year, month)))[0], _month_bounds(year, month)[1]
+        rows = list(self.transactions(start=start, end=end))
+        summary = month_summary(
+            rows,
+            self.budgets,
+            year,
+            month,
+            compare=compare,
+            today=today,
+            savings=self.savings_at(year, month),
+            previous_savings=self.savings_at(*previous),
+        )
+        summary["sources"] = self.source_totals(year, month)
+        return summary
+
+    def budget_status(self, year: int, month: int) -> list[dict]:
+        spent_by_category = self.aggregate_month(year, month)[1]
+        budgets = self.budgets
+        rows = []
+        for category in sorted(budgets):
+            budget = budgets[category]
+            spent = spent_by_category.get(category, ZERO)
+            rows.append(
+                {
+                    "category": category,
+                    "budget": budget,
+                    "spent": spent,
+                    "remaining": budget - spent,
+                    "used_percent": (spent / budget * Decimal("100.00")) if budget > 0 else None,
+                }
+            )
+        return rows
+
+    def forecast(self, year: int, month: int, today: date | None = None) -> dict | None:
+        return month_forecast(self.aggregate_month(year, month)[2], year, month, today)
@@ -0,0 +1,493 @@
+"""Ledger normalization and monthly aggregation without any GUI imports.
+
+These functions take plain transaction dicts (as produced by
+``normalize_transaction``) so the window, the report engine and headless
+scripts all compute the same numbers. ``Ledger`` bundles a loaded ledger with
+the derived state the window shows (balance, categories, savings per period)
+and caches the per-month grouping between queries. It only uses the standard
+library, so it imports quickly and pickles for process pools.
+"""
+
+from __future__ import annotations
+
+import calendar
+import csv
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+
+DEFAULT_DATA_DIR = Path.home() / ".finfix_data"
+TRANSACTION_TYPES = ("income", "expense", "savings")
+
+
+def money(x) -> Decimal:
+    return Decimal(str(x)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def normalize_transaction(row: dict) -> dict:
+    tx_id = (row.get("tx_id") or "").strip()
+    ttype = (row.get("type", "expense") or "expense").lower()
+    if ttype not in TRANSACTION_TYPES:
+        ttype = "expense"
+    raw_amount = row.get("amount_rm", row.get("amount", "0"))
+    try:
+        amount = money(raw_amount)
+    except Exception:
+        amount = Decimal("0.00")
+    category = row.get("category") or ("Savings" if ttype == "savings" else "General")
+    category = category.strip() or ("Savings" if ttype == "savings" else "General")
+    desc = (row.get("desc") or row.get("description") or "").strip()
+    tx_date = (row.get("date") or "").strip()
+    try:
+        if tx_date:
+            date.fromisoformat(tx_date)
+        else:
+            raise ValueError
+    except ValueError:
+        tx_date = date.today().isoformat()
+    return {
+        "tx_id": tx_id,
+        "date": tx_date,
+        "type": ttype,
+        "category": category,
+        "amount": amount,
+        "desc": desc,
+    }
+
+
+def read_transactions(path: Path) -> list[dict]:
+    with Path(path).open(newline="", encoding="utf-8") as f:
+        return [normalize_transaction(raw) for raw in csv.DictReader(f)]
+
+
+def read_budgets(path: Path) -> dict[str, Decimal]:
+    budgets: dict[str, Decimal] = {}
+    try:
+        with Path(path).open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                category = (row.get("category") or "").strip()
+                if not category:
+                    continue
+                try:
+                    budgets[category] = money(row.get("monthly_budget_rm", "0"))
+                except Exception:
+                    continue
+    except FileNotFoundError:
+        pass
+    return budgets
+
+
+def previous_period(year: int, month: int) -> tuple[int, int]:
+    if month == 1:
+        return year - 1, 12
+    return year, month - 1
+
+
+def aggregate_month(transactions: list[dict], year: int, month: int, savings: dict | None = None):
+    totals = {
+        "income": Decimal("0.00"),
+        "expense": Decimal("0.00"),
+        "savings": Decimal("0.00"),
+        "savings_balance": Decimal("0.00"),
+    }
+    category_totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0.00"))
+    daily_expense: defaultdict[int, Decimal] = defaultdict(lambda: Decimal("0.00"))
+    month_transactions: list[tuple[dict, date]] = []
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+
+    for tx in transactions:
+        try:
+            tx_date = date.fromisoformat(tx["date"])
+        except ValueError:
+            continue
+        if tx_date.year != year or tx_date.month != month:
+            continue
+        month_transactions.append((tx, tx_date))
+        amount = tx["amount"]
+        ttype = tx["type"]
+        category = tx["category"] or "Uncategorised"
+        if ttype == "income":
+            totals["income"] += amount
+        elif ttype == "savings":
+            # Savings should not appear in the expense category breakdown
+            # Track savings total only; exclude from category_totals and daily expense
+            totals["savings"] += amount
+        else:
+            totals["expense"] += amount
+            category_totals[category] += amount
+            daily_expense[tx_date.day] += amount
+
+    if savings is None:
+        savings = savings_totals(transactions, month_end)
+    totals["savings_balance"] = sum(savings.values(), Decimal("0.00"))
+    return totals, category_totals, month_transactions, daily_expense
+
+
+def month_range(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """Every (year, month) from ``start`` to ``end`` inclusive."""
+    periods = []
+    year, month = start
+    while (year, month) <= end:
+        periods.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return periods
+
+
+def group_by_month(transactions: list[dict]) -> dict[tuple[int, int], list[dict]]:
+    """Bucket transactions by (year, month) in a single pass; undated rows are dropped."""
+    groups: defaultdict[tuple[int, int], list[dict]] = defaultdict(list)
+    for tx in transactions:
+        try:
+            tx_date = date.fromisoformat(tx["date"])
+        except ValueError:
+            continue
+        groups[(tx_date.year, tx_date.month)].append(tx)
+    return dict(groups)
+
+
+def savings_snapshots(
+    groups: dict[tuple[int, int], list[dict]],
+    periods: list[tuple[int, int]],
+) -> dict[tuple[int, int], dict[str, Decimal]]:
+    """``savings_totals`` at the end of each period, from one sweep over ``group_by_month`` output."""
+    running: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0.00"))
+    keys = sorted(groups)
+    snapshots: dict[tuple[int, int], dict[str, Decimal]] = {}
+    index = 0
+    for period in sorted(set(periods)):
+        while index < len(keys) and keys[index] <= period:
+            for tx in groups[keys[index]]:
+                if tx["type"] == "savings":
+                    running[tx["category"] or "Savings"] += tx["amount"]
+            index += 1
+        snapshots[period] = dict(running)
+    return snapshots
+
+
+def savings_totals(transactions: list[dict], period_end: date | None = None) -> dict[str, Decimal]:
+    """Cumulative savings per category (deposits minus withdrawals) up to ``period_end``."""
+    totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0.00"))
+    for tx in transactions:
+        if tx["type"] != "savings":
+            continue
+        if period_end is not None:
+            try:
+                tx_date = date.fromisoformat(tx["date"])
+            except ValueError:
+                continue
+            if tx_date > period_end:
+                continue
+        totals[tx["category"] or "Savings"] += tx["amount"]
+    return dict(totals)
+
+
+def month_alerts(
+    category_totals: dict,
+    month_transactions: list[tuple[dict, date]],
+    budget_map: dict,
+    today: date | None = None,
+) -> list[str]:
+    today = today or date.today()
+    alerts: list[str] = []
+    for category, spent in category_totals.items():
+        budget = budget_map.get(category)
+        if budget and spent > budget:
+            over = spent - budget
+            alerts.append(f"{category} over budget by RM {over:.2f}")
+    for tx, tx_date in month_transactions:
+        category = (tx["category"] or "").lower()
+        desc = (tx["desc"] or "").lower()
+        if "subscription" in category or "subscription" in desc or "due" in desc:
+            next_due = tx_date + timedelta(days=30)
+            days_until = (next_due - today).days
+            if 0 <= days_until <= 3:
+                alerts.append(
+                    f"{tx['category'] or 'Subscription'} billing due in {days_until} day(s) ({tx['desc']})"
+                )
+    unique_alerts = []
+    seen = set()
+    for alert in alerts:
+        if alert not in seen:
+            seen.add(alert)
+            unique_alerts.append(alert)
+    return unique_alerts
+
+
+def month_forecast(
+    month_transactions: list[tuple[dict, date]],
+    year: int,
+    month: int,
+    today: date | None = None,
+) -> dict | None:
+    """Month-end net forecast and safe-to-spend; ``None`` outside the current month."""
+    today = today or date.today()
+    if year != today.year or month != today.month:
+        return None
+    days_in_month = Decimal(calendar.monthrange(year, month)[1])
+    current_transactions = [(tx, tx_date) for tx, tx_date in month_transactions if tx_date <= today]
+    if not current_transactions:
+        return {"net_forecast": Decimal("0.00"), "safe_to_spend": Decimal("0.00")}
+    days_elapsed = Decimal(today.day)
+    days_remaining = max(Decimal("0.00"), days_in_month - days_elapsed)
+    expense = sum((tx["amount"] for tx, _ in current_transactions if tx["type"] == "expense"), Decimal("0.00"))
+    income = sum((tx["amount"] for tx, _ in current_transactions if tx["type"] == "income"), Decimal("0.00"))
+    daily_burn = expense / days_elapsed if days_elapsed > 0 else Decimal("0.00")
+    projected_spend = expense + (daily_burn * days_remaining)
+    if days_remaining > 0:
+        safe_to_spend = (income - expense) / days_remaining
+    else:
+        safe_to_spend = income - expense
+    return {"net_forecast": income - projected_spend, "safe_to_spend": safe_to_spend}
+
+
+def month_summary(
+    transactions: list[dict],
+    budget_map: dict,
+    year: int,
+    month: int,
+    compare: bool = False,
+    today: date | None = None,
+    savings: dict | None = None,
+    previous_savings: dict | None = None,
+) -> dict:
+    """Everything the monthly summary card shows, as plain data.
+
+    ``savings`` and ``previous_savings`` are optional precomputed
+    ``savings_totals`` for the month and the month before, which lets callers
+    pass only the rows of those two months (see ``savings_snapshots``).
+    """
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+    if savings is None:
+        savings = savings_totals(transactions, month_end)
+    totals, category_totals, month_transactions, daily_expense = aggregate_month(transactions, year, month, savings)
+    previous = None
+    if compare:
+        previous = aggregate_month(transactions, *previous_period(year, month), previous_savings)[0]
+    categories = []
+    for category in sorted(category_totals, key=lambda name: (-category_totals[name], name.lower())):
+        spent = category_totals[category]
+        budget = budget_map.get(category)
+        categories.append(
+            {
+                "category": category,
+                "spent": spent,
+                "budget": budget if budget else None,
+                "variance": (budget - spent) if budget else None,
+                "used_percent": (spent / budget * Decimal("100.00")) if budget else None,
+            }
+        )
+    return {
+        "year": year,
+        "month": month,
+        "period_label": date(year, month, 1).strftime("%B %Y"),
+        "transaction_count": len(month_transactions),
+        "totals": totals,
+        "net": totals["income"] - totals["expense"] - totals["savings"],
+        "previous_totals": previous,
+        "categories": categories,
+        "alerts": month_alerts(category_totals, month_transactions, budget_map, today),
+        "forecast": month_forecast(month_transactions, year, month, today),
+        "daily_expense": {day: daily_expense[day] for day in sorted(daily_expense)},
+        "days_in_month": month_end.day,
+        "savings_by_category": sorted(
+            ((cat, amount) for cat, amount in savings.items() if amount > 0), key=lambda item: item[0].lower()
+        ),
+    }
+
+
+class Ledger:
+    """Normalized transactions in file order, with budgets and cached per-month views.
+
+    Methods that take a month answer what the functions above answer for the
+    whole list; the month grouping and the running savings totals they use are
+    built once and dropped whenever the ledger changes.
+    """
+
+    def __init__(self, transactions=(), budgets: dict[str, Decimal] | None = None):
+        self.transactions: list[dict] = list(transactions)
+        self.budgets: dict[str, Decimal] = dict(budgets or {})
+        self.balance = Decimal("0.00")
+        self.categories: set[str] = set()
+        for tx in self.transactions:
+            self._account(tx, 1)
+        self._invalidate()
+
+    @classmethod
+    def from_rows(cls, rows, budgets: dict[str, Decimal] | None = None) -> "Ledger":
+        """Build from raw CSV rows (``csv.DictReader`` dicts), normalizing each one."""
+        return cls((normalize_transaction(row) for row in rows), budgets)
+
+    @classmethod
+    def read(cls, ledger_path: Path, budget_path: Path | None = None) -> "Ledger":
+        """Load ``transactions.csv`` (missing file: empty ledger) and optionally ``budgets.csv``."""
+        try:
+            transactions = read_transactions(ledger_path)
+        except FileNotFoundError:
+            transactions = []
+        return cls(transactions, read_budgets(budget_path) if budget_path is not None else None)
+
+    @classmethod
+    def load(cls, data_dir: Path = DEFAULT_DATA_DIR) -> "Ledger":
+        data_dir = Path(data_dir)
+        return cls.read(data_dir / "transactions.csv", data_dir / "budgets.csv")
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def __iter__(self):
+        return iter(self.transactions)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_groups"] = None
+        state["_savings_keys"] = None
+        state["_savings_running"] = None
+        return state
+
+    def _invalidate(self) -> None:
+        self._groups: dict[tuple[int, int], list[dict]] | None = None
+        self._savings_keys: list[tuple[int, int]] | None = None
+        self._savings_running: list[dict[str, Decimal]] | None = None
+
+    def _account(self, tx: dict, sign: int) -> None:
+        if tx["category"] and sign > 0:
+            self.categories.add(tx["category"])
+        # Savings are transfers and leave the balance alone.
+        if tx["type"] == "income":
+            self.balance += sign * tx["amount"]
+        elif tx["type"] == "expense":
+            self.balance -= sign * tx["amount"]
+
+    def append(self, tx: dict) -> None:
+        self.transactions.append(tx)
+        self._account(tx, 1)
+        self._invalidate()
+
+    def insert(self, row: int, tx: dict) -> None:
+        self.transactions.insert(row, tx)
+        self._account(tx, 1)
+        self._invalidate()
+
+    def extend(self, transactions) -> None:
+        for tx in transactions:
+            self.transactions.append(tx)
+            self._account(tx, 1)
+        self._invalidate()
+
+    def index_of(self, tx_id: str) -> int | None:
+        for row, tx in enumerate(self.transactions):
+            if tx["tx_id"] == tx_id:
+                return row
+        return None
+
+    def remove(self, tx_id: str) -> dict | None:
+        """Drop the first transaction with ``tx_id`` and return it (``None`` if there is none)."""
+        row = self.index_of(tx_id)
+        if row is None:
+            return None
+        tx = self.transactions.pop(row)
+        self._account(tx, -1)
+        self._refresh_categories()
+        self._invalidate()
+        return tx
+
+    def replace(self, tx_id: str, tx: dict) -> dict | None:
+        """Swap the transaction with ``tx_id`` for ``tx`` in place and return the old one."""
+        row = self.index_of(tx_id)
+        if row is None:
+            return None
+        old = self.transactions[row]
+        self.transactions[row] = tx
+        self._account(old, -1)
+        self._account(tx, 1)
+        self._refresh_categories()
+        self._invalidate()
+        return old
+
+    def _refresh_categories(self) -> None:
+        self.categories = {tx["category"] for tx in self.transactions if tx["category"]}
+
+    def next_tx_id(self) -> str:
+        """The id ``add_transaction`` gives the next row: one past the last row's number."""
+        if not self.transactions:
+            return "TX001"
+        return f"TX{int(self.transactions[-1]['tx_id'][2:]) + 1:03d}"
+
+    def groups(self) -> dict[tuple[int, int], list[dict]]:
+        if self._groups is None:
+            self._groups = group_by_month(self.transactions)
+        return self._groups
+
+    def periods(self) -> list[tuple[int, int]]:
+        """Months that have at least one transaction, oldest first."""
+        return sorted(self.groups())
+
+    def month_transactions(self, year: int, month: int, type_filter: str | None = None) -> list[dict]:
+        rows = self.groups().get((year, month), [])
+        if type_filter:
+            return [tx for tx in rows if tx["type"] == type_filter]
+        return list(rows)
+
+    def savings_totals(self, period_end: date | None = None) -> dict[str, Decimal]:
+        """``savings_totals`` for this ledger; month-end cut-offs come from cached running totals."""
+        if period_end is None or period_end.day != calendar.monthrange(period_end.year, period_end.month)[1]:
+            return savings_totals(self.transactions, period_end)
+        if self._savings_running is None:
+            keys = sorted(self.groups())
+            snapshots = savings_snapshots(self.groups(), keys)
+            self._savings_keys = keys
+            self._savings_running = [snapshots[key] for key in keys]
+        index = bisect_right(self._savings_keys, (period_end.year, period_end.month)) - 1
+        return dict(self._savings_running[index]) if index >= 0 else {}
+
+    def savings_at(self, year: int, month: int) -> dict[str, Decimal]:
+        return self.savings_totals(date(year, month, calendar.monthrange(year, month)[1]))
+
+    def savings_balance(self) -> Decimal:
+        return sum(savings_totals(self.transactions).values(), Decimal("0.00"))
+
+    def aggregate_month(self, year: int, month: int):
+        """Same result as ``aggregate_month(self.transactions, year, month)`` from one month's rows."""
+        return aggregate_month(self.groups().get((year, month), []), year, month, self.savings_at(year, month))
+
+    def summary(self, year: int, month: int, compare: bool = False, today: date | None = None) -> dict:
+        """``month_summary`` for one month, using only that month's (and the previous month's) rows."""
+        previous = previous_period(year, month)
+        groups = self.groups()
+        rows = groups.get((year, month), [])
+        if compare:
+            rows = groups.get(previous, []) + rows
+        return month_summary(
+            rows,
+            self.budgets,
+            year,
+            month,
+            compare=compare,
+            today=today,
+            savings=self.savings_at(year, month),
+            previous_savings=self.savings_at(*previous),
+        )
+
+    def budget_status(self, year: int, month: int) -> list[dict]:
+        """Spending against each budget for one month, as the budget card shows it."""
+        spent_by_category = self.aggregate_month(year, month)[1]
+        rows = []
+        for category in sorted(self.budgets):
+            budget = self.budgets[category]
+            spent = spent_by_category.get(category, Decimal("0.00"))
+            rows.append(
+                {
+                    "category": category,
+                    "budget": budget,
+                    "spent": spent,
+                    "remaining": budget - spent,
+                    "used_percent": (spent / budget * Decimal("100.00")) if budget > 0 else None,
+                }
+            )
+        return rows
+
+    def forecast(self, year: int, month: int, today: date | None = None) -> dict | None:
+        month_transactions = self.aggregate_month(year, month)[2]
+        return month_forecast(month_transactions, year, month, today)
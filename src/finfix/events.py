@@ -0,0 +1,333 @@
+"""An append-only journal of every ledger change, with periodic snapshots.
+
+``transactions.csv`` only holds the current state. Edits overwrite rows and
+deletes drop them. A folder in event mode also keeps ``events.jsonl`` next
+to it, with one JSON line per change:
+
+    {"seq": 42, "at": "2026-03-05T18:22:10", "kind": "edited",
+     "removed": [[null, ["TX012", "2026-03-01", "expense", "Food", "12.00", "lunch"]]],
+     "added": [[null, ["TX012", "2026-03-01", "expense", "Food", "21.00", "lunch"]]],
+     "csv": [5120, 1772734930123456789]}
+
+``kind`` is ``created``, ``withdrawn`` (a savings withdrawal and its
+expense), ``edited``, ``deleted`` or ``external``. ``removed`` and ``added``
+are a ``history.Command``, so replaying an event is ``apply_to_ledger``.
+Undo is not a rewind: it appends the inverse change, so the journal keeps
+both the mistake and its correction. ``csv`` is the ledger file's
+(size, mtime) right after the change. When the file no longer matches it,
+something wrote the CSV without journaling: a hand edit, an older FinFix, a
+spreadsheet. ``catch_up`` then records the difference as an ``external``
+event before the next change is journaled, so nothing escapes the trail.
+
+Every ``SNAPSHOT_EVERY`` events the state is written to
+``snapshots/<seq>-<time>.json``, along with the journal offset it covers.
+Loading the current ledger reads the newest snapshot and replays only the
+events after it. ``replay(until=...)`` rebuilds the ledger as it stood at
+any past moment from the newest snapshot taken before then. Older snapshots are
+thinned to the last one of each month, plus the baseline and the
+``KEEP_RECENT_SNAPSHOTS`` newest. Replay is therefore bounded by
+``SNAPSHOT_EVERY`` events at startup and by about a month of events for
+past dates, however long the journal grows.
+
+``EventLog.start`` turns event mode on. It journals a ``baseline`` event and
+snapshots the current CSV; history before that point is unknown. Budgets
+are not journaled.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, time as clock
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator
+
+from .core import Ledger, read_budgets, read_transactions
+from .filesync import atomic_write, locked
+from .history import Command, apply_to_ledger, ledger_row
+
+EVENTS_FILE = "events.jsonl"
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_EVERY = 500  # events between snapshots; the most a startup replays
+KEEP_RECENT_SNAPSHOTS = 3  # newest snapshots kept besides one per month
+_TAIL_CHUNK = 8192
+
+
+class JournalError(Exception):
+    """The journal is missing, unreadable or disagrees with itself."""
+
+
+def _tx(row: list[str]) -> dict:
+    # Rows in the journal were written from normalized transactions, so only the amount needs converting back.
+    tx_id, tx_date, ttype, category, amount, desc = row
+    return {"tx_id": tx_id, "date": tx_date, "type": ttype, "category": category, "amount": Decimal(amount), "desc": desc}
+
+
+def _placed(items) -> list:
+    return [[row, ledger_row(tx)] for row, tx in items]
+
+
+def _command(event: dict) -> Command:
+    return Command(
+        event["kind"],
+        removed=tuple((row, _tx(fields)) for row, fields in event.get("removed", ())),
+        added=tuple((row, _tx(fields)) for row, fields in event.get("added", ())),
+    )
+
+
+def event_kind(command: Command) -> str:
+    replacements = command.replacements()
+    if replacements and len(command.removed) == len(command.added) == len(replacements):
+        return "edited"
+    if command.removed and not command.added:
+        return "deleted"
+    if command.added and not command.removed:
+        withdrawal = any(tx["type"] == "savings" and tx["amount"] < 0 for _, tx in command.added)
+        return "withdrawn" if withdrawal else "created"
+    return "external"
+
+
+def _stamp(path: Path) -> list[int] | None:
+    try:
+        info = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [info.st_size, info.st_mtime_ns]
+
+
+def _moment(when: date | datetime) -> datetime:
+    """A date means the end of that day."""
+    if isinstance(when, datetime):
+        return when
+    return datetime.combine(when, clock.max)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    seq: int
+    at: datetime
+    path: Path
+
+
+class EventLog:
+    """The journal kept next to ledger file ``ledger_path``; writes happen under that ledger's lock."""
+
+    def __init__(self, ledger_path: Path):
+        self.ledger_path = Path(ledger_path)
+        self.path = self.ledger_path.with_name(EVENTS_FILE)
+        self.snapshot_dir = self.ledger_path.with_name(SNAPSHOT_DIR)
+
+    @classmethod
+    def existing(cls, ledger_path: Path) -> "EventLog | None":
+        """The folder's journal if it is in event mode, else ``None``."""
+        journal = cls(ledger_path)
+        return journal if journal.path.exists() else None
+
+    @classmethod
+    def start(cls, ledger_path: Path) -> "EventLog":
+        """Put the folder in event mode: journal a baseline and snapshot the current CSV. Does nothing if already on."""
+        journal = cls(ledger_path)
+        with locked(journal.ledger_path):
+            if not journal.path.exists():
+                rows = journal._read_csv()
+                _, offset = journal._append({"kind": "baseline", "rows": len(rows)})
+                journal._write_snapshot(0, offset, rows)
+        return journal
+
+    # Reading
+
+    def events(self, start: int = 0) -> Iterator[dict]:
+        """Events from byte ``start`` on; a last line still being written is skipped."""
+        with self.path.open("rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                yield json.loads(line)
+
+    def last_event(self) -> dict | None:
+        with self.path.open("rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            data = b""
+            while position > 0 and data.count(b"\n") < 2:
+                step = min(_TAIL_CHUNK, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = [line for line in data[: data.rfind(b"\n")].split(b"\n") if line]
+        return json.loads(lines[-1]) if lines else None
+
+    def snapshots(self) -> list[Snapshot]:
+        """Snapshots on disk, oldest first."""
+        found = []
+        try:
+            names = os.listdir(self.snapshot_dir)
+        except FileNotFoundError:
+            return []
+        for name in names:
+            seq, sep, rest = name.partition("-")
+            if not sep or not name.endswith(".json"):
+                continue
+            try:
+                found.append(Snapshot(int(seq), datetime.strptime(rest[: -len(".json")], "%Y%m%dT%H%M%S"), self.snapshot_dir / name))
+            except ValueError:
+                continue
+        return sorted(found, key=lambda snapshot: snapshot.seq)
+
+    def in_step(self) -> bool:
+        """Whether the CSV is exactly as the last journaled change left it."""
+        last = self.last_event()
+        return last is not None and last.get("csv") == _stamp(self.ledger_path)
+
+    def replay(self, until: date | datetime | None = None, budgets: dict[str, Decimal] | None = None) -> Ledger:
+        """The ledger as the journal says it stood at ``until`` (default: now), from the nearest earlier snapshot."""
+        moment = None if until is None else _moment(until)
+        snapshots = self.snapshots()
+        if not snapshots:
+            raise JournalError(f"{self.snapshot_dir} holds no snapshot to start from")
+        if moment is not None:
+            snapshots = [snapshot for snapshot in snapshots if snapshot.at <= moment]
+            if not snapshots:
+                raise JournalError(f"the journal starts at {self.snapshots()[0].at:%Y-%m-%d %H:%M:%S}")
+        with snapshots[-1].path.open(encoding="utf-8") as f:
+            document = json.load(f)
+        ledger = Ledger((_tx(row) for row in document["rows"]), budgets)
+        for event in self.events(document["offset"]):
+            if moment is not None and datetime.fromisoformat(event["at"]) > moment:
+                break
+            if event.get("removed") or event.get("added"):
+                apply_to_ledger(ledger, _command(event), check=False)
+        return ledger
+
+    # Writing (callers hold the ledger lock; taking it again here is free)
+
+    def catch_up(self) -> dict | None:
+        """Journal what changed in the CSV since the last event, if anything wrote it without journaling."""
+        with locked(self.ledger_path):
+            last = self.last_event()
+            if last is not None and last.get("csv") == _stamp(self.ledger_path):
+                return None
+            rows = self._read_csv()
+            journaled = Counter(tuple(ledger_row(tx)) for tx in self.replay().transactions)
+            current = Counter(map(tuple, rows))
+            added = []
+            new = current - journaled
+            for index, row in enumerate(rows):
+                if new[tuple(row)]:
+                    new[tuple(row)] -= 1
+                    added.append([index, row])
+            removed = [[None, list(row)] for row in (journaled - current).elements()]
+            event, offset = self._append({"kind": "external", "removed": removed, "added": added})
+            # Replaying the diff may order rows differently from the file; start the next replay from the file itself.
+            self._write_snapshot(event["seq"], offset, rows)
+            return event
+
+    def record(self, command: Command) -> dict:
+        """Journal ``command``, just written to the CSV; snapshots every ``SNAPSHOT_EVERY`` events."""
+        with locked(self.ledger_path):
+            event, offset = self._append(
+                {"kind": event_kind(command), "removed": _placed(command.removed), "added": _placed(command.added)}
+            )
+            snapshots = self.snapshots()
+            if not snapshots or event["seq"] - snapshots[-1].seq >= SNAPSHOT_EVERY:
+                self._write_snapshot(event["seq"], offset, [ledger_row(tx) for tx in self.replay().transactions])
+            return event
+
+    def snapshot(self) -> Snapshot:
+        """Snapshot the journal's current state now."""
+        with locked(self.ledger_path):
+            last = self.last_event()
+            if last is None:
+                raise JournalError(f"{self.path} is empty")
+            ledger = self.replay()
+            return self._write_snapshot(last["seq"], self.path.stat().st_size, [ledger_row(tx) for tx in ledger.transactions])
+
+    def _read_csv(self) -> list[list[str]]:
+        try:
+            return [ledger_row(tx) for tx in read_transactions(self.ledger_path)]
+        except FileNotFoundError:
+            return []
+
+    def _append(self, event: dict) -> tuple[dict, int]:
+        """Write ``event`` as the next line, stamped with seq, time and the CSV's state; returns it and the offset after it."""
+        last = self.last_event() if self.path.exists() else None
+        event = {
+            "seq": 0 if last is None else last["seq"] + 1,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            **event,
+            "csv": _stamp(self.ledger_path),
+        }
+        with self.path.open("a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    f.truncate(_last_newline(f, end))  # half a line from a crash was never a complete event
+            f.write(json.dumps(event).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            return event, f.tell()
+
+    def _write_snapshot(self, seq: int, offset: int, rows: list[list[str]]) -> Snapshot:
+        self.snapshot_dir.mkdir(exist_ok=True)
+        at = datetime.now().replace(microsecond=0)
+        path = self.snapshot_dir / f"{seq:08d}-{at:%Y%m%dT%H%M%S}.json"
+        with atomic_write(path) as f:
+            json.dump({"seq": seq, "at": at.isoformat(), "offset": offset, "rows": rows}, f, separators=(",", ":"))
+        self._prune_snapshots()
+        return Snapshot(seq, at, path)
+
+    def _prune_snapshots(self) -> None:
+        snapshots = self.snapshots()
+        keep = {snapshots[0].seq} | {snapshot.seq for snapshot in snapshots[-KEEP_RECENT_SNAPSHOTS:]}
+        last_of_month = {}
+        for snapshot in snapshots:
+            last_of_month[(snapshot.at.year, snapshot.at.month)] = snapshot.seq
+        keep |= set(last_of_month.values())
+        for snapshot in snapshots:
+            if snapshot.seq not in keep:
+                snapshot.path.unlink(missing_ok=True)
+
+    # Checking
+
+    def verify(self) -> list[str]:
+        """Differences between replaying the journal and the CSV; empty when they agree."""
+        problems = []
+        if not self.in_step():
+            problems.append("transactions.csv changed since the last journaled event (not yet caught up)")
+        journaled = [ledger_row(tx) for tx in self.replay().transactions]
+        rows = self._read_csv()
+        if journaled != rows:
+            missing = Counter(map(tuple, journaled)) - Counter(map(tuple, rows))
+            extra = Counter(map(tuple, rows)) - Counter(map(tuple, journaled))
+            if not missing and not extra:
+                problems.append("same rows in a different order")
+            problems.extend(f"journal only: {','.join(row)}" for row in missing.elements())
+            problems.extend(f"file only: {','.join(row)}" for row in extra.elements())
+        return problems
+
+
+def _last_newline(f, end: int) -> int:
+    """Offset just after the last ``\\n`` before ``end`` (0 if none)."""
+    position = end
+    while position > 0:
+        step = min(_TAIL_CHUNK, position)
+        position -= step
+        f.seek(position)
+        chunk = f.read(step)
+        index = chunk.rfind(b"\n")
+        if index >= 0:
+            return position + index + 1
+    return 0
+
+
+def load(data_dir: Path) -> Ledger:
+    """``Ledger.load``, starting from the latest snapshot when the folder keeps a journal in step with its CSV."""
+    data_dir = Path(data_dir)
+    journal = EventLog.existing(data_dir / "transactions.csv")
+    if journal is None or not journal.in_step():
+        return Ledger.load(data_dir)
+    return journal.replay(budgets=read_budgets(data_dir / "budgets.csv"))
@@ -0,0 +1,118 @@
+"""Streaming CSV export for arbitrary date ranges.
+
+Rows flow through a chain of generators (read -> normalize -> filter ->
+format -> write), so memory stays constant no matter how large the ledger or
+the range is. The same stages accept an in-memory transaction list.
+
+    python -m finfix.export --from 2016-01-01 --to 2025-12-31 --type expense --output expenses.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from .core import DEFAULT_DATA_DIR, TRANSACTION_TYPES, normalize_transaction
+
+CSV_HEADER = ["date", "type", "category", "amount_rm", "description", "tx_id"]
+SOURCE_CSV_HEADER = CSV_HEADER + ["source"]  # consolidated exports name the ledger each row came from
+
+
+def iter_ledger(path: Path) -> Iterator[dict]:
+    """Normalized transactions read lazily from a ledger CSV."""
+    with Path(path).open(newline="", encoding="utf-8") as f:
+        for raw in csv.DictReader(f):
+            yield normalize_transaction(raw)
+
+
+def filter_transactions(
+    transactions: Iterable[dict],
+    start: date | None = None,
+    end: date | None = None,
+    types: Iterable[str] | None = None,
+    categories: Iterable[str] | None = None,
+) -> Iterator[dict]:
+    """Transactions dated within ``start``..``end`` (inclusive) matching the type/category sets.
+
+    Categories match case-insensitively. Normalized dates are ISO strings, so
+    the range check is a plain string comparison.
+    """
+    low = start.isoformat() if start else None
+    high = end.isoformat() if end else None
+    type_set = {t.lower() for t in types} if types else None
+    category_set = {c.strip().lower() for c in categories} if categories else None
+    for tx in transactions:
+        tx_date = tx["date"]
+        if low is not None and tx_date < low:
+            continue
+        if high is not None and tx_date > high:
+            continue
+        if type_set is not None and tx["type"] not in type_set:
+            continue
+        if category_set is not None and tx["category"].lower() not in category_set:
+            continue
+        yield tx
+
+
+def csv_rows(transactions: Iterable[dict], with_source: bool = False) -> Iterator[list[str]]:
+    for tx in transactions:
+        row = [tx["date"], tx["type"], tx["category"], f"{tx['amount']:.2f}", tx["desc"], tx["tx_id"]]
+        if with_source:
+            row.append(tx["source"])
+        yield row
+
+
+def write_csv(rows: Iterable[list[str]], out: TextIO, header: list[str] = CSV_HEADER) -> int:
+    """Write the header and ``rows`` to ``out``; return the number of data rows."""
+    writer = csv.writer(out)
+    writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def export_csv(transactions: Iterable[dict], path: Path, **filters) -> int:
+    """Stream matching ``transactions`` into a CSV file at ``path``."""
+    with Path(path).open("w", newline="", encoding="utf-8") as out:
+        return write_csv(csv_rows(filter_transactions(transactions, **filters)), out)
+
+
+def export_ledger_csv(ledger_path: Path, path: Path, **filters) -> int:
+    """Stream a ledger file on disk through the filters into ``path``."""
+    return export_csv(iter_ledger(ledger_path), path, **filters)
+
+
+def _parse_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {text!r}") from None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m finfix.export", description="Export FinFix transactions to CSV.")
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_DATA_DIR / "transactions.csv", help="ledger CSV to read")
+    parser.add_argument("--from", dest="start", type=_parse_date, help="first date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=_parse_date, help="last date, YYYY-MM-DD")
+    parser.add_argument("--type", dest="types", action="append", choices=TRANSACTION_TYPES, help="repeat to allow several")
+    parser.add_argument("--category", dest="categories", action="append", help="repeat to allow several")
+    parser.add_argument("--output", default="-", help="CSV file to write, or - for stdout")
+    args = parser.parse_args(argv)
+
+    filters = {"start": args.start, "end": args.end, "types": args.types, "categories": args.categories}
+    if args.output == "-":
+        count = write_csv(csv_rows(filter_transactions(iter_ledger(args.ledger), **filters)), sys.stdout)
+    else:
+        count = export_ledger_csv(args.ledger, Path(args.output), **filters)
+        print(f"Exported {count} transaction(s) to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
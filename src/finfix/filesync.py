@@ -0,0 +1,191 @@
+"""Safe sharing of a ledger folder between FinFix windows, the CLI and scripts.
+
+Writers take an advisory exclusive lock on a ``<file>.lock`` file next to
+the file they change. It uses ``fcntl.flock`` on POSIX and
+``msvcrt.locking`` on Windows. Read-modify-write sequences (next id then
+append, rewrite one row) happen entirely under the lock, so two processes
+cannot interleave or undo each other's changes. The lock is re-entrant
+within a thread, so a function that locks can call another that does.
+
+Readers never lock. Full rewrites go through ``atomic_write``, which writes
+a temporary file and ``os.replace``-s it into place, so a reader sees the
+old file or the new one, never a truncated one. Appends are one write each.
+``read_changes`` only consumes complete lines, so a reader racing an append
+picks up the rest on its next call.
+
+``read_changes`` also makes reloads incremental. When the file only grew
+and the bytes before the old end are unchanged, just the new rows are
+parsed.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator
+
+from .core import normalize_transaction
+
+if os.name == "nt":  # pragma: no cover - exercised on Windows only
+    import msvcrt
+
+    def _try_lock(handle: IO) -> bool:
+        handle.seek(0)
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(handle: IO) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(handle: IO) -> bool:
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(handle: IO) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+LOCK_TIMEOUT = 5.0
+LOCK_POLL_INTERVAL = 0.02
+TAIL_BYTES = 64  # bytes before the last known end that must be unchanged for an append-only reload
+REPLACE_RETRIES = 10  # Windows refuses os.replace while another process has the file open
+
+
+class LockTimeout(TimeoutError):
+    def __init__(self, path: Path, timeout: float):
+        super().__init__(f"{Path(path).name} is being changed by another FinFix window or script (waited {timeout:.0f} s).")
+        self.path = Path(path)
+
+
+def lock_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+_held: dict[tuple[int, Path], list] = {}  # (thread id, lock file) -> [handle, depth]
+_held_guard = threading.Lock()
+
+
+@contextmanager
+def locked(path: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the exclusive write lock for ``path``; raises ``LockTimeout`` after ``timeout`` seconds."""
+    key = (threading.get_ident(), lock_path(path))
+    with _held_guard:
+        entry = _held.get(key)
+        if entry is not None:
+            entry[1] += 1
+    if entry is None:
+        handle = open(key[1], "a+b")
+        deadline = time.monotonic() + timeout
+        while not _try_lock(handle):
+            if time.monotonic() >= deadline:
+                handle.close()
+                raise LockTimeout(path, timeout)
+            time.sleep(LOCK_POLL_INTERVAL)
+        entry = [handle, 1]
+        with _held_guard:
+            _held[key] = entry
+    try:
+        yield
+    finally:
+        with _held_guard:
+            entry[1] -= 1
+            release = entry[1] == 0
+            if release:
+                del _held[key]
+        if release:
+            try:
+                _unlock(entry[0])
+            finally:
+                entry[0].close()
+
+
+@contextmanager
+def atomic_write(path: Path, newline: str | None = "") -> Iterator[IO[str]]:
+    """Open a temporary file for writing and move it over ``path`` once the block succeeds."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", newline=newline, encoding="utf-8") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                os.replace(tmp_path, path)
+                break
+            except PermissionError:
+                if attempt == REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(LOCK_POLL_INTERVAL * (attempt + 1))
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@dataclass(frozen=True)
+class FileState:
+    """How far a reader got: bytes consumed, the file's mtime then, and the bytes just before that point."""
+
+    size: int
+    mtime_ns: int
+    tail: bytes
+
+
+def file_state(path: Path) -> FileState | None:
+    try:
+        with Path(path).open("rb") as f:
+            info = os.fstat(f.fileno())
+            f.seek(max(0, info.st_size - TAIL_BYTES))
+            tail = f.read(TAIL_BYTES)
+    except OSError:
+        return None
+    return FileState(info.st_size, info.st_mtime_ns, tail)
+
+
+def read_changes(path: Path, since: FileState | None) -> tuple[str, list[dict], FileState | None]:
+    """What changed in ledger ``path`` since ``since``.
+
+    Returns ``("unchanged", [], state)``, ``("appended", new_rows, state)``
+    with only the rows added after ``since``, or ``("replaced", [], state)``
+    when the file was rewritten (or is new) and needs a full read.
+    """
+    try:
+        f = Path(path).open("rb")
+    except FileNotFoundError:
+        return ("unchanged" if since is None else "replaced"), [], None
+    with f:
+        info = os.fstat(f.fileno())
+        if since is not None and info.st_size == since.size and info.st_mtime_ns == since.mtime_ns:
+            return "unchanged", [], since
+        if since is None or info.st_size < since.size or not since.tail:
+            return "replaced", [], file_state(path)
+        f.seek(since.size - len(since.tail))
+        if f.read(len(since.tail)) != since.tail:
+            return "replaced", [], file_state(path)
+        added = f.read(info.st_size - since.size)
+        complete = added[: added.rfind(b"\n") + 1]  # leave a half-written last line for next time
+        if not complete:
+            return "unchanged", [], since
+        f.seek(0)
+        header = next(csv.reader(io.TextIOWrapper(io.BytesIO(f.readline()), encoding="utf-8", newline="")), [])
+        end = since.size + len(complete)
+        tail = (since.tail + complete)[-TAIL_BYTES:]
+    rows = csv.DictReader(io.StringIO(complete.decode("utf-8"), newline=""), fieldnames=header)
+    return "appended", [normalize_transaction(row) for row in rows], FileState(end, info.st_mtime_ns, tail)
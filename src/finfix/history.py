@@ -0,0 +1,233 @@
+"""Undo/redo as a bounded log of commands with exact inverses.
+
+Every change to a ledger is a ``Command``: the rows it takes out and the rows
+it puts in, each with the position it has in the ledger (``None`` for the
+end). Adding, duplicating and withdrawing savings only put rows in at the
+end. Deleting takes one row out. An edit takes the old row out and puts the
+new one, with the same ``tx_id``, in its place. The inverse of a command is
+the same command with the two sides swapped, so undo and redo never re-read
+the ledger.
+
+``apply_to_ledger`` applies a command to an in-memory ``Ledger`` and returns
+the rows that changed, so a list view can mirror them instead of rebuilding.
+``apply_to_file`` persists it to ``transactions.csv``:
+
+* rows put in at the end are appended, which is O(1);
+* rows taken off the end are cut off with a truncate, also O(1). Undoing the
+  latest add, duplicate or withdrawal takes this path;
+* anything else (an edit, a row removed from or restored into the middle)
+  rewrites the file atomically, just as an edit or delete always has.
+
+``CommandLog`` keeps at most ``depth`` commands on each stack. A command
+holds only the rows it touched, so a deep history costs kilobytes.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .core import Ledger
+from .filesync import atomic_write, locked
+
+DEFAULT_DEPTH = 100
+LEDGER_HEADER = ["tx_id", "date", "type", "category", "amount_rm", "desc"]
+_TAIL_CHUNK = 8192
+
+
+class CommandConflict(Exception):
+    """The ledger no longer holds the rows a command expects, e.g. another window deleted them."""
+
+
+@dataclass(frozen=True)
+class Command:
+    label: str
+    removed: tuple[tuple[int | None, dict], ...] = ()  # (row, tx); row None means the end
+    added: tuple[tuple[int | None, dict], ...] = ()
+
+    @classmethod
+    def addition(cls, label: str, *transactions: dict) -> "Command":
+        return cls(label, added=tuple((None, tx) for tx in transactions))
+
+    @classmethod
+    def deletion(cls, label: str, ledger: Ledger, row: int) -> "Command":
+        return cls(label, removed=((None if row == len(ledger) - 1 else row, ledger.transactions[row]),))
+
+    @classmethod
+    def edit(cls, label: str, old: dict, new: dict) -> "Command":
+        return cls(label, removed=((None, old),), added=((None, new),))
+
+    def inverse(self) -> "Command":
+        return Command(self.label, self.added, self.removed)
+
+    def replacements(self) -> dict[str, dict]:
+        """Ids taken out and put straight back in: edits, applied in place."""
+        added = {tx["tx_id"]: tx for _, tx in self.added if tx["tx_id"]}
+        return {tx["tx_id"]: added[tx["tx_id"]] for _, tx in self.removed if tx["tx_id"] in added}
+
+
+def apply_to_ledger(ledger: Ledger, command: Command, check: bool = True) -> list[tuple[str, int, dict]]:
+    """Apply ``command`` to ``ledger``; returns ``("replace" | "remove" | "insert", row, tx)`` in order.
+
+    ``tx`` is the row's new transaction, or for ``"remove"`` the one taken out.
+
+    ``check=False`` skips the conflict checks, for replaying a journal that
+    recorded whatever the file held, duplicate ids included.
+    """
+    replacements = command.replacements()
+    if check:
+        missing = [tx["tx_id"] for _, tx in command.removed if ledger.index_of(tx["tx_id"]) is None]
+        if missing:
+            raise CommandConflict(f"{', '.join(missing)} is no longer in the ledger")
+        clashes = [
+            tx["tx_id"]
+            for _, tx in command.added
+            if tx["tx_id"] and tx["tx_id"] not in replacements and ledger.index_of(tx["tx_id"]) is not None
+        ]
+        if clashes:
+            raise CommandConflict(f"{', '.join(clashes)} is already used by another transaction")
+    changes: list[tuple[str, int, dict]] = []
+    for _, tx in command.removed:
+        tx_id = tx["tx_id"]
+        row = ledger.index_of(tx_id)
+        if tx_id in replacements:
+            ledger.replace(tx_id, replacements[tx_id])
+            changes.append(("replace", row, replacements[tx_id]))
+        else:
+            changes.append(("remove", row, ledger.remove(tx_id) or tx))
+    for row, tx in command.added:
+        if tx["tx_id"] in replacements:
+            continue
+        if row is None or row >= len(ledger):
+            row = len(ledger)
+            ledger.append(tx)
+        else:
+            ledger.insert(row, tx)
+        changes.append(("insert", row, tx))
+    return changes
+
+
+def _tail_offset(path: Path, tx_ids: list[str]) -> int | None:
+    """Byte offset where the last ``len(tx_ids)`` rows start, if those rows are exactly ``tx_ids``."""
+    count = len(tx_ids)
+    with Path(path).open("rb") as f:
+        end = position = f.seek(0, os.SEEK_END)
+        data = b""
+        while data.count(b"\n") <= count and position > 0:  # one newline more: the end of the row before them
+            step = min(_TAIL_CHUNK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    if not data.endswith(b"\n"):
+        return None
+    lines = data[:-1].split(b"\n")
+    if len(lines) <= count:
+        return None
+    tail = b"\n".join(lines[-count:]) + b"\n"
+    try:
+        rows = list(csv.reader(io.StringIO(tail.decode("utf-8"), newline="")))
+    except (UnicodeDecodeError, csv.Error):
+        return None
+    if len(rows) != count or sorted(row[0] if row else "" for row in rows) != sorted(tx_ids):
+        return None  # a quoted newline, or other rows after them: leave it to the rewrite
+    return end - len(tail)
+
+
+def ledger_row(tx: dict) -> list[str]:
+    """``tx`` as a ``transactions.csv`` row, in ``LEDGER_HEADER`` order."""
+    return [tx["tx_id"], tx["date"], tx["type"], tx["category"], f"{tx['amount']:.2f}", tx["desc"]]
+
+
+def _fields(tx: dict) -> dict:
+    return dict(zip(LEDGER_HEADER, ledger_row(tx)))
+
+
+def apply_to_file(path: Path, command: Command) -> str:
+    """Persist ``command`` to ledger ``path`` under its write lock; returns ``"append"``, ``"truncate"`` or ``"rewrite"``."""
+    path = Path(path)
+    with locked(path):
+        if not command.removed and all(row is None for row, _ in command.added):
+            with path.open("a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows(ledger_row(tx) for _, tx in command.added)
+            return "append"
+        if not command.added and all(row is None for row, _ in command.removed):
+            offset = _tail_offset(path, [tx["tx_id"] for _, tx in command.removed])
+            if offset is not None:
+                with path.open("r+b") as f:
+                    f.truncate(offset)
+                return "truncate"
+
+        with path.open(newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            header = [name for name in reader.fieldnames or () if name]
+        header += [name for name in LEDGER_HEADER if name not in header]
+        replacements = command.replacements()
+        removed = {tx["tx_id"] for _, tx in command.removed}
+        if len(removed & {row.get("tx_id") for row in rows}) != len(removed):
+            raise CommandConflict("the ledger file no longer holds the transaction(s) to change")
+        kept = []
+        for row in rows:
+            tx_id = row.get("tx_id")
+            if tx_id in replacements:
+                kept.append({**row, **_fields(replacements[tx_id])})
+            elif tx_id not in removed:
+                kept.append(row)
+        for position, tx in command.added:
+            if tx["tx_id"] in replacements:
+                continue
+            if position is None or position >= len(kept):
+                kept.append(_fields(tx))
+            else:
+                kept.insert(position, _fields(tx))
+        with atomic_write(path) as f:
+            writer = csv.DictWriter(f, fieldnames=header, restval="", extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(kept)
+        return "rewrite"
+
+
+class CommandLog:
+    """Undo and redo stacks of at most ``depth`` commands each; recording a new command clears redo."""
+
+    def __init__(self, depth: int = DEFAULT_DEPTH):
+        self._undo: deque[Command] = deque(maxlen=max(1, depth))
+        self._redo: deque[Command] = deque(maxlen=max(1, depth))
+
+    def record(self, command: Command) -> None:
+        self._undo.append(command)
+        self._redo.clear()
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+
+    def undo_label(self) -> str | None:
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self) -> str | None:
+        return self._redo[-1].label if self._redo else None
+
+    def undo(self, apply: Callable[[Command], bool]) -> Command | None:
+        """Hand the inverse of the latest command to ``apply``; it moves to the redo stack only if that succeeds."""
+        if not self._undo:
+            return None
+        command = self._undo[-1]
+        if not apply(command.inverse()):
+            return None
+        self._redo.append(self._undo.pop())
+        return command
+
+    def redo(self, apply: Callable[[Command], bool]) -> Command | None:
+        if not self._redo:
+            return None
+        command = self._redo[-1]
+        if not apply(command):
+            return None
+        self._undo.append(self._redo.pop())
+        return command
@@ -0,0 +1,389 @@
+"""Bulk import of bank and e-wallet CSV statements.
+
+Statement rows are streamed through a column mapping, validated with the same
+normalization rules as the ledger, de-duplicated against what is already
+recorded, and appended to the ledger in one write. A row counts as a duplicate
+when the ledger (plus the rows imported so far) already holds as many rows with
+the same date, amount and normalized description. Overlapping statements are
+therefore skipped, while two identical purchases on the same day in a single
+statement are both kept. Each lookup is a hash probe, so the cost per row is
+constant.
+
+    python -m finfix.importer statement.csv --date "Posting Date" --amount Amount --description Details
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .core import DEFAULT_DATA_DIR, money, normalize_transaction, read_transactions
+from .events import EventLog
+from .filesync import locked
+from .history import Command, ledger_row
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y", "%d %b %Y", "%d %b %y", "%Y/%m/%d")
+TYPE_ALIASES = {
+    "income": "income",
+    "credit": "income",
+    "cr": "income",
+    "deposit": "income",
+    "expense": "expense",
+    "debit": "expense",
+    "dr": "expense",
+    "withdrawal": "expense",
+    "payment": "expense",
+    "savings": "savings",
+    "saving": "savings",
+    "transfer to savings": "savings",
+}
+_HEADER_GUESSES = {
+    "date": ("date", "transaction date", "posting date", "posted date", "value date", "trans date", "time"),
+    "description": ("description", "details", "narrative", "merchant", "particulars", "reference", "desc", "memo"),
+    "amount": ("amount", "amount (rm)", "amount_rm", "transaction amount", "value"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "debit amount", "paid out"),
+    "credit": ("credit", "deposit", "deposits", "money in", "credit amount", "paid in"),
+    "type": ("type", "transaction type", "dr/cr", "cr/dr"),
+    "category": ("category",),
+}
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+class ImportRowError(ValueError):
+    """A statement row that cannot be turned into a transaction."""
+
+
+@dataclass
+class ColumnMapping:
+    """Which statement columns feed which ledger fields.
+
+    Either ``amount`` (signed; negative means money out) or ``debit``/``credit``
+    must be set. ``type`` overrides the sign when the statement has its own
+    debit/credit marker column.
+    """
+
+    date: str
+    description: str
+    amount: str | None = None
+    debit: str | None = None
+    credit: str | None = None
+    type: str | None = None
+    category: str | None = None
+    date_format: str | None = None
+    default_category: str = "General"
+    delimiter: str = ","
+
+    def validate(self, header: Iterable[str]) -> None:
+        columns = set(header)
+        if not self.amount and not (self.debit or self.credit):
+            raise ValueError("Map either an amount column or debit/credit columns.")
+        for name in (self.date, self.description, self.amount, self.debit, self.credit, self.type, self.category):
+            if name and name not in columns:
+                raise ValueError(f"Column {name!r} is not in the statement header.")
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnMapping":
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        return cls(**known)
+
+
+@dataclass
+class ImportResult:
+    transactions: list[dict] = field(default_factory=list)
+    duplicates: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    rows_read: int = 0
+    elapsed: float = 0.0
+
+
+def guess_mapping(header: list[str]) -> ColumnMapping | None:
+    """Best-effort mapping from common statement header names, or ``None`` without date/description/amounts."""
+    lowered = {name.strip().lower(): name for name in header}
+    found: dict[str, str | None] = {}
+    for target, candidates in _HEADER_GUESSES.items():
+        found[target] = next((lowered[c] for c in candidates if c in lowered), None)
+    if not found["date"] or not found["description"]:
+        return None
+    if not found["amount"] and not (found["debit"] or found["credit"]):
+        return None
+    return ColumnMapping(
+        date=found["date"],
+        description=found["description"],
+        amount=found["amount"],
+        debit=found["debit"],
+        credit=found["credit"],
+        type=found["type"],
+        category=found["category"],
+    )
+
+
+def normalize_description(desc: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", desc.lower()).split())
+
+
+def dedup_key(tx: dict) -> bytes:
+    """Compact digest of (date, amount, normalized description)."""
+    text = f"{tx['date']}|{tx['amount']:.2f}|{normalize_description(tx['desc'])}"
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).digest()
+
+
+def parse_amount(text: str) -> Decimal:
+    """Parse statement amounts such as ``RM1,234.50``, ``(12.00)``, ``-3.2`` or ``45.00 DR``."""
+    value = (text or "").strip().upper()
+    if not value:
+        raise ImportRowError("missing amount")
+    negative = False
+    if value.endswith("DR"):
+        negative, value = True, value[:-2]
+    elif value.endswith("CR"):
+        value = value[:-2]
+    value = value.strip()
+    if value.startswith("(") and value.endswith(")"):
+        negative, value = True, value[1:-1]
+    for token in ("MYR", "RM", ",", " "):
+        value = value.replace(token, "")
+    if value.startswith("-"):
+        negative, value = not negative, value[1:]
+    elif value.startswith("+"):
+        value = value[1:]
+    try:
+        amount = Decimal(value)
+        money(amount)  # raises when it has too many digits to hold in cents, e.g. 1E400
+    except InvalidOperation:
+        raise ImportRowError(f"invalid amount {text!r}") from None
+    if not amount.is_finite():
+        raise ImportRowError(f"invalid amount {text!r}")
+    return -amount if negative else amount
+
+
+def parse_date(text: str, date_format: str | None = None) -> str:
+    value = (text or "").strip()
+    if not value:
+        raise ImportRowError("missing date")
+    formats = (date_format,) if date_format else DATE_FORMATS
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    # Timestamps such as "2025-03-01 14:22:05" or ISO datetimes.
+    try:
+        return datetime.fromisoformat(value).date().isoformat()
+    except ValueError:
+        raise ImportRowError(f"unrecognized date {text!r}") from None
+
+
+def statement_to_ledger_row(raw: dict, mapping: ColumnMapping) -> dict:
+    """Map one statement row onto ledger fields; raises ``ImportRowError`` when it is unusable."""
+    tx_date = parse_date(raw.get(mapping.date, ""), mapping.date_format)
+    if mapping.amount:
+        signed = parse_amount(raw.get(mapping.amount, ""))
+    else:
+        debit = (raw.get(mapping.debit, "") or "").strip() if mapping.debit else ""
+        credit = (raw.get(mapping.credit, "") or "").strip() if mapping.credit else ""
+        signed = Decimal("0")
+        if debit:
+            signed -= abs(parse_amount(debit))
+        if credit:
+            signed += abs(parse_amount(credit))
+    if signed == 0:
+        raise ImportRowError("zero amount")
+    ttype = "income" if signed > 0 else "expense"
+    if mapping.type:
+        marker = (raw.get(mapping.type, "") or "").strip().lower()
+        ttype = TYPE_ALIASES.get(marker, ttype)
+    category = (raw.get(mapping.category, "") or "").strip() if mapping.category else ""
+    return {
+        "date": tx_date,
+        "type": ttype,
+        "category": category or mapping.default_category,
+        "amount_rm": str(abs(signed)),
+        "desc": (raw.get(mapping.description, "") or "").strip(),
+    }
+
+
+def read_header(path: Path, delimiter: str = ",") -> list[str]:
+    with Path(path).open(newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f, delimiter=delimiter), [])
+
+
+def iter_statement(path: Path, mapping: ColumnMapping) -> Iterator[tuple[int, dict]]:
+    """(line number, raw row) pairs streamed from a statement file."""
+    with Path(path).open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f, delimiter=mapping.delimiter)
+        mapping.validate(reader.fieldnames or [])
+        for raw in reader:
+            yield reader.line_num, raw
+
+
+def _tx_number(tx_id: str) -> int:
+    digits = tx_id[2:] if tx_id.upper().startswith("TX") else ""
+    return int(digits) if digits.isdigit() else 0
+
+
+def plan_import(
+    rows: Iterable[tuple[int, dict]],
+    mapping: ColumnMapping,
+    existing: list[dict],
+) -> ImportResult:
+    """Validate, de-duplicate and number statement rows against ``existing`` transactions."""
+    started = time.perf_counter()
+    result = ImportResult()
+    seen = Counter(dedup_key(tx) for tx in existing)
+    next_number = max((_tx_number(tx["tx_id"]) for tx in existing), default=0) + 1
+    incoming: Counter[bytes] = Counter()
+    for line, raw in rows:
+        result.rows_read += 1
+        try:
+            ledger_row = statement_to_ledger_row(raw, mapping)
+        except ImportRowError as exc:
+            result.errors.append((line, str(exc)))
+            continue
+        tx = normalize_transaction(ledger_row)
+        key = dedup_key(tx)
+        incoming[key] += 1
+        if incoming[key] <= seen[key]:
+            result.duplicates += 1
+            continue
+        tx["tx_id"] = f"TX{next_number:03d}"
+        next_number += 1
+        result.transactions.append(tx)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _row_count(ledger_path: Path) -> int:
+    with Path(ledger_path).open(newline="", encoding="utf-8") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+def append_transactions(ledger_path: Path, transactions: list[dict]) -> None:
+    """Append ``transactions`` to the ledger CSV in a single write, under the ledger's write lock.
+
+    In a folder that keeps an event journal the append is journaled too.
+    """
+    if not transactions:
+        return
+    journal = EventLog.existing(ledger_path)
+    with locked(ledger_path):
+        if journal is not None:
+            journal.catch_up()
+        with Path(ledger_path).open("a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(ledger_row(tx) for tx in transactions)
+        if journal is not None:
+            journal.record(Command.addition("import", *transactions))
+
+
+def import_statement(
+    path: Path,
+    mapping: ColumnMapping,
+    ledger_path: Path,
+    existing: list[dict] | None = None,
+    dry_run: bool = False,
+) -> ImportResult:
+    """Import a statement file into the ledger; ``existing`` skips re-reading an already loaded ledger.
+
+    Without ``dry_run`` the ledger stays locked from planning to appending, so
+    the new ids cannot collide with rows another process adds meanwhile; an
+    ``existing`` list that is out of date with the file is ignored.
+    """
+    if dry_run:
+        return plan_import(iter_statement(path, mapping), mapping, existing if existing is not None else read_transactions(ledger_path))
+    with locked(ledger_path):
+        if existing is None or len(existing) != _row_count(ledger_path):
+            existing = read_transactions(ledger_path)
+        result = plan_import(iter_statement(path, mapping), mapping, existing)
+        append_transactions(ledger_path, result.transactions)
+    return result
+
+
+def load_mapping(path: Path) -> ColumnMapping | None:
+    try:
+        with Path(path).open(encoding="utf-8") as f:
+            return ColumnMapping.from_dict(json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_mapping(path: Path, mapping: ColumnMapping) -> None:
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(mapping.to_dict(), f, indent=2)
+
+
+def add_mapping_arguments(parser: argparse.ArgumentParser) -> None:
+    """Column-mapping options shared by this script and ``finfix import``."""
+    parser.add_argument("--date", help="date column (guessed from the header when omitted)")
+    parser.add_argument("--description", help="description column")
+    parser.add_argument("--amount", help="signed amount column")
+    parser.add_argument("--debit", help="money-out column")
+    parser.add_argument("--credit", help="money-in column")
+    parser.add_argument("--type", dest="type_column", help="debit/credit marker column")
+    parser.add_argument("--category", help="category column")
+    parser.add_argument("--date-format", help="strptime format, e.g. %%d/%%m/%%Y")
+    parser.add_argument("--default-category", default="General")
+    parser.add_argument("--delimiter", default=",")
+
+
+def mapping_from_args(args: argparse.Namespace, header: list[str]) -> ColumnMapping:
+    """Guess the mapping from ``header``, then apply the explicit column options."""
+    mapping = guess_mapping(header) or ColumnMapping(date="", description="")
+    for name, value in (
+        ("date", args.date),
+        ("description", args.description),
+        ("amount", args.amount),
+        ("debit", args.debit),
+        ("credit", args.credit),
+        ("type", args.type_column),
+        ("category", args.category),
+    ):
+        if value:
+            setattr(mapping, name, value)
+    mapping.date_format = args.date_format
+    mapping.default_category = args.default_category
+    mapping.delimiter = args.delimiter
+    return mapping
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m finfix.importer", description="Import a bank CSV statement into FinFix.")
+    parser.add_argument("statement", type=Path)
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_DATA_DIR / "transactions.csv")
+    add_mapping_arguments(parser)
+    parser.add_argument("--dry-run", action="store_true", help="report what would be imported without writing")
+    args = parser.parse_args(argv)
+
+    header = read_header(args.statement, args.delimiter)
+    mapping = mapping_from_args(args, header)
+    if not mapping.date or not mapping.description:
+        parser.error(f"could not guess the date/description columns from {header}; pass --date and --description")
+    try:
+        result = import_statement(args.statement, mapping, args.ledger, dry_run=args.dry_run)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    verb = "Would import" if args.dry_run else "Imported"
+    print(
+        f"{verb} {len(result.transactions)} of {result.rows_read} row(s) in {result.elapsed:.2f} s; "
+        f"{result.duplicates} duplicate(s), {len(result.errors)} error(s)"
+    )
+    for line, message in result.errors[:20]:
+        print(f"  line {line}: {message}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Lightweight timing spans for the app's hot paths.
+
+    with span("ledger.read"):
+        rows = list(reader)
+
+    @traced("refresh.update_summary")
+    def update_summary(self): ...
+
+While the tracer is disabled ``span`` hands back one shared no-op context
+manager and ``traced`` wrappers cost a single attribute check, so the spans can
+stay in place permanently. Once enabled, every span updates per-name counters
+and a bounded window of recent durations (for percentiles), and can be
+appended to a JSONL trace file, one object per finished span.
+
+Set ``FINFIX_TRACE=1`` to enable tracing at startup, or ``FINFIX_TRACE=<path>``
+to also write the trace file.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, TextIO, TypeVar
+
+RECENT_SPANS = 200
+WINDOW_PER_NAME = 1024
+
+F = TypeVar("F", bound=Callable)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "parent", "started", "wall")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self._tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        stack = self._tracer._stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.wall = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.started
+        stack = self._tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        self._tracer._record(self, elapsed)
+
+
+class _NameStats:
+    __slots__ = ("count", "total", "maximum", "window")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.window: deque[float] = deque(maxlen=WINDOW_PER_NAME)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    # Rounded first so float noise such as 0.7 * 10 == 7.000000000000001 does not push the rank up one.
+    index = max(0, min(len(values) - 1, math.ceil(round(fraction * len(values), 9)) - 1))
+    return values[index]
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats: dict[str, _NameStats] = {}
+        self._recent: deque[dict] = deque(maxlen=RECENT_SPANS)
+        self._trace_file: TextIO | None = None
+        self.trace_path: Path | None = None
+        self._listeners: list[Callable[[_Span, float], None]] = []
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def traced(self, name: str) -> Callable[[F], F]:
+        """Decorator form of ``span`` for whole functions."""
+
+        def decorate(fn: F) -> F:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, name):
+                    return fn(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def enable(self, trace_path: Path | None = None) -> None:
+        """Start collecting; with ``trace_path`` also append finished spans to that JSONL file."""
+        with self._lock:
+            self._close_trace_file()
+            if trace_path is not None:
+                self._trace_file = Path(trace_path).open("a", encoding="utf-8", buffering=1)
+                self.trace_path = Path(trace_path)
+            self.enabled = True
+
+    def disable(self) -> None:
+        with self._lock:
+            self.enabled = False
+            self._close_trace_file()
+
+    def add_listener(self, listener: Callable[[_Span, float], None]) -> None:
+        """Call ``listener(span, elapsed)`` for every finished span, on the thread that ran it."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[_Span, float], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+
+    def _close_trace_file(self) -> None:
+        if self._trace_file is not None:
+            self._trace_file.close()
+        self._trace_file = None
+        self.trace_path = None
+
+    def _stack(self) -> list[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: _Span, elapsed: float) -> None:
+        record = {
+            "name": span.name,
+            "ts": span.wall,
+            "ms": round(elapsed * 1000, 3),
+            "parent": span.parent,
+            "thread": threading.current_thread().name,
+        }
+        with self._lock:
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = _NameStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.maximum = max(stats.maximum, elapsed)
+            stats.window.append(elapsed)
+            self._recent.append(record)
+            if self._trace_file is not None:
+                try:
+                    self._trace_file.write(json.dumps(record) + "\n")
+                except (OSError, ValueError):
+                    self._trace_file = None
+        for listener in self._listeners:
+            listener(span, elapsed)
+
+    def summary(self) -> list[dict]:
+        """Per-name count, total and p50/p90/p99/max in milliseconds, slowest total first."""
+        with self._lock:
+            items = [(name, stats.count, stats.total, stats.maximum, sorted(stats.window)) for name, stats in self._stats.items()]
+        rows = []
+        for name, count, total, maximum, window in items:
+            rows.append(
+                {
+                    "name": name,
+                    "count": count,
+                    "total_ms": total * 1000,
+                    "mean_ms": total * 1000 / count,
+                    "p50_ms": percentile(window, 0.50) * 1000,
+                    "p90_ms": percentile(window, 0.90) * 1000,
+                    "p99_ms": percentile(window, 0.99) * 1000,
+                    "max_ms": maximum * 1000,
+                }
+            )
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def recent(self) -> list[dict]:
+        """Most recent finished spans, newest last."""
+        with self._lock:
+            return list(self._recent)
+
+
+TRACER = Tracer()
+span = TRACER.span
+traced = TRACER.traced
+
+
+def enable_from_environment(variable: str = "FINFIX_TRACE") -> bool:
+    """Enable ``TRACER`` when ``variable`` is set: ``1`` collects in memory, anything else is a trace file path."""
+    value = os.environ.get(variable, "").strip()
+    if not value or value == "0":
+        return False
+    TRACER.enable(None if value.lower() in ("1", "true", "yes") else Path(value))
+    return True
@@ -0,0 +1,233 @@
+"""A bounded, thread-safe cache of loaded ledgers keyed by data folder.
+
+Each ``CachedLedger`` holds a parsed ``Ledger``, a readers/writer lock, the
+stat stamp of the files it was read from, and a memo of derived results
+(summaries, encoded responses...). ``LedgerCache.get`` reloads an entry when
+its files changed on disk and evicts the least recently used folder once
+``capacity`` is exceeded. Readers share an entry; a writer gets it alone and
+the memo is cleared when the write finishes.
+
+    with cache.read(folder) as entry:
+        summary = entry.memo(("summary", 2025, 3), lambda: entry.ledger.summary(2025, 3))
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+from . import events
+from .core import Ledger
+
+T = TypeVar("T")
+DEFAULT_CAPACITY = 32
+
+
+class RWLock:
+    """Many readers or one writer; waiting writers block new readers so writes are not starved."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self) -> None:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def file_stamp(data_dir: Path) -> tuple:
+    """(mtime_ns, size) of the ledger and budget files; changes whenever either is rewritten or appended to."""
+    stamp = []
+    for name in ("transactions.csv", "budgets.csv"):
+        try:
+            info = (Path(data_dir) / name).stat()
+        except FileNotFoundError:
+            stamp.append(None)
+            continue
+        stamp.append((info.st_mtime_ns, info.st_size))
+    return tuple(stamp)
+
+
+class CachedLedger:
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.lock = RWLock()
+        self.ledger = Ledger()
+        self.stamp: tuple | None = None
+        self.loaded_at = 0.0
+        self.load_seconds = 0.0
+        self._memo: dict = {}
+
+    def load(self) -> None:
+        """(Re)read the files; call with the write lock held or before the entry is shared."""
+        started = time.perf_counter()
+        stamp = file_stamp(self.data_dir)
+        self.ledger = events.load(self.data_dir)  # snapshot + journal tail when the folder keeps a journal
+        self.stamp = stamp
+        self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - started
+        self._memo = {}
+
+    def memo(self, key, compute: Callable[[], T]) -> T:
+        """``compute()`` once per key until the ledger changes; safe under the shared read lock."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute()
+            return value
+
+    def changed(self, stamp: tuple | None = None) -> None:
+        """Call after modifying ``ledger`` and its files under the write lock.
+
+        ``stamp`` is the ``file_stamp`` the ledger now matches, when the files
+        may have moved on since; an older stamp only costs a reload later.
+        """
+        self.stamp = file_stamp(self.data_dir) if stamp is None else stamp
+        self._memo = {}
+
+
+class LedgerCache:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._entries: OrderedDict[Path, CachedLedger] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, data_dir) -> bool:
+        return Path(data_dir) in self._entries
+
+    def _entry(self, data_dir: Path) -> tuple[CachedLedger, bool]:
+        key = Path(data_dir)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry, False
+            entry = CachedLedger(key)
+            self._entries[key] = entry
+            self.misses += 1
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return entry, True
+
+    def get(self, data_dir: Path) -> CachedLedger:
+        """The entry for ``data_dir``, loaded and current with the files on disk."""
+        entry, created = self._entry(data_dir)
+        if created or entry.stamp != file_stamp(entry.data_dir):
+            with entry.lock.writing():
+                # Another thread may have loaded it while this one waited for the lock.
+                if entry.stamp is None or entry.stamp != file_stamp(entry.data_dir):
+                    if not created:
+                        self.reloads += 1
+                    entry.load()
+        return entry
+
+    @contextmanager
+    def read(self, data_dir: Path) -> Iterator[CachedLedger]:
+        entry = self.get(data_dir)
+        with entry.lock.reading():
+            yield entry
+
+    @contextmanager
+    def write(self, data_dir: Path) -> Iterator[CachedLedger]:
+        entry = self.get(data_dir)
+        with entry.lock.writing():
+            try:
+                yield entry
+            finally:
+                entry.changed()
+
+    @contextmanager
+    def patch(self, data_dir: Path, ledger: Ledger, stamp: tuple) -> Iterator[CachedLedger | None]:
+        """Hold the write lock while the caller brings the cached ``ledger`` up to the files at ``stamp`` in place.
+
+        Unlike ``write`` nothing is reloaded first. Yields ``None``, without
+        locking, when ``ledger`` is not the one cached for ``data_dir``.
+        """
+        entry = self.peek(data_dir)
+        if entry is None or entry.ledger is not ledger:
+            yield None
+            return
+        with entry.lock.writing():
+            try:
+                yield entry
+            finally:
+                entry.changed(stamp)
+
+    def peek(self, data_dir: Path) -> CachedLedger | None:
+        """The cached entry without loading, reloading or touching the LRU order."""
+        return self._entries.get(Path(data_dir))
+
+    def evict(self, data_dir: Path) -> None:
+        with self._lock:
+            self._entries.pop(Path(data_dir), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,305 @@
+"""Memory accounting: tracemalloc allocation sites plus per-structure size estimates.
+
+``deep_sizeof`` walks containers and plain objects and adds up
+``sys.getsizeof``; pass one ``seen`` set through several calls so structures
+that share objects (the transaction dicts referenced by the query indexes, say)
+are only counted once. Qt and matplotlib objects keep most of their memory
+outside Python, so the window estimates those from object counts and the
+``*_BYTES`` costs below.
+
+A ``MemorySnapshot`` records RSS, the subsystem estimates, a few object
+counters, the names of the window's instance attributes and, while
+``tracemalloc`` is running, the allocation sites. ``compare`` diffs two
+snapshots: the allocation sites that grew, the subsystems and counters that
+grew, and attributes that appeared in between, grouped by their prefix so
+``_list_anim_123`` style names show up as one suspect.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import BuiltinFunctionType, FrameType, FunctionType, MethodType, ModuleType
+
+TOP_ALLOCATIONS = 15
+TRACE_FRAMES = 10
+
+# Rough native costs of objects whose memory Python cannot see (Qt 5, 64-bit).
+QT_ITEM_BYTES = 200  # QListWidgetItem plus its data vector
+QSTRING_BYTES = 24  # QString header; the UTF-16 text is added per character
+QWIDGET_BYTES = 1500  # QWidget with its private data, before layouts and style sheets
+ARTIST_BYTES = 2000  # matplotlib artist with its transforms and properties
+
+_NOT_WALKED = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, FrameType)
+_TRAILING_ID = re.compile(r"[_-]?\d+$")
+
+
+def deep_sizeof(obj, seen: set[int] | None = None, skip: tuple[type, ...] = ()) -> int:
+    """Bytes held by ``obj`` and everything reachable from it through containers and instance attributes.
+
+    Types, modules, functions and instances of ``skip`` are neither counted nor
+    followed; objects whose id is already in ``seen`` are skipped.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        ident = id(item)
+        if ident in seen or isinstance(item, _NOT_WALKED) or (skip and isinstance(item, skip)):
+            continue
+        seen.add(ident)
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif not isinstance(item, (str, bytes, bytearray, int, float, complex)):
+            attributes = getattr(item, "__dict__", None)
+            if isinstance(attributes, dict):
+                stack.append(attributes)
+            for slot in getattr(type(item), "__slots__", ()):
+                value = getattr(item, slot, None)
+                if value is not None:
+                    stack.append(value)
+    return total
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size, where the platform exposes it cheaply (Linux)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def start_tracing(frames: int = TRACE_FRAMES) -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_tracing() -> None:
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _take_tracemalloc_snapshot() -> tracemalloc.Snapshot | None:
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot()
+    return snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),  # earlier snapshots held by the caller
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        )
+    )
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, limit: int = TOP_ALLOCATIONS) -> list[dict]:
+    """Largest allocation sites (file:line of the allocating frame) in ``snapshot``."""
+    return [
+        {"site": _site(stat.traceback), "bytes": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def _package_of(filename: str) -> str:
+    parts = Path(filename).parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return parts[index + 1].split(".")[0]
+    if "finfix" in parts:
+        return "finfix"
+    stdlib = Path(os.__file__).parent
+    try:
+        Path(filename).relative_to(stdlib)
+    except ValueError:
+        return Path(filename).stem
+    return "stdlib"
+
+
+def allocations_by_package(snapshot: tracemalloc.Snapshot) -> dict[str, int]:
+    """Traced bytes per allocating package (``stdlib``, ``matplotlib``, ``finfix``, ``main``...)."""
+    totals: dict[str, int] = {}
+    for stat in snapshot.statistics("filename"):
+        package = _package_of(stat.traceback[0].filename)
+        totals[package] = totals.get(package, 0) + stat.size
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+@dataclass
+class MemorySnapshot:
+    label: str
+    taken: float
+    rss: int | None
+    subsystems: dict[str, int]
+    counters: dict[str, int] = field(default_factory=dict)
+    attributes: frozenset[str] = frozenset()
+    traced: tracemalloc.Snapshot | None = None
+    traced_current: int = 0
+    traced_peak: int = 0
+
+    def to_dict(self) -> dict:
+        document = {
+            "label": self.label,
+            "ts": self.taken,
+            "rss_bytes": self.rss,
+            "subsystems": dict(self.subsystems),
+            "counters": dict(self.counters),
+            "tracing": self.traced is not None,
+        }
+        if self.traced is not None:
+            document["traced_current_bytes"] = self.traced_current
+            document["traced_peak_bytes"] = self.traced_peak
+            document["by_package"] = allocations_by_package(self.traced)
+            document["top_allocations"] = top_allocations(self.traced)
+        return document
+
+
+def take_snapshot(
+    label: str,
+    subsystems: dict[str, int],
+    counters: dict[str, int] | None = None,
+    attributes=(),
+    collect: bool = True,
+) -> MemorySnapshot:
+    """Record the current state; ``collect`` runs a full GC first so garbage does not look like growth."""
+    if collect:
+        gc.collect()
+    traced = _take_tracemalloc_snapshot()
+    current, peak = tracemalloc.get_traced_memory() if traced is not None else (0, 0)
+    return MemorySnapshot(
+        label=label,
+        taken=time.time(),
+        rss=rss_bytes(),
+        subsystems=dict(subsystems),
+        counters=dict(counters or {}),
+        attributes=frozenset(attributes),
+        traced=traced,
+        traced_current=current,
+        traced_peak=peak,
+    )
+
+
+def attribute_prefix(name: str) -> str:
+    """``_list_anim_48213`` -> ``_list_anim_*``; names without a numeric suffix are kept."""
+    stripped = _TRAILING_ID.sub("", name)
+    return f"{stripped}_*" if stripped != name else name
+
+
+def compare(before: MemorySnapshot, after: MemorySnapshot, limit: int = TOP_ALLOCATIONS) -> dict:
+    """What grew between two snapshots; positive deltas only in ``suspects``."""
+    subsystems = {
+        name: after.subsystems.get(name, 0) - before.subsystems.get(name, 0)
+        for name in sorted(set(before.subsystems) | set(after.subsystems))
+    }
+    counters = {
+        name: after.counters.get(name, 0) - before.counters.get(name, 0)
+        for name in sorted(set(before.counters) | set(after.counters))
+    }
+    new_attributes: dict[str, int] = {}
+    for name in after.attributes - before.attributes:
+        prefix = attribute_prefix(name)
+        new_attributes[prefix] = new_attributes.get(prefix, 0) + 1
+    growth = []
+    if before.traced is not None and after.traced is not None:
+        for stat in after.traced.compare_to(before.traced, "lineno")[: limit * 4]:
+            if stat.size_diff <= 0:
+                continue
+            growth.append(
+                {"site": _site(stat.traceback), "bytes": stat.size_diff, "count": stat.count_diff, "total_bytes": stat.size}
+            )
+        growth = sorted(growth, key=lambda item: item["bytes"], reverse=True)[:limit]
+    suspects = [f"{count} new attribute(s) {prefix}" for prefix, count in sorted(new_attributes.items()) if count > 1]
+    suspects.extend(f"{name} +{delta}" for name, delta in counters.items() if delta > 0)
+    suspects.extend(f"{name} +{format_bytes(delta)}" for name, delta in subsystems.items() if delta > 0)
+    rss_delta = after.rss - before.rss if before.rss is not None and after.rss is not None else None
+    return {
+        "before": before.label,
+        "after": after.label,
+        "seconds": after.taken - before.taken,
+        "rss_delta_bytes": rss_delta,
+        "traced_delta_bytes": after.traced_current - before.traced_current if before.traced is not None and after.traced is not None else None,
+        "subsystems": subsystems,
+        "counters": counters,
+        "new_attributes": dict(sorted(new_attributes.items(), key=lambda item: item[1], reverse=True)),
+        "growth": growth,
+        "suspects": suspects,
+    }
+
+
+def format_bytes(count: int | None) -> str:
+    if count is None:
+        return "n/a"
+    size = float(abs(count))
+    sign = "-" if count < 0 else ""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{sign}{size:.0f} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+
+
+def format_snapshot(snapshot: MemorySnapshot) -> str:
+    lines = [f"{snapshot.label}: RSS {format_bytes(snapshot.rss)}"]
+    total = sum(snapshot.subsystems.values())
+    for name, size in sorted(snapshot.subsystems.items(), key=lambda item: item[1], reverse=True):
+        share = size / total * 100 if total else 0.0
+        lines.append(f"  {name:<34} {format_bytes(size):>12} {share:5.1f}%")
+    for name, count in snapshot.counters.items():
+        lines.append(f"  {name:<34} {count:>12}")
+    if snapshot.traced is not None:
+        lines.append("")
+        lines.append(f"Traced: {format_bytes(snapshot.traced_current)} (peak {format_bytes(snapshot.traced_peak)})")
+        for item in top_allocations(snapshot.traced, 10):
+            lines.append(f"  {format_bytes(item['bytes']):>12} {item['count']:>8}  {item['site']}")
+    else:
+        lines.append("")
+        lines.append("Allocation tracing is off; sites are not available.")
+    return "\n".join(lines)
+
+
+def format_comparison(comparison: dict) -> str:
+    lines = [
+        f"{comparison['before']} -> {comparison['after']}: RSS {format_bytes(comparison['rss_delta_bytes'])}, "
+        f"traced {format_bytes(comparison['traced_delta_bytes'])}"
+    ]
+    if comparison["suspects"]:
+        lines.append("Grew: " + "; ".join(comparison["suspects"]))
+    for item in comparison["growth"][:10]:
+        lines.append(f"  +{format_bytes(item['bytes']):>11} {item['count']:>+8}  {item['site']}")
+    return "\n".join(lines)
+
+
+def build_report(snapshots: list[MemorySnapshot], comparisons: list[dict]) -> dict:
+    return {
+        "generated": time.time(),
+        "python": sys.version.split()[0],
+        "snapshots": [snapshot.to_dict() for snapshot in snapshots],
+        "comparisons": comparisons,
+    }
+
+
+def save_report(report: dict, path: Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2), encoding="utf-8")
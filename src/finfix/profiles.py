@@ -0,0 +1,59 @@
+"""Named profiles: separate ledger folders under one FinFix data root.
+
+The default profile is the data root itself (``~/.finfix_data``), so existing
+installs keep their files where they are. Every other profile is a folder under
+``<root>/profiles/``. The last profile used is remembered in
+``<root>/profile.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+from .core import DEFAULT_DATA_DIR
+
+DEFAULT_PROFILE = "Default"
+PROFILES_SUBDIR = "profiles"
+ACTIVE_PROFILE_FILE = "profile.json"
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9 _.-]{0,63}$")
+
+
+def is_valid_name(name: str) -> bool:
+    """Letters, digits, spaces, ``_.-``; no path separators, so a name can never leave the root."""
+    return bool(_NAME.match(name)) and not name.endswith((" ", "."))
+
+
+def profile_dir(name: str, root: Path = DEFAULT_DATA_DIR) -> Path:
+    if name == DEFAULT_PROFILE:
+        return Path(root)
+    if not is_valid_name(name):
+        raise ValueError(f"Invalid profile name {name!r}.")
+    return Path(root) / PROFILES_SUBDIR / name
+
+
+def profile_names(root: Path = DEFAULT_DATA_DIR) -> list[str]:
+    """The default profile first, then the others alphabetically."""
+    folder = Path(root) / PROFILES_SUBDIR
+    try:
+        names = sorted((child.name for child in folder.iterdir() if child.is_dir() and is_valid_name(child.name)), key=str.lower)
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_PROFILE] + [name for name in names if name != DEFAULT_PROFILE]
+
+
+def load_active(root: Path = DEFAULT_DATA_DIR) -> str:
+    try:
+        with (Path(root) / ACTIVE_PROFILE_FILE).open(encoding="utf-8") as f:
+            name = json.load(f).get("active", DEFAULT_PROFILE)
+    except (OSError, ValueError, AttributeError):
+        return DEFAULT_PROFILE
+    if name != DEFAULT_PROFILE and (not is_valid_name(name) or not profile_dir(name, root).is_dir()):
+        return DEFAULT_PROFILE
+    return name
+
+
+def save_active(name: str, root: Path = DEFAULT_DATA_DIR) -> None:
+    with (Path(root) / ACTIVE_PROFILE_FILE).open("w", encoding="utf-8") as f:
+        json.dump({"active": name}, f)
@@ -0,0 +1,177 @@
+"""Filtered views over a loaded ledger without scanning every row.
+
+``LedgerQuery`` indexes a transaction list once (sorted dates, sorted
+amounts, type and category postings). ``run`` estimates how many rows each
+active filter lets through, walks only the most selective candidate set and
+checks the remaining filters per row. Text matching comes from
+``finfix.search.TextIndex``; callers pass in its matching document keys.
+
+A ``LedgerQuery`` copies the row list it is given and builds its indexes
+from that copy the first time they are needed, normally on the worker thread
+of the next filter run, so the GUI can swap in a new one after every add,
+edit or delete for the cost of a list copy. Once built, the indexes are never
+mutated, so a query can keep running while a newer ``LedgerQuery`` replaces it.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, replace
+from datetime import date
+from decimal import Decimal
+from typing import Callable
+
+from .search import document_keys
+
+CANCEL_CHECK_ROWS = 4096
+
+
+@dataclass(frozen=True)
+class TransactionFilter:
+    text: str = ""
+    start: date | None = None
+    end: date | None = None
+    types: frozenset[str] = frozenset()
+    categories: frozenset[str] = frozenset()
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+
+    def is_empty(self) -> bool:
+        return self == TransactionFilter()
+
+
+class QueryCancelled(Exception):
+    """Raised inside ``LedgerQuery.run`` when its ``cancelled`` callback returns true."""
+
+
+class LedgerQuery:
+    """Period, amount, type and category indexes over a snapshot of one transaction list, built on first use."""
+
+    def __init__(self, transactions: list[dict]):
+        self.transactions = list(transactions)
+        self._lock = threading.Lock()
+        self._keys: list[str] | None = None
+        self._row_of_key: dict[str, int] = {}
+        self._built = False
+
+    @property
+    def keys(self) -> list[str]:
+        """``document_keys`` of the rows, in ledger order."""
+        if self._keys is None:
+            with self._lock:
+                if self._keys is None:
+                    keys = document_keys(self.transactions)
+                    self._row_of_key = {key: row for row, key in enumerate(keys)}
+                    self._keys = keys
+        return self._keys
+
+    @property
+    def row_of_key(self) -> dict[str, int]:
+        self.keys  # builds both
+        return self._row_of_key
+
+    def _build(self) -> None:
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            transactions = self.transactions
+            by_date = sorted(range(len(transactions)), key=lambda row: transactions[row]["date"])
+            self._date_rows = by_date
+            self._dates = [transactions[row]["date"] for row in by_date]
+            by_amount = sorted(range(len(transactions)), key=lambda row: abs(transactions[row]["amount"]))
+            self._amount_rows = by_amount
+            self._amounts = [abs(transactions[row]["amount"]) for row in by_amount]
+            self._type_rows: dict[str, list[int]] = {}
+            self._category_rows: dict[str, list[int]] = {}
+            for row, tx in enumerate(transactions):
+                self._type_rows.setdefault(tx["type"], []).append(row)
+                self._category_rows.setdefault(tx["category"].lower(), []).append(row)
+            self._built = True
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def _date_span(self, start: date | None, end: date | None) -> tuple[int, int]:
+        low = bisect_left(self._dates, start.isoformat()) if start else 0
+        high = bisect_right(self._dates, end.isoformat()) if end else len(self._dates)
+        return low, max(low, high)
+
+    def _amount_span(self, minimum: Decimal | None, maximum: Decimal | None) -> tuple[int, int]:
+        low = bisect_left(self._amounts, minimum) if minimum is not None else 0
+        high = bisect_right(self._amounts, maximum) if maximum is not None else len(self._amounts)
+        return low, max(low, high)
+
+    def run(
+        self,
+        query: TransactionFilter,
+        text_keys: set[str] | None = None,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> list[int]:
+        """Rows (ledger positions, ascending) matching ``query``.
+
+        ``text_keys`` is ``TextIndex.search(query.text)``: ``None`` means no
+        text filter. Amounts compare by absolute value, like the list shows them.
+        """
+        if replace(query, text="") != TransactionFilter():
+            self._build()
+        row_of_key = self.row_of_key if text_keys is not None else {}
+        candidates: list[tuple[int, str, Callable[[], list[int]]]] = []
+        if text_keys is not None:
+            candidates.append((len(text_keys), "text", lambda: [row_of_key[key] for key in text_keys if key in row_of_key]))
+        if query.start or query.end:
+            low, high = self._date_span(query.start, query.end)
+            candidates.append((high - low, "date", lambda: self._date_rows[low:high]))
+        if query.min_amount is not None or query.max_amount is not None:
+            a_low, a_high = self._amount_span(query.min_amount, query.max_amount)
+            candidates.append((a_high - a_low, "amount", lambda: self._amount_rows[a_low:a_high]))
+        if query.types:
+            type_postings = [self._type_rows.get(kind, []) for kind in query.types]
+            candidates.append((sum(map(len, type_postings)), "type", lambda: [row for rows in type_postings for row in rows]))
+        if query.categories:
+            category_postings = [self._category_rows.get(name.lower(), []) for name in query.categories]
+            candidates.append(
+                (sum(map(len, category_postings)), "category", lambda: [row for rows in category_postings for row in rows])
+            )
+        if not candidates:
+            return list(range(len(self.transactions)))
+
+        # Walk the most selective index; everything else is a cheap per-row check.
+        candidates.sort(key=lambda candidate: candidate[0])
+        size, driver, materialize = candidates[0]
+        if size == 0:
+            return []
+        rows = materialize()
+        low_date = query.start.isoformat() if query.start else None
+        high_date = query.end.isoformat() if query.end else None
+        types = query.types or None
+        categories = {name.lower() for name in query.categories} or None
+        text_rows = None
+        if text_keys is not None and driver != "text":
+            text_rows = {row_of_key[key] for key in text_keys if key in row_of_key}
+        transactions = self.transactions
+        matches = []
+        for count, row in enumerate(rows):
+            if cancelled is not None and count % CANCEL_CHECK_ROWS == 0 and cancelled():
+                raise QueryCancelled
+            tx = transactions[row]
+            if low_date is not None and tx["date"] < low_date:
+                continue
+            if high_date is not None and tx["date"] > high_date:
+                continue
+            if types is not None and tx["type"] not in types:
+                continue
+            if categories is not None and tx["category"].lower() not in categories:
+                continue
+            amount = abs(tx["amount"])
+            if query.min_amount is not None and amount < query.min_amount:
+                continue
+            if query.max_amount is not None and amount > query.max_amount:
+                continue
+            if text_rows is not None and row not in text_rows:
+                continue
+            matches.append(row)
+        matches.sort()
+        return matches
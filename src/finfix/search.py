@@ -0,0 +1,260 @@
+"""Inverted full-text index over transaction descriptions and categories.
+
+Each transaction becomes a document keyed by its ``tx_id``; every token of its
+description and category maps to a posting set of document numbers. Queries
+are AND-ed terms where each term also matches as a prefix ("gra rid" finds
+"Grab ride"), answered by intersecting posting sets smallest-first.
+
+``sync`` brings the index in line with a freshly loaded ledger by touching
+only documents whose text changed, so the index is built once and then kept
+up to date incrementally. It can be saved next to the ledger and reused on
+the next start while the ledger file is unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+INDEX_VERSION = 1
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def document_keys(transactions: Iterable[dict]) -> list[str]:
+    """Stable document keys: the ``tx_id``, suffixed when an id repeats."""
+    keys = []
+    seen: dict[str, int] = {}
+    for position, tx in enumerate(transactions):
+        base = tx["tx_id"] or f"#row{position}"
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        keys.append(base if count == 0 else f"{base}#{count}")
+    return keys
+
+
+def document_text(tx: dict) -> str:
+    return f"{tx['desc']}\n{tx['category']}"
+
+
+class TextIndex:
+    """Token -> posting set of document numbers, with prefix lookup over sorted terms."""
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = {}
+        self._doc_of_key: dict[str, int] = {}
+        self._keys: list[str | None] = []
+        self._texts: list[str | None] = []
+        self._free: list[int] = []
+        self._sorted_terms: list[str] | None = None
+        self.fingerprint: tuple | None = None
+
+    def __len__(self) -> int:
+        return len(self._doc_of_key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._doc_of_key
+
+    @property
+    def term_count(self) -> int:
+        return len(self._postings)
+
+    def add(self, key: str, text: str) -> None:
+        if key in self._doc_of_key:
+            self.update(key, text)
+            return
+        if self._free:
+            doc = self._free.pop()
+            self._keys[doc] = key
+            self._texts[doc] = text
+        else:
+            doc = len(self._keys)
+            self._keys.append(key)
+            self._texts.append(text)
+        self._doc_of_key[key] = doc
+        for token in set(tokenize(text)):
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = {doc}
+                self._sorted_terms = None
+            else:
+                posting.add(doc)
+
+    def remove(self, key: str) -> bool:
+        doc = self._doc_of_key.pop(key, None)
+        if doc is None:
+            return False
+        for token in set(tokenize(self._texts[doc] or "")):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(doc)
+            if not posting:
+                del self._postings[token]
+                self._sorted_terms = None
+        self._keys[doc] = None
+        self._texts[doc] = None
+        self._free.append(doc)
+        return True
+
+    def update(self, key: str, text: str) -> None:
+        doc = self._doc_of_key.get(key)
+        if doc is not None and self._texts[doc] == text:
+            return
+        self.remove(key)
+        self.add(key, text)
+
+    def sync(self, transactions: list[dict], keys: list[str] | None = None) -> dict[str, int]:
+        """Apply the adds/edits/deletes needed to match ``transactions``; return their counts.
+
+        ``keys`` may pass in ``document_keys(transactions)`` when the caller already has them.
+        """
+        if keys is None:
+            keys = document_keys(transactions)
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        live = set(keys)
+        for key in [key for key in self._doc_of_key if key not in live]:
+            self.remove(key)
+            changes["removed"] += 1
+        fresh: list[tuple[str, str]] = []
+        for key, tx in zip(keys, transactions):
+            text = document_text(tx)
+            doc = self._doc_of_key.get(key)
+            if doc is None:
+                fresh.append((key, text))
+            elif self._texts[doc] != text:
+                self.update(key, text)
+                changes["updated"] += 1
+        self._add_many(fresh)
+        changes["added"] = len(fresh)
+        return changes
+
+    def _add_many(self, documents: list[tuple[str, str]]) -> None:
+        # Same as add() per document, inlined because initial builds run it a million times.
+        postings = self._postings
+        findall = _TOKEN.findall
+        new_terms = False
+        for key, text in documents:
+            if self._free:
+                doc = self._free.pop()
+                self._keys[doc] = key
+                self._texts[doc] = text
+            else:
+                doc = len(self._keys)
+                self._keys.append(key)
+                self._texts.append(text)
+            self._doc_of_key[key] = doc
+            for token in set(findall(text.lower())):
+                posting = postings.get(token)
+                if posting is None:
+                    postings[token] = {doc}
+                    new_terms = True
+                else:
+                    posting.add(doc)
+        if new_terms:
+            self._sorted_terms = None
+
+    def _terms_with_prefix(self, prefix: str) -> list[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        matches = []
+        for position in range(bisect_left(terms, prefix), len(terms)):
+            term = terms[position]
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def _term_docs(self, term: str, prefix: bool) -> set[int]:
+        if not prefix:
+            return self._postings.get(term, set())
+        exact = self._postings.get(term)
+        terms = self._terms_with_prefix(term)
+        if len(terms) == 1 and exact is not None:
+            return exact
+        docs: set[int] = set()
+        for match in terms:
+            docs |= self._postings[match]
+        return docs
+
+    def search_docs(self, query: str, prefix: bool = True) -> set[int] | None:
+        """Document numbers matching every query term, or ``None`` for an empty query."""
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return None
+        postings = [self._term_docs(term, prefix) for term in terms]
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+        return result
+
+    def search(self, query: str, prefix: bool = True) -> set[str] | None:
+        """Keys of documents matching every query term, or ``None`` for an empty query."""
+        docs = self.search_docs(query, prefix)
+        if docs is None:
+            return None
+        return {self._keys[doc] for doc in docs}  # type: ignore[misc]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "fingerprint": list(self.fingerprint) if self.fingerprint else None,
+            "keys": self._keys,
+            "texts": self._texts,
+            "postings": {term: sorted(docs) for term, docs in self._postings.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TextIndex":
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError("unsupported index version")
+        index = cls()
+        index._keys = list(data["keys"])
+        index._texts = list(data["texts"])
+        if len(index._keys) != len(index._texts):
+            raise ValueError("corrupt index")
+        for doc, key in enumerate(index._keys):
+            if key is None:
+                index._free.append(doc)
+            else:
+                index._doc_of_key[key] = doc
+        index._postings = {term: set(docs) for term, docs in data["postings"].items()}
+        fingerprint = data.get("fingerprint")
+        index.fingerprint = tuple(fingerprint) if fingerprint else None
+        return index
+
+
+def ledger_fingerprint(path: Path) -> tuple | None:
+    try:
+        info = Path(path).stat()
+    except OSError:
+        return None
+    return (info.st_size, info.st_mtime_ns)
+
+
+def save_index(index: TextIndex, path: Path) -> None:
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        # dumps() takes the C encoder fast path; dump() streams through the pure-Python one.
+        f.write(json.dumps(index.to_dict(), separators=(",", ":")))
+    os.replace(tmp_path, path)
+
+
+def load_index(path: Path) -> TextIndex | None:
+    try:
+        with Path(path).open(encoding="utf-8") as f:
+            return TextIndex.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
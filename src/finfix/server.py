@@ -0,0 +1,401 @@
+"""Local HTTP/JSON API over a folder of FinFix profiles.
+
+Every sub-folder of ``--root`` that holds a ``transactions.csv`` is a profile
+(the same layout as ``~/.finfix_data``). Ledgers are loaded on first use and
+kept in a ``LedgerCache``; a changed file on disk is picked up on the next
+request. Requests for one profile share a read lock, and adding a transaction
+takes it exclusively. Computed responses are memoized per ledger until it
+changes.
+
+    GET  /profiles
+    GET  /profiles/<name>/summary?month=2025-03&compare=1
+    GET  /profiles/<name>/categories?month=2025-03
+    GET  /profiles/<name>/budgets?month=2025-03
+    GET  /profiles/<name>/balance
+    GET  /profiles/<name>/transactions?from=2025-03-01&to=2025-03-31&type=expense&category=Food&limit=100&offset=0
+    POST /profiles/<name>/transactions   {"date": "2025-03-04", "type": "expense", "category": "Food", "amount": "12.50", "desc": "Lunch"}
+    GET  /stats
+
+    python -m finfix.server serve --root /srv/finfix --port 8765
+    python -m finfix.server bench --profiles 50 --rows 5000 --clients 16 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from .cli import json_default
+from .core import TRANSACTION_TYPES, money, normalize_transaction
+from .export import filter_transactions
+from .filesync import LockTimeout, locked
+from .importer import append_transactions
+from .instrument import percentile
+from .ledger_cache import DEFAULT_CAPACITY, LedgerCache
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+MAX_PAGE = 1000
+_PROFILE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def encode(document) -> bytes:
+    return json.dumps(document, default=json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _month(query: dict) -> tuple[int, int]:
+    text = query.get("month", [""])[0]
+    if not text:
+        today = date.today()
+        return today.year, today.month
+    try:
+        year, month = (int(part) for part in text.split("-"))
+        date(year, month, 1)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"month must be YYYY-MM, got {text!r}") from None
+    return year, month
+
+
+def _date(query: dict, name: str) -> date | None:
+    text = query.get(name, [""])[0]
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be YYYY-MM-DD, got {text!r}") from None
+
+
+def _int(query: dict, name: str, default: int, maximum: int | None = None) -> int:
+    text = query.get(name, [""])[0]
+    if not text:
+        return default
+    if not text.isdigit():
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be a non-negative integer")
+    value = int(text)
+    return min(value, maximum) if maximum is not None else value
+
+
+def _amount(value) -> Decimal:
+    """``value`` as a positive amount in cents; ``normalize_transaction`` would store anything else as 0.00 or worse."""
+    try:
+        amount = Decimal(str(value).strip())
+        if amount.is_finite():
+            amount = money(amount)
+    except (InvalidOperation, ValueError):
+        amount = None
+    if amount is None or not amount.is_finite() or amount <= 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"amount must be a positive number, got {value!r}")
+    return amount
+
+
+class FinFixAPI:
+    """Routes requests to ledgers under ``root``; independent of the HTTP plumbing so it can be called directly."""
+
+    def __init__(self, root: Path, cache_size: int = DEFAULT_CAPACITY):
+        self.root = Path(root)
+        self.cache = LedgerCache(cache_size)
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    def profile_dir(self, name: str) -> Path:
+        if not _PROFILE_NAME.match(name):
+            raise ApiError(HTTPStatus.NOT_FOUND, f"unknown profile {name!r}")
+        folder = self.root / name
+        if not (folder / "transactions.csv").is_file():
+            raise ApiError(HTTPStatus.NOT_FOUND, f"unknown profile {name!r}")
+        return folder
+
+    def profiles(self) -> list[str]:
+        return sorted(
+            child.name
+            for child in self.root.iterdir()
+            if _PROFILE_NAME.match(child.name) and (child / "transactions.csv").is_file()
+        )
+
+    def get(self, path: str, query: dict) -> bytes:
+        """Encoded JSON body for a GET; raises ``ApiError`` for bad requests."""
+        with self._count_lock:
+            self.requests += 1
+        parts = [part for part in path.split("/") if part]
+        if parts == ["profiles"]:
+            return encode({"profiles": self.profiles()})
+        if parts == ["stats"]:
+            return encode({"requests": self.requests, "cache": self.cache.stats()})
+        if len(parts) != 3 or parts[0] != "profiles":
+            raise ApiError(HTTPStatus.NOT_FOUND, f"no route for {path}")
+        folder = self.profile_dir(parts[1])
+        resource = parts[2]
+        with self.cache.read(folder) as entry:
+            ledger = entry.ledger
+            if resource == "summary":
+                year, month = _month(query)
+                compare = query.get("compare", ["0"])[0] in ("1", "true", "yes")
+                return entry.memo(("summary", year, month, compare), lambda: encode(ledger.summary(year, month, compare=compare)))
+            if resource == "categories":
+                year, month = _month(query)
+
+                def categories() -> bytes:
+                    summary = ledger.summary(year, month)
+                    return encode({"year": year, "month": month, "total_expense": summary["totals"]["expense"], "categories": summary["categories"]})
+
+                return entry.memo(("categories", year, month), categories)
+            if resource == "budgets":
+                year, month = _month(query)
+                return entry.memo(("budgets", year, month), lambda: encode({"year": year, "month": month, "budgets": ledger.budget_status(year, month)}))
+            if resource == "balance":
+                return entry.memo(
+                    ("balance",),
+                    lambda: encode({"net_position": ledger.balance, "savings": ledger.savings_totals(), "transactions": len(ledger)}),
+                )
+            if resource == "transactions":
+                types = query.get("type")
+                if types and not set(types) <= set(TRANSACTION_TYPES):
+                    raise ApiError(HTTPStatus.BAD_REQUEST, f"type must be one of {', '.join(TRANSACTION_TYPES)}")
+                offset = _int(query, "offset", 0)
+                limit = _int(query, "limit", 100, MAX_PAGE)
+                matches = filter_transactions(ledger.transactions, _date(query, "from"), _date(query, "to"), types, query.get("category"))
+                page = []
+                total = 0
+                for tx in matches:
+                    if offset <= total < offset + limit:
+                        page.append(tx)
+                    total += 1
+                return encode({"total": total, "offset": offset, "limit": limit, "transactions": page})
+        raise ApiError(HTTPStatus.NOT_FOUND, f"no route for {path}")
+
+    def post(self, path: str, body: dict) -> bytes:
+        with self._count_lock:
+            self.requests += 1
+        parts = [part for part in path.split("/") if part]
+        if len(parts) != 3 or parts[0] != "profiles" or parts[2] != "transactions":
+            raise ApiError(HTTPStatus.NOT_FOUND, f"no route for POST {path}")
+        folder = self.profile_dir(parts[1])
+        if not isinstance(body, dict) or not body.get("date") or body.get("amount") in (None, ""):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "date and amount are required")
+        if str(body.get("type", "expense")).lower() not in TRANSACTION_TYPES:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"type must be one of {', '.join(TRANSACTION_TYPES)}")
+        try:
+            date.fromisoformat(str(body["date"]))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "date must be YYYY-MM-DD") from None
+        raw = {key: str(body[key]) for key in ("date", "type", "category", "desc") if body.get(key) is not None}
+        raw["amount_rm"] = str(_amount(body["amount"]))
+        # File lock first: the cache then reloads anything another process appended before the id is picked.
+        try:
+            with locked(folder / "transactions.csv"), self.cache.write(folder) as entry:
+                raw["tx_id"] = entry.ledger.next_tx_id()
+                tx = normalize_transaction(raw)
+                append_transactions(folder / "transactions.csv", [tx])
+                entry.ledger.append(tx)
+        except LockTimeout as exc:
+            raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, str(exc)) from None
+        return encode(tx)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so benchmark clients reuse connections
+    disable_nagle_algorithm = True  # headers and body go out in separate writes; avoid the delayed-ACK stall
+    server: "FinFixServer"
+
+    def _send(self, status: HTTPStatus, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, handler, status: HTTPStatus = HTTPStatus.OK) -> None:
+        try:
+            self._send(status, handler())
+        except ApiError as exc:
+            self._send(exc.status, encode({"error": str(exc)}))
+        except Exception as exc:  # keep serving other requests
+            self.log_error("%s failed: %r", self.path, exc)
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, encode({"error": "internal error"}))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        self._dispatch(lambda: self.server.api.get(url.path, parse_qs(url.query)))
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, encode({"error": "body too large"}))
+            self.close_connection = True
+            return
+        data = self.rfile.read(length)
+
+        def post() -> bytes:
+            try:
+                body = json.loads(data or b"{}")
+            except ValueError:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "body must be JSON") from None
+            return self.server.api.post(url.path, body)
+
+        self._dispatch(post, HTTPStatus.CREATED)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class FinFixServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api: FinFixAPI, quiet: bool = False):
+        super().__init__(address, _Handler)
+        self.api = api
+        self.quiet = quiet
+
+
+def serve_in_thread(root: Path, host: str = "127.0.0.1", port: int = 0, cache_size: int = DEFAULT_CAPACITY) -> FinFixServer:
+    """Start a server on a background thread (port 0 picks a free port); stop it with ``shutdown()``."""
+    server = FinFixServer((host, port), FinFixAPI(root, cache_size), quiet=True)
+    threading.Thread(target=server.serve_forever, name="finfix-api", daemon=True).start()
+    return server
+
+
+def run_load(host: str, port: int, paths: list[str], clients: int, seconds: float) -> dict:
+    """Hit ``paths`` round-robin from ``clients`` keep-alive connections for ``seconds``; latency in ms."""
+    deadline = time.perf_counter() + seconds
+    latencies: list[list[float]] = [[] for _ in range(clients)]
+    errors = [0] * clients
+
+    def client(number: int) -> None:
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        index = number
+        try:
+            while time.perf_counter() < deadline:
+                path = paths[index % len(paths)]
+                index += clients
+                started = time.perf_counter()
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                latencies[number].append((time.perf_counter() - started) * 1000)
+                if response.status != HTTPStatus.OK:
+                    errors[number] += 1
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    merged = sorted(value for values in latencies for value in values)
+    return {
+        "clients": clients,
+        "requests": len(merged),
+        "errors": sum(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(merged) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(merged, 0.50),
+        "p90_ms": percentile(merged, 0.90),
+        "p99_ms": percentile(merged, 0.99),
+    }
+
+
+def benchmark(root: Path, profiles: int, rows: int, clients: int, seconds: float, cache_size: int) -> dict:
+    from .synth import write_data_dir
+
+    names = []
+    for number in range(profiles):
+        name = f"student{number:04d}"
+        if not (root / name / "transactions.csv").exists():
+            write_data_dir(root / name, rows, seed=number, span_months=12)
+        names.append(name)
+    months = [f"2016-{month:02d}" for month in range(1, 13)]
+    paths = []
+    for number, name in enumerate(names):
+        month = months[number % len(months)]
+        paths.extend(
+            [
+                f"/profiles/{name}/summary?month={month}",
+                f"/profiles/{name}/categories?month={month}",
+                f"/profiles/{name}/budgets?month={month}",
+                f"/profiles/{name}/balance",
+                f"/profiles/{name}/transactions?from={month}-01&to={month}-07&limit=50",
+            ]
+        )
+    server = serve_in_thread(root, cache_size=cache_size)
+    host, port = server.server_address[:2]
+    try:
+        result = run_load(host, port, paths, clients, seconds)
+        result["cache"] = server.api.cache.stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+    result.update({"profiles": profiles, "rows": rows})
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m finfix.server", description="Serve FinFix profiles as JSON over HTTP.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve the profile folders under --root")
+    serve.add_argument("--root", type=Path, required=True, help="folder whose sub-folders are profiles")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--cache-size", type=int, default=DEFAULT_CAPACITY, help="ledgers kept loaded")
+    serve.add_argument("--quiet", action="store_true", help="do not log each request")
+    bench = commands.add_parser("bench", help="measure requests/sec against synthetic profiles on localhost")
+    bench.add_argument("--root", type=Path, help="profile folder to (re)use (default: a temp folder)")
+    bench.add_argument("--profiles", type=int, default=20)
+    bench.add_argument("--rows", type=int, default=5000)
+    bench.add_argument("--clients", type=int, default=8)
+    bench.add_argument("--seconds", type=float, default=5.0)
+    bench.add_argument("--cache-size", type=int, default=DEFAULT_CAPACITY)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        if args.root is not None:
+            args.root.mkdir(parents=True, exist_ok=True)
+            result = benchmark(args.root, args.profiles, args.rows, args.clients, args.seconds, args.cache_size)
+        else:
+            with tempfile.TemporaryDirectory(prefix="finfix_api_") as tmp:
+                result = benchmark(Path(tmp), args.profiles, args.rows, args.clients, args.seconds, args.cache_size)
+        print(
+            f"{result['requests_per_second']:.0f} req/s over {result['requests']} request(s) from {result['clients']} client(s); "
+            f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, {result['errors']} error(s); "
+            f"cache hit rate {result['cache']['hit_rate']:.1%}",
+            file=sys.stderr,
+        )
+        print(json.dumps(result, indent=2))
+        return 1 if result["errors"] else 0
+
+    server = FinFixServer((args.host, args.port), FinFixAPI(args.root, args.cache_size), quiet=args.quiet)
+    print(f"Serving {args.root} on http://{args.host}:{server.server_address[1]}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
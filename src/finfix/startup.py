@@ -0,0 +1,232 @@
+"""Cold-start profiling: per-module import times, construction phases, data loads.
+
+``PROFILE.start()`` must run before the heavy imports. From then on it times
+every module import on the main thread, ``section`` blocks and the ``phase``
+marks inside them, plus any ``finfix.instrument`` span that finishes on the
+main thread. ``finish`` turns the recorded intervals into a tree (by
+containment) and a report that follows the critical path: at every level the
+child that took longest. Startup is single-threaded, so that chain is what a
+faster cold start has to shorten.
+
+Everything is a no-op until ``start`` is called.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .instrument import TRACER
+
+REPORT_MIN_FRACTION = 0.01  # hide tree rows under 1% of the total
+TOP_IMPORTS = 12
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader to time ``exec_module``; everything else is delegated."""
+
+    def __init__(self, loader, profile: "StartupProfile", name: str):
+        self._loader = loader
+        self._profile = profile
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile.record(f"import {self._name}", started, time.perf_counter(), kind="import")
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profile: "StartupProfile"):
+        self._profile = profile
+
+    def find_spec(self, fullname, path, target=None):
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profile, fullname)
+            return spec
+        return None
+
+
+class StartupProfile:
+    def __init__(self):
+        self.active = False
+        self.origin = 0.0
+        self.intervals: list[dict] = []
+        self._sections: list[list] = []  # [name, started, open phase name, phase started]
+        self._finder: _ImportTimer | None = None
+        self._enabled_tracer = False
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self.active = True
+        self.origin = time.perf_counter()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+        if not TRACER.enabled:
+            TRACER.enable()
+            self._enabled_tracer = True
+        TRACER.add_listener(self._on_span)
+
+    def record(self, name: str, started: float, ended: float, kind: str = "phase") -> None:
+        if self.active:
+            self.intervals.append({"name": name, "start": started, "end": ended, "kind": kind})
+
+    def _on_span(self, span, elapsed: float) -> None:
+        if threading.current_thread() is threading.main_thread():
+            self.record(span.name, span.started, span.started + elapsed, kind="span")
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time a block; ``phase`` marks made inside it split it into consecutive phases."""
+        if not self.active:
+            yield
+            return
+        entry = [name, time.perf_counter(), None, 0.0]
+        self._sections.append(entry)
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            self._sections.remove(entry)
+            if entry[2] is not None:
+                self.record(entry[2], entry[3], ended)
+            self.record(name, entry[1], ended, kind="section")
+
+    def phase(self, name: str) -> None:
+        """End the current phase of the innermost section and start ``name``."""
+        if not self.active or not self._sections:
+            return
+        now = time.perf_counter()
+        entry = self._sections[-1]
+        if entry[2] is not None:
+            self.record(entry[2], entry[3], now)
+        entry[2], entry[3] = name, now
+
+    def finish(self) -> dict:
+        """Stop recording and return the report document (times in milliseconds from ``start``)."""
+        if not self.active:
+            return {}
+        ended = time.perf_counter()
+        TRACER.remove_listener(self._on_span)
+        if self._enabled_tracer:
+            TRACER.disable()
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self.record("startup", self.origin, ended, kind="section")
+        self.active = False
+        return build_report(self.intervals, self.origin)
+
+
+def _tree(intervals: list[dict], origin: float) -> dict:
+    nodes = [
+        {
+            "name": item["name"],
+            "kind": item["kind"],
+            "start_ms": (item["start"] - origin) * 1000,
+            "ms": (item["end"] - item["start"]) * 1000,
+            "end": item["end"],
+            "children": [],
+        }
+        for item in intervals
+    ]
+    nodes.sort(key=lambda node: (node["start_ms"], -node["ms"]))
+    root = nodes[0] if nodes and nodes[0]["name"] == "startup" else None
+    stack: list[dict] = []
+    for node in nodes:
+        while stack and node["end"] > stack[-1]["end"] + 1e-9:
+            stack.pop()
+        if stack:
+            stack[-1]["children"].append(node)
+        stack.append(node)
+    for node in nodes:
+        node.pop("end")
+        node["self_ms"] = node["ms"] - sum(child["ms"] for child in node["children"])
+    return root or {"name": "startup", "kind": "section", "start_ms": 0.0, "ms": 0.0, "self_ms": 0.0, "children": nodes}
+
+
+def build_report(intervals: list[dict], origin: float) -> dict:
+    root = _tree(intervals, origin)
+    path = []
+    node = root
+    while node["children"]:
+        node = max(node["children"], key=lambda child: child["ms"])
+        if node["ms"] < root["ms"] * REPORT_MIN_FRACTION:
+            break
+        path.append({"name": node["name"], "ms": node["ms"], "start_ms": node["start_ms"]})
+    imports = sorted(
+        (item for item in _walk(root) if item["kind"] == "import"),
+        key=lambda item: item["self_ms"],
+        reverse=True,
+    )
+    return {
+        "total_ms": root["ms"],
+        "critical_path": path,
+        "slowest_imports": [{"name": item["name"], "self_ms": item["self_ms"], "ms": item["ms"]} for item in imports[:TOP_IMPORTS]],
+        "tree": root,
+    }
+
+
+def _walk(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node["children"]:
+        yield from _walk(child)
+
+
+def format_report(report: dict) -> str:
+    total = report.get("total_ms") or 0.0
+    lines = [f"Startup to first paint: {total:.1f} ms", ""]
+    critical = {item["name"] for item in report["critical_path"]}
+
+    def emit(node: dict, depth: int) -> None:
+        if depth and total and node["ms"] < total * REPORT_MIN_FRACTION:
+            return
+        marker = "*" if node["name"] in critical else " "
+        share = node["ms"] / total * 100 if total else 0.0
+        label = f"{'  ' * depth}{node['name']}"
+        lines.append(f"{marker} {label:<52} {node['start_ms']:9.1f} {node['ms']:9.1f} ms {share:5.1f}%")
+        for child in node["children"]:
+            if not (child["kind"] == "import" and node["kind"] == "import"):  # nested imports go in the top list
+                emit(child, depth + 1)
+
+    lines.append(f"  {'step':<52} {'at ms':>9} {'took':>9}")
+    emit(report["tree"], 0)
+    lines.append("")
+    lines.append("Critical path: " + " > ".join(f"{item['name']} ({item['ms']:.0f} ms)" for item in report["critical_path"]))
+    if report["slowest_imports"]:
+        lines.append("")
+        lines.append("Slowest imports (self time):")
+        for item in report["slowest_imports"]:
+            lines.append(f"  {item['name']:<50} {item['self_ms']:8.1f} ms  (incl. {item['ms']:.1f} ms)")
+    return "\n".join(lines)
+
+
+def save_report(report: dict, path: Path) -> None:
+    Path(path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+PROFILE = StartupProfile()
+section = PROFILE.section
+phase = PROFILE.phase
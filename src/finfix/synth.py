@@ -0,0 +1,160 @@
+"""Seeded synthetic ledgers for benchmarks and load tests.
+
+The generator writes ``transactions.csv`` / ``budgets.csv`` files in the app's
+own format with a student-like mix: mostly small expenses, a monthly
+allowance plus occasional side income, savings deposits, and savings
+withdrawals recorded as the savings/expense pair ``use_savings_funds``
+writes. The same seed always produces the same files.
+
+    python -m finfix.synth --rows 1000000 --seed 42 --output-dir /tmp/finfix_1m
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import math
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+LEDGER_HEADER = ["tx_id", "date", "type", "category", "amount_rm", "desc"]
+BUDGET_HEADER = ["category", "monthly_budget_rm"]
+
+# category: (weight, median RM, spread, descriptions)
+EXPENSE_CATEGORIES = {
+    "Food": (32, 12.0, 0.5, ["Lunch", "Dinner", "Breakfast", "Mamak", "Coffee", "Bubble tea"]),
+    "Transport": (16, 8.0, 0.6, ["Grab ride", "LRT reload", "Bus fare", "Petrol", "Parking"]),
+    "Groceries": (12, 35.0, 0.5, ["Groceries", "Market run", "Snacks", "Toiletries"]),
+    "Entertainment": (8, 25.0, 0.7, ["Movie", "Streaming", "Games", "Karaoke"]),
+    "Shopping": (8, 60.0, 0.8, ["Clothes", "Shoes", "Online order", "Gadget accessory"]),
+    "Education": (6, 45.0, 0.7, ["Textbook", "Printing", "Stationery", "Course fee"]),
+    "Utilities": (6, 50.0, 0.4, ["Phone bill", "Internet", "Electricity"]),
+    "Health": (4, 30.0, 0.6, ["Clinic", "Pharmacy", "Gym"]),
+    "Rent": (3, 450.0, 0.2, ["Room rent"]),
+    "Gifts": (3, 40.0, 0.6, ["Birthday gift", "Donation"]),
+}
+INCOME_CATEGORIES = {
+    "Allowance": (6, 600.0, 0.2, ["Monthly allowance"]),
+    "Part-time": (3, 250.0, 0.4, ["Part-time shift", "Tutoring", "Freelance job"]),
+    "Scholarship": (1, 1200.0, 0.1, ["Scholarship payout"]),
+}
+SAVINGS_CATEGORIES = {
+    "Emergency": (5, 80.0, 0.5, ["Save"]),
+    "Trip": (3, 60.0, 0.5, ["Save for trip"]),
+    "Laptop": (2, 100.0, 0.4, ["Save for laptop"]),
+}
+# Share of generated rows per kind; a withdrawal produces two rows.
+TYPE_MIX = {"expense": 0.80, "income": 0.08, "savings": 0.08, "withdrawal": 0.04}
+
+
+def default_span_months(rows: int) -> int:
+    """Months of history for ``rows`` transactions: a year for small ledgers, ten years at most."""
+    return max(12, min(120, rows // 1000))
+
+
+def _sampler(categories: dict, rng: random.Random):
+    names = list(categories)
+    weights = [categories[name][0] for name in names]
+
+    def sample() -> tuple[str, float, str]:
+        name = rng.choices(names, weights)[0]
+        _, median, spread, descriptions = categories[name]
+        amount = median * math.exp(rng.gauss(0.0, spread))
+        return name, max(0.5, round(amount, 2)), rng.choice(descriptions)
+
+    return sample
+
+
+def generate_ledger(rows: int, seed: int = 0, start: date = date(2016, 1, 1), span_months: int | None = None) -> Iterator[list[str]]:
+    """Yield ``rows`` ledger rows (``LEDGER_HEADER`` order) in date order."""
+    rng = random.Random(seed)
+    span_days = round((span_months or default_span_months(rows)) * 30.44)
+    samplers = {
+        "expense": _sampler(EXPENSE_CATEGORIES, rng),
+        "income": _sampler(INCOME_CATEGORIES, rng),
+        "savings": _sampler(SAVINGS_CATEGORIES, rng),
+    }
+    kinds = list(TYPE_MIX)
+    kind_weights = [TYPE_MIX[kind] for kind in kinds]
+    savings_balance = {name: 0.0 for name in SAVINGS_CATEGORIES}
+    expense_names = list(EXPENSE_CATEGORIES)
+    number = 0
+    while number < rows:
+        day = (start + timedelta(days=number * span_days // rows)).isoformat()
+        kind = rng.choices(kinds, kind_weights)[0]
+        if kind == "withdrawal" and number + 2 <= rows:
+            funded = [name for name, balance in savings_balance.items() if balance >= 20.0]
+            if funded:
+                source = rng.choice(funded)
+                amount = round(min(savings_balance[source], rng.uniform(20.0, 150.0)), 2)
+                savings_balance[source] -= amount
+                target = rng.choice(expense_names)
+                description = f"Used savings for {target}"
+                yield [f"TX{number + 1:03d}", day, "savings", source, f"{-amount:.2f}", f"Withdrawal: {description}"]
+                yield [f"TX{number + 2:03d}", day, "expense", target, f"{amount:.2f}", description]
+                number += 2
+                continue
+            kind = "savings"
+        elif kind == "withdrawal":
+            kind = "expense"
+        category, amount, description = samplers[kind]()
+        if kind == "savings":
+            savings_balance[category] += amount
+        number += 1
+        yield [f"TX{number:03d}", day, kind, category, f"{amount:.2f}", description]
+
+
+def budget_rows() -> list[list[str]]:
+    """A monthly budget for most expense categories, sized around typical spending."""
+    rows = []
+    for name, (weight, median, _, _) in EXPENSE_CATEGORIES.items():
+        if name == "Gifts":
+            continue  # leave one category unbudgeted, as real users do
+        rows.append([name, f"{round(median * max(1, weight) * 1.2, -1):.2f}"])
+    return rows
+
+
+def write_ledger(path: Path, rows: int, seed: int = 0, span_months: int | None = None) -> Path:
+    path = Path(path)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(LEDGER_HEADER)
+        writer.writerows(generate_ledger(rows, seed, span_months=span_months))
+    return path
+
+
+def write_budgets(path: Path) -> Path:
+    path = Path(path)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(BUDGET_HEADER)
+        writer.writerows(budget_rows())
+    return path
+
+
+def write_data_dir(data_dir: Path, rows: int, seed: int = 0, span_months: int | None = None) -> Path:
+    """Create ``transactions.csv`` and ``budgets.csv`` under ``data_dir``."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    write_ledger(data_dir / "transactions.csv", rows, seed, span_months)
+    write_budgets(data_dir / "budgets.csv")
+    return data_dir
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m finfix.synth", description="Write a synthetic FinFix data folder.")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--months", type=int, default=None, help="months of history (default scales with --rows)")
+    parser.add_argument("--output-dir", type=Path, required=True)
+    args = parser.parse_args(argv)
+    write_data_dir(args.output_dir, args.rows, args.seed, args.months)
+    print(f"Wrote {args.rows} transaction(s) to {args.output_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Detect stalls of the GUI thread and capture what it was doing.
+
+The GUI thread calls ``beat()`` from a repeating timer. A daemon thread polls
+the time since the last beat; once it exceeds the heartbeat interval plus the
+threshold, the GUI thread's Python stack is captured with
+``sys._current_frames()`` (and sampled again while the stall lasts). When the
+beats resume the stall is reported with its duration and stacks, to
+``on_stall`` and, optionally, as one JSON line in a log file.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+MAX_STACK_FRAMES = 30
+MAX_SAMPLES = 8
+SAMPLE_INTERVAL = 0.25
+RECENT_STALLS = 50
+
+
+class StallWatchdog:
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        heartbeat_interval: float = 0.05,
+        on_stall: Callable[[dict], None] | None = None,
+        log_path: Path | None = None,
+        thread: threading.Thread | None = None,
+    ):
+        self.threshold = threshold
+        self.heartbeat_interval = heartbeat_interval
+        self.on_stall = on_stall
+        self.log_path = Path(log_path) if log_path else None
+        self.recent: deque[dict] = deque(maxlen=RECENT_STALLS)
+        self.stall_count = 0
+        self._target = thread or threading.main_thread()
+        self._last_beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def beat(self) -> None:
+        """Called on the watched thread by its event loop timer."""
+        self._last_beat = time.monotonic()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="finfix-stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _capture(self) -> list[str] | None:
+        frame = sys._current_frames().get(self._target.ident)
+        if frame is None:
+            return None
+        lines = traceback.format_stack(frame)[-MAX_STACK_FRAMES:]
+        return [line.rstrip() for line in lines]
+
+    def _run(self) -> None:
+        limit = self.heartbeat_interval + self.threshold
+        poll = max(0.01, min(self.threshold / 4, 0.05))
+        stalled_beat: float | None = None
+        samples: list[list[str]] = []
+        next_sample = 0.0
+        while not self._stop.wait(poll):
+            beat = self._last_beat
+            now = time.monotonic()
+            if stalled_beat is not None and beat != stalled_beat:
+                self._report(stalled_beat, beat, samples)
+                stalled_beat, samples = None, []
+                continue
+            if now - beat <= limit:
+                continue
+            if stalled_beat is None:
+                stalled_beat = beat
+                next_sample = now
+            if now >= next_sample and len(samples) < MAX_SAMPLES:
+                stack = self._capture()
+                if stack and (not samples or samples[-1] != stack):
+                    samples.append(stack)
+                next_sample = now + SAMPLE_INTERVAL
+
+    def _report(self, stalled_beat: float, resumed_beat: float, samples: list[list[str]]) -> None:
+        duration = resumed_beat - stalled_beat - self.heartbeat_interval
+        record = {
+            "ts": time.time() - (time.monotonic() - stalled_beat),
+            "duration_ms": round(max(duration, 0.0) * 1000, 1),
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "stack": samples[0] if samples else [],
+            "samples": samples[1:],
+        }
+        self.stall_count += 1
+        self.recent.append(record)
+        if self.log_path is not None:
+            try:
+                with self.log_path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+        if self.on_stall is not None:
+            self.on_stall(record)
+
+
+def format_stall(record: dict) -> str:
+    """Human-readable summary: duration plus the innermost frames of the first stack."""
+    lines = [f"UI stall: {record['duration_ms']:.0f} ms (threshold {record['threshold_ms']:.0f} ms)"]
+    for frame in record["stack"][-6:]:
+        lines.append(frame)
+    return "\n".join(lines)
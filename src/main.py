@@ -1,10 +1,24 @@
+import multiprocessing
+import sys
+
+if __name__ == "__main__":
+    # In the frozen build a batch-export worker starts this executable again; it must run the task, not the app.
+    multiprocessing.freeze_support()
+
+from finfix.startup import PROFILE as STARTUP_PROFILE, format_report as format_startup_report, phase as startup_phase, save_report as save_startup_report
+
+STARTUP_PROFILE_FLAG = "--startup-profile"  # --startup-profile[=report.json]; add --quit-after-startup to exit after the report
+if __name__ == "__main__" and any(arg == STARTUP_PROFILE_FLAG or arg.startswith(STARTUP_PROFILE_FLAG + "=") for arg in sys.argv[1:]):
+    STARTUP_PROFILE.start()  # before the imports below, so they are timed too
+
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton,
     QListWidget, QListWidgetItem, QHBoxLayout, QGraphicsDropShadowEffect, QMessageBox,
     QComboBox, QPlainTextEdit, QFileDialog, QDialog, QFrame, QDialogButtonBox,
     QWhatsThis, QSizePolicy, QScrollArea, QMainWindow, QMenuBar, QMenu, QAction, QStatusBar,
     QTableWidget, QTableWidgetItem, QAbstractItemView, QProgressBar, QHeaderView, QShortcut,
-    QGridLayout, QCheckBox, QFormLayout, QInputDialog, QGraphicsOpacityEffect
+    QGridLayout, QCheckBox, QFormLayout, QInputDialog, QGraphicsOpacityEffect, QStackedWidget,
+    QDateEdit, QActionGroup,
 )
 from PyQt5.QtGui import (
     QColor,
@@ -41,13 +55,18 @@ from PyQt5.QtCore import (
     QObject,
     QRect,
     QVariantAnimation,
+    QBuffer,
+    QIODevice,
+    QDate,
+    QRunnable,
+    QThreadPool,
+    QFileSystemWatcher,
 )
-from PyQt5.QtPrintSupport import QPrinter
-from typing import Dict, Optional, cast
-from decimal import Decimal, ROUND_HALF_UP
-from collections import defaultdict
-from datetime import date, timedelta
-import csv, os, shutil, sys, stat, importlib, json, time, ctypes, calendar, weakref
+from typing import Callable, Dict, Optional, cast
+from decimal import Decimal
+from collections import OrderedDict, defaultdict, deque
+from datetime import date
+import csv, os, shutil, sys, stat, importlib, json, time, ctypes, calendar, weakref, threading, gc, tracemalloc
 from pathlib import Path
 import signal
 
@@ -71,16 +90,34 @@ def _is_deleted(obj) -> bool:
 
 Figure = None
 FigureCanvasQTAgg = None
+charts = None
+chart_render = None
 MATPLOTLIB_AVAILABLE = False
 ENABLE_FOCUS_GLOW = False  # disable if causing painter warnings
 ENABLE_ENTRANCE_ANIMATION = False
 ENABLE_CARD_DRAG = False
+ENABLE_RENDER_DISK_CACHE = True  # keep rendered charts/exports under DATA_DIR between sessions
+ENABLE_SEARCH_INDEX_CACHE = True  # save the text search index next to the ledger for faster startup
+TRANSACTION_FILTER_DEBOUNCE_MS = 200
+ENABLE_INSTRUMENTATION = False  # collect hot-path spans from startup (FINFIX_TRACE=1 or =<file.jsonl> does the same)
+ENABLE_STALL_WATCHDOG = False  # log GUI-thread stalls with stacks (FINFIX_WATCHDOG=1 or =<threshold ms> does the same)
+STALL_THRESHOLD_MS = 100
+STALL_HEARTBEAT_MS = 50
+ENABLE_MEMORY_TRACING = False  # trace allocations from startup for the memory panel (FINFIX_MEMPROFILE=1 or =<frames> does the same)
+MEMORY_SNAPSHOTS_KEPT = 8
+PROFILE_CACHE_SIZE = 4  # recently used profiles kept parsed in memory for instant switching back
+EXTERNAL_RELOAD_DEBOUNCE_MS = 300  # coalesce the burst of change signals one save from another process produces
+LIST_ANIMATED_ROWS = 20  # only the newest rows get the highlight; each one queues four timers
+UNDO_DEPTH = 100  # undoable changes kept per profile; each holds just the rows it touched
+ENABLE_EVENT_LOG = False  # journal every change to events.jsonl with snapshots (audit trail, `finfix --as-of`)
 
 try:
     matplotlib_figure = importlib.import_module("matplotlib.figure")
     matplotlib_backend = importlib.import_module("matplotlib.backends.backend_qt5agg")
     Figure = getattr(matplotlib_figure, "Figure", None)
     FigureCanvasQTAgg = getattr(matplotlib_backend, "FigureCanvasQTAgg", None)
+    charts = importlib.import_module("charts")
+    chart_render = importlib.import_module("chart_render")
     MATPLOTLIB_AVAILABLE = Figure is not None and FigureCanvasQTAgg is not None
 except KeyboardInterrupt:
     MATPLOTLIB_AVAILABLE = False
@@ -89,8 +126,71 @@ except Exception:
 
 # App logo helpers (generated or assets/logo.png if available)
 from app_logo import get_app_icon, get_logo_pixmap
+from render_cache import RenderCache, cache_key
+from report_pdf import render_report_pdf
+from finfix import columnar
+from finfix.importer import (
+    DATE_FORMATS as STATEMENT_DATE_FORMATS,
+    ColumnMapping as StatementMapping,
+    guess_mapping as guess_statement_mapping,
+    import_statement,
+    load_mapping as load_import_mapping,
+    read_header as read_statement_header,
+    save_mapping as save_import_mapping,
+)
+from finfix.instrument import TRACER, enable_from_environment as enable_tracing_from_environment, span, traced
+from finfix.watchdog import StallWatchdog, format_stall
+from finfix.memprofile import (
+    ARTIST_BYTES,
+    QSTRING_BYTES,
+    QT_ITEM_BYTES,
+    QWIDGET_BYTES,
+    build_report as build_memory_report,
+    compare as compare_memory,
+    deep_sizeof,
+    format_comparison as format_memory_comparison,
+    format_snapshot as format_memory_snapshot,
+    save_report as save_memory_report,
+    start_tracing as start_memory_tracing,
+    stop_tracing as stop_memory_tracing,
+    take_snapshot as take_memory_snapshot,
+)
+from finfix.query import LedgerQuery, QueryCancelled, TransactionFilter
+from finfix.ledger_cache import CachedLedger, LedgerCache, file_stamp
+from finfix.profiles import (
+    DEFAULT_PROFILE,
+    is_valid_name as is_valid_profile_name,
+    load_active as load_active_profile,
+    profile_dir,
+    profile_names,
+    save_active as save_active_profile,
+)
+from finfix.search import (
+    TextIndex,
+    document_text,
+    ledger_fingerprint,
+    load_index as load_search_index,
+    save_index as save_search_index,
+)
+from finfix.export import export_csv, export_ledger_csv, filter_transactions
+from batch_export import FORMATS as BATCH_FORMATS, describe_result as describe_batch_result, plan_jobs as plan_batch_jobs, run_batch
+from finfix.core import (
+    DEFAULT_DATA_DIR,
+    TRANSACTION_TYPES,
+    Ledger,
+    month_alerts,
+    month_forecast,
+    month_range,
+    money,
+    normalize_transaction,
+    previous_period,
+    read_budgets,
+)
+from finfix.filesync import FileState, LockTimeout, atomic_write, file_state, locked as ledger_lock, read_changes
+from finfix.history import Command, CommandConflict, CommandLog, apply_to_file, apply_to_ledger
+from finfix.events import EventLog
 
-DATA_DIR = Path.home() / ".finfix_data"
+DATA_DIR = DEFAULT_DATA_DIR
 LEGACY_DATA_DIR = Path("data")
 LEDGER_CSV = DATA_DIR / "transactions.csv"
 BUDGET_CSV = DATA_DIR / "budgets.csv"
@@ -100,6 +200,11 @@ LEDGER_HEADER = ["tx_id", "date", "type", "category", "amount_rm", "desc"]
 OLD_LEDGER_HEADER = ["tx_id", "type", "amount_rm", "desc"]
 BUDGET_HEADER = ["category", "monthly_budget_rm"]
 CURRENCY_JSON = DATA_DIR / "rates.json"
+RENDER_CACHE_DIR = DATA_DIR / "render_cache"
+IMPORT_MAPPING_JSON = DATA_DIR / "import_mapping.json"
+SEARCH_INDEX_JSON = DATA_DIR / "search_index.json"
+STALL_LOG = DATA_DIR / "stalls.jsonl"
+ACTIVE_PROFILE = DEFAULT_PROFILE
 RATES_TTL_SECONDS = 12 * 60 * 60             # reuse rates for half a day to limit network calls
 RATES_API_URL = "https://open.er-api.com/v6/latest"
 DEFAULT_TARGET_CURRENCIES = ["USD", "EUR", "GBP", "SGD", "AUD", "JPY", "CNY", "THB", "IDR", "TWD", "HKD", "VND"]
@@ -702,9 +807,6 @@ class CardWorkspace(QWidget):
         self._layout.invalidate()
         self.updateGeometry()
 
-def money(x) -> Decimal:
-    return Decimal(str(x)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
 def ensure_private_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
     if os.name != "nt":
@@ -763,6 +865,11 @@ def ensure_writable(path: Path) -> None:
             pass
 
 def migrate_ledger_schema() -> None:
+    with ledger_lock(LEDGER_CSV):
+        _migrate_ledger_schema()
+
+
+def _migrate_ledger_schema() -> None:
     try:
         with LEDGER_CSV.open("r", newline="", encoding="utf-8") as f:
             reader = csv.reader(f)
@@ -772,7 +879,7 @@ def migrate_ledger_schema() -> None:
 
     if not rows:
         ensure_writable(LEDGER_CSV)
-        with LEDGER_CSV.open("w", newline="", encoding="utf-8") as f:
+        with atomic_write(LEDGER_CSV) as f:
             csv.writer(f).writerow(LEDGER_HEADER)
         ensure_private_file(LEDGER_CSV)
         return
@@ -785,7 +892,7 @@ def migrate_ledger_schema() -> None:
     if header == OLD_LEDGER_HEADER:
         today_str = date.today().isoformat()
         ensure_writable(LEDGER_CSV)
-        with LEDGER_CSV.open("w", newline="", encoding="utf-8") as f:
+        with atomic_write(LEDGER_CSV) as f:
             writer = csv.writer(f)
             writer.writerow(LEDGER_HEADER)
             for row in rows[1:]:
@@ -803,7 +910,7 @@ def migrate_ledger_schema() -> None:
 
     today_str = date.today().isoformat()
     ensure_writable(LEDGER_CSV)
-    with LEDGER_CSV.open("w", newline="", encoding="utf-8") as f:
+    with atomic_write(LEDGER_CSV) as f:
         writer = csv.writer(f)
         writer.writerow(LEDGER_HEADER)
         for idx, row in enumerate(rows[1:], start=1):
@@ -816,10 +923,29 @@ def migrate_ledger_schema() -> None:
             writer.writerow([tx_id, tx_date, ttype, category or "General", amount, desc])
     ensure_private_file(LEDGER_CSV)
 
+def use_profile(name: str) -> Path:
+    """Point the per-profile paths (ledger, budgets, search index) at profile ``name``.
+
+    Rates, the render cache, import mappings and the stall log stay shared in
+    the data root.
+    """
+    global ACTIVE_PROFILE, DATA_DIR, LEDGER_CSV, BUDGET_CSV, SEARCH_INDEX_JSON
+    folder = profile_dir(name)
+    ACTIVE_PROFILE = name
+    DATA_DIR = folder
+    LEDGER_CSV = folder / "transactions.csv"
+    BUDGET_CSV = folder / "budgets.csv"
+    SEARCH_INDEX_JSON = folder / "search_index.json"
+    return folder
+
+
 def ensure_storage() -> None:
+    if ACTIVE_PROFILE != DEFAULT_PROFILE:
+        ensure_private_dir(DEFAULT_DATA_DIR)
     ensure_private_dir(DATA_DIR)
+    legacy = ACTIVE_PROFILE == DEFAULT_PROFILE  # only the default profile adopts an old ./data ledger
     if not LEDGER_CSV.exists():
-        if LEGACY_LEDGER_CSV.exists():
+        if legacy and LEGACY_LEDGER_CSV.exists():
             shutil.copyfile(LEGACY_LEDGER_CSV, LEDGER_CSV)
             ensure_private_file(LEDGER_CSV)
             migrate_ledger_schema()
@@ -831,7 +957,7 @@ def ensure_storage() -> None:
         ensure_writable(LEDGER_CSV)
         migrate_ledger_schema()
     if not BUDGET_CSV.exists():
-        if LEGACY_BUDGET_CSV.exists():
+        if legacy and LEGACY_BUDGET_CSV.exists():
             shutil.copyfile(LEGACY_BUDGET_CSV, BUDGET_CSV)
             ensure_private_file(BUDGET_CSV)
         else:
@@ -848,6 +974,13 @@ def ensure_storage() -> None:
         ensure_private_file(CURRENCY_JSON)
     else:
         ensure_private_file(CURRENCY_JSON)
+    if ENABLE_EVENT_LOG:
+        try:
+            journal = EventLog.start(LEDGER_CSV)
+        except (OSError, LockTimeout) as exc:
+            print(f"Event journal not started: {exc}", file=sys.stderr)
+        else:
+            ensure_private_file(journal.path)
 
 
 def load_cached_rates() -> dict:
@@ -934,8 +1067,65 @@ class HelpAwareDialog(QDialog):
         return super().event(event)
 
 
+class ChartImageView(QWidget):
+    """Paints a pre-rendered chart image, scaled to fit and kept at its aspect ratio."""
+
+    activated = pyqtSignal()
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._rendered = None
+        self._message = "Rendering chart..."
+        self.setMinimumSize(200, 160)
+        self.setToolTip("Double-click for the interactive chart.")
+
+    @property
+    def rendered(self):
+        return self._rendered
+
+    def set_rendered(self, rendered) -> None:
+        # Keep the RenderedChart alive: its QImage points into the Agg buffer it holds.
+        self._rendered = rendered
+        self.update()
+
+    def set_message(self, message: str) -> None:
+        self._message = message
+        if self._rendered is None:
+            self.update()
+
+    def paintEvent(self, a0) -> None:
+        painter = QPainter(self)
+        try:
+            rendered = self._rendered
+            if rendered is None or rendered.image.isNull():
+                painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self._message)
+                return
+            image = rendered.image
+            target = QSize(image.width(), image.height())
+            target.scale(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            x = (self.width() - target.width()) // 2
+            y = (self.height() - target.height()) // 2
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+            painter.drawImage(QRect(x, y, target.width(), target.height()), image)
+        finally:
+            painter.end()
+
+    def mouseDoubleClickEvent(self, a0: QMouseEvent) -> None:
+        super().mouseDoubleClickEvent(a0)
+        self.activated.emit()
+
+
 class ChartWindow(QMainWindow):
-    """Standalone window that hosts a chart canvas with optional helper text."""
+    """Standalone window that hosts a chart with optional helper text.
+
+    Charts first arrive as images rendered off the GUI thread; the window only
+    builds a live matplotlib canvas when the user asks for the interactive view.
+    Closing only hides the window so its figure and artists survive; reopening
+    or refreshing the chart updates the existing painter in place.
+    """
+
+    promote_requested = pyqtSignal()
+    rerender_requested = pyqtSignal()
 
     def __init__(self, title: str, help_text: str = "", parent: QWidget | None = None):
         super().__init__(parent)
@@ -945,10 +1135,11 @@ class ChartWindow(QMainWindow):
             self.setWindowIcon(get_app_icon())
         except Exception:
             pass
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, False)
         self.setMinimumSize(520, 380)
         self.resize(720, 520)
         self._canvas_widget: QWidget | None = None
+        self._chart = None
         self._help_label: QLabel | None = None
         self._help_text = ""
         self._theme_mode = "dark"
@@ -959,12 +1150,69 @@ class ChartWindow(QMainWindow):
         layout.setContentsMargins(16, 16, 16, 16)
         layout.setSpacing(12)
         self._layout = layout
+
+        self._stack = QStackedWidget(central)
+        self._stack.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._image_view = ChartImageView(self._stack)
+        self._image_view.activated.connect(self.promote_requested.emit)
+        self._stack.addWidget(self._image_view)
+        layout.addWidget(self._stack, 1)
+
+        controls = QHBoxLayout()
+        controls.addStretch(1)
+        self._interactive_btn = QPushButton("Interactive View")
+        self._interactive_btn.setObjectName("SecondaryButton")
+        self._interactive_btn.clicked.connect(self.promote_requested.emit)
+        controls.addWidget(self._interactive_btn)
+        layout.addLayout(controls)
+
+        self._rerender_timer = QTimer(self)
+        self._rerender_timer.setSingleShot(True)
+        self._rerender_timer.setInterval(150)
+        self._rerender_timer.timeout.connect(self.rerender_requested.emit)
         self.set_help_text(help_text)
 
+    @property
+    def is_interactive(self) -> bool:
+        return self._chart is not None
+
+    def memory_bytes(self) -> int:
+        """Rough bytes held by the rendered image and, once interactive, the live figure and its Agg buffer."""
+        total = 0
+        rendered = self._image_view.rendered
+        if rendered is not None and not rendered.image.isNull():
+            total += rendered.image.sizeInBytes()
+        figure = getattr(self._canvas_widget, "figure", None)
+        if figure is not None:
+            width, height = figure.canvas.get_width_height(physical=True)
+            total += width * height * 4 + len(figure.findobj()) * ARTIST_BYTES
+        return total
+
+    def render_size(self) -> tuple[int, int]:
+        """Pixel size an off-thread render should target for the image view."""
+        size = self._image_view.size()
+        width = size.width() if size.width() > 1 else 688
+        height = size.height() if size.height() > 1 else 400
+        ratio = self.devicePixelRatioF() or 1.0
+        return int(width * ratio), int(height * ratio)
+
+    def show_pending(self) -> None:
+        self._rerender_timer.stop()
+        if not self.is_interactive:
+            self._image_view.set_message("Rendering chart...")
+
+    def set_image(self, rendered) -> None:
+        if self.is_interactive:
+            return
+        self._image_view.set_rendered(rendered)
+
+    def set_render_error(self, message: str) -> None:
+        self._image_view.set_message(f"Could not render chart: {message}")
+
     def set_canvas(self, canvas: QWidget) -> None:
         if self._canvas_widget is not None:
             old_canvas = self._canvas_widget
-            self._layout.removeWidget(old_canvas)
+            self._stack.removeWidget(old_canvas)
             old_canvas.setParent(None)
             figure_obj = getattr(old_canvas, "figure", None)
             if callable(figure_obj):
@@ -978,8 +1226,39 @@ class ChartWindow(QMainWindow):
                         pass
             old_canvas.deleteLater()
         canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self._layout.insertWidget(0, canvas)
+        self._stack.addWidget(canvas)
+        self._stack.setCurrentWidget(canvas)
         self._canvas_widget = canvas
+        self._chart = None
+        self._interactive_btn.hide()
+
+    @property
+    def chart(self):
+        return self._chart
+
+    def ensure_chart(self, factory):
+        """Return the persistent chart painter, building figure and canvas only once."""
+        if self._chart is None:
+            figure_cls = cast(type, Figure)
+            canvas_cls = cast(type, FigureCanvasQTAgg)
+            fig = figure_cls(figsize=(6, 4))
+            canvas = canvas_cls(fig)
+            self.set_canvas(canvas)
+            self._chart = factory(fig)
+            # The image is stale once the live canvas takes over.
+            self._image_view.set_rendered(None)
+        return self._chart
+
+    def redraw(self) -> None:
+        canvas = self._canvas_widget
+        draw_idle = getattr(canvas, "draw_idle", None)
+        if callable(draw_idle):
+            draw_idle()
+
+    def resizeEvent(self, a0: QResizeEvent) -> None:
+        super().resizeEvent(a0)
+        if not self.is_interactive and self.isVisible():
+            self._rerender_timer.start()
 
     def set_help_text(self, help_text: str) -> None:
         help_text = (help_text or "").strip()
@@ -1011,10 +1290,428 @@ class ChartWindow(QMainWindow):
             )
 
 
+class _TaskSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+class _FunctionTask(QRunnable):
+    """Runs a callable on a pool thread and emits its result, or the exception it raised."""
+
+    def __init__(self, fn, parent: QObject):
+        super().__init__()
+        self.setAutoDelete(False)
+        self._fn = fn
+        self.signals = _TaskSignals(parent)
+
+    def run(self) -> None:
+        try:
+            result = self._fn()
+        except Exception as exc:
+            result = exc
+        self.signals.finished.emit(result)
+
+
+class _BatchExportSignals(QObject):
+    progress = pyqtSignal(int, int, object)
+    finished = pyqtSignal(object)
+
+
+class _BatchExportTask(QRunnable):
+    def __init__(self, jobs: list, signals: _BatchExportSignals, cancelled: threading.Event, cache: RenderCache):
+        super().__init__()
+        self._jobs = jobs
+        self._signals = signals
+        self._cancelled = cancelled
+        self._cache = cache
+
+    def run(self) -> None:
+        try:
+            results: object = run_batch(
+                self._jobs,
+                progress=lambda done, total, result: self._signals.progress.emit(done, total, result),
+                cancelled=self._cancelled,
+                cache=self._cache,
+            )
+        except Exception as exc:
+            results = exc
+        self._signals.finished.emit(results)
+
+
+class BatchExportDialog(HelpAwareDialog):
+    """Exports a range of months as CSV/PNG/PDF files into one folder."""
+
+    HELP_TEXT = (
+        "Choose a range of months and the formats to write. Every month is exported into the chosen "
+        "folder as finfix_YYYY_MM.csv/.png/.pdf. Months are rendered in parallel worker processes "
+        "from the ledger that is already loaded; months unchanged since an earlier export are "
+        "copied from the render cache."
+    )
+
+    def __init__(self, owner: "BudgetTracker"):
+        super().__init__(owner, "Batch Export", self.HELP_TEXT)
+        self.owner = owner
+        self.setWindowTitle("Batch Export")
+        self.setMinimumWidth(460)
+        self._cancelled = threading.Event()
+        self._running = False
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _BatchExportSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._started = 0.0
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        year, month = owner._selected_period()
+        self.from_edit = QDateEdit(QDate(year, 1, 1))
+        self.to_edit = QDateEdit(QDate(year, month, 1))
+        for edit in (self.from_edit, self.to_edit):
+            edit.setDisplayFormat("MMM yyyy")
+            edit.setCalendarPopup(True)
+        form.addRow("From", self.from_edit)
+        form.addRow("To", self.to_edit)
+
+        formats_row = QHBoxLayout()
+        self.format_checks: dict[str, QCheckBox] = {}
+        for fmt in BATCH_FORMATS:
+            check = QCheckBox(fmt.upper())
+            check.setChecked(fmt in ("csv", "pdf"))
+            self.format_checks[fmt] = check
+            formats_row.addWidget(check)
+        formats_row.addStretch(1)
+        form.addRow("Formats", formats_row)
+
+        folder_row = QHBoxLayout()
+        self.folder_edit = QLineEdit(str(Path.home() / "finfix_reports"))
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self._choose_folder)
+        folder_row.addWidget(self.folder_edit, 1)
+        folder_row.addWidget(browse_btn)
+        form.addRow("Folder", folder_row)
+
+        self.compare_check = QCheckBox("Compare with previous month")
+        self.compare_check.setChecked(owner.compare_checkbox.isChecked() if hasattr(owner, "compare_checkbox") else False)
+        form.addRow("", self.compare_check)
+        layout.addLayout(form)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setMinimumHeight(160)
+        layout.addWidget(self.log_view)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        self.export_btn = self.buttons.addButton("Export", QDialogButtonBox.AcceptRole)
+        self.export_btn.clicked.connect(self.start_export)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+
+    def _choose_folder(self) -> None:
+        folder = QFileDialog.getExistingDirectory(self, "Export Folder", self.folder_edit.text())
+        if folder:
+            self.folder_edit.setText(folder)
+
+    def start_export(self) -> None:
+        if self._running:
+            self._cancelled.set()
+            self.export_btn.setEnabled(False)
+            self.log_view.appendPlainText("Cancelling remaining months...")
+            return
+        formats = tuple(fmt for fmt, check in self.format_checks.items() if check.isChecked())
+        if not formats:
+            QMessageBox.warning(self, "Nothing to export", "Select at least one format.")
+            return
+        start = (self.from_edit.date().year(), self.from_edit.date().month())
+        end = (self.to_edit.date().year(), self.to_edit.date().month())
+        if end < start:
+            QMessageBox.warning(self, "Invalid range", "The end month is before the start month.")
+            return
+        folder = self.folder_edit.text().strip()
+        if not folder:
+            QMessageBox.warning(self, "No folder", "Choose a folder to export into.")
+            return
+        jobs = plan_batch_jobs(
+            self.owner.transactions,
+            self.owner.budget_map,
+            month_range(start, end),
+            formats,
+            Path(folder).expanduser(),
+            compare=self.compare_check.isChecked(),
+        )
+        self._cancelled = threading.Event()
+        self._running = True
+        self._started = time.perf_counter()
+        self.progress_bar.setRange(0, len(jobs))
+        self.progress_bar.setValue(0)
+        self.log_view.clear()
+        self.log_view.appendPlainText(f"Exporting {len(jobs)} month(s) as {', '.join(formats).upper()}...")
+        self.export_btn.setText("Cancel")
+        self._pool.start(_BatchExportTask(jobs, self._signals, self._cancelled, self.owner.render_cache))
+
+    def _on_progress(self, done: int, total: int, result) -> None:
+        self.progress_bar.setValue(done)
+        self.log_view.appendPlainText(f"[{done}/{total}] {describe_batch_result(result)}")
+
+    def _on_finished(self, results) -> None:
+        self._running = False
+        self.export_btn.setText("Export")
+        self.export_btn.setEnabled(True)
+        elapsed = time.perf_counter() - self._started
+        if isinstance(results, Exception):
+            self.log_view.appendPlainText(f"Batch export failed: {results}")
+            if self.isVisible():
+                QMessageBox.critical(self, "Export failed", f"Batch export failed:\n{results}")
+            return
+        failures = [result for result in results if result.error]
+        self.log_view.appendPlainText(
+            f"Done: {len(results) - len(failures)} month(s) exported, {len(failures)} failed, in {elapsed:.1f} s."
+        )
+        if results and not failures and not self._cancelled.is_set():
+            self.owner.toast(f"Exported {len(results)} month(s) to {self.folder_edit.text().strip()}")
+
+    def reject(self) -> None:
+        if self._running:
+            # Queued months are dropped; the ones already rendering finish in the background.
+            self._cancelled.set()
+            self.export_btn.setEnabled(False)
+            self.log_view.appendPlainText("Cancelling remaining months...")
+        super().reject()
+
+
+class DiagnosticsDialog(HelpAwareDialog):
+    """Hidden panel (Ctrl+Shift+D) with per-span timings collected by ``finfix.instrument``."""
+
+    HELP_TEXT = (
+        "While recording, the load, refresh, ledger write and chart steps are timed. The table shows "
+        "counts and percentiles per step (over its last 1024 runs); the list below shows the most "
+        "recent spans with their parent step. A trace file receives one JSON object per span. "
+        "Watching UI stalls logs every freeze of the window with the code that was running to stalls.jsonl."
+    )
+    COLUMNS = ("Span", "Count", "Total ms", "p50 ms", "p90 ms", "p99 ms", "Max ms")
+
+    def __init__(self, owner: "BudgetTracker"):
+        super().__init__(owner, "Diagnostics", self.HELP_TEXT)
+        self.setWindowTitle("Diagnostics")
+        self.resize(720, 520)
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.record_check = QCheckBox("Record spans")
+        self.record_check.setChecked(TRACER.enabled)
+        self.record_check.toggled.connect(self._toggle_recording)
+        self.owner = owner
+        self.stall_check = QCheckBox(f"Watch UI stalls (> {STALL_THRESHOLD_MS} ms)")
+        self.stall_check.setChecked(owner.stall_watchdog is not None and owner.stall_watchdog.running)
+        self.stall_check.toggled.connect(owner.set_stall_watchdog)
+        self.trace_label = QLabel("")
+        self.trace_label.setObjectName("InfoText")
+        trace_btn = QPushButton("Trace File...")
+        trace_btn.clicked.connect(self._choose_trace_file)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self._reset)
+        memory_btn = QPushButton("Memory...")
+        memory_btn.clicked.connect(owner.show_memory_diagnostics)
+        controls.addWidget(self.record_check)
+        controls.addWidget(self.stall_check)
+        controls.addWidget(trace_btn)
+        controls.addWidget(reset_btn)
+        controls.addWidget(memory_btn)
+        controls.addStretch(1)
+        controls.addWidget(self.trace_label)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table, 3)
+        self.recent_view = QPlainTextEdit()
+        self.recent_view.setReadOnly(True)
+        layout.addWidget(self.recent_view, 2)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, a0) -> None:
+        self._timer.start()
+        self.refresh()
+        super().showEvent(a0)
+
+    def hideEvent(self, a0) -> None:
+        self._timer.stop()
+        super().hideEvent(a0)
+
+    def _toggle_recording(self, enabled: bool) -> None:
+        if enabled and not TRACER.enabled:
+            TRACER.enable()
+        elif not enabled:
+            TRACER.disable()
+        self.refresh()
+
+    def _choose_trace_file(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "Trace File", str(Path.home() / "finfix_trace.jsonl"), "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            TRACER.enable(Path(path))
+        except OSError as exc:
+            QMessageBox.critical(self, "Trace file", f"Unable to open {path}:\n{exc}")
+            return
+        self.record_check.blockSignals(True)
+        self.record_check.setChecked(True)
+        self.record_check.blockSignals(False)
+        self.refresh()
+
+    def _reset(self) -> None:
+        TRACER.reset()
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.trace_label.setText(f"Writing {TRACER.trace_path.name}" if TRACER.trace_path else "")
+        rows = TRACER.summary()
+        self.table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            values = [
+                stats["name"],
+                str(stats["count"]),
+                f"{stats['total_ms']:.1f}",
+                f"{stats['p50_ms']:.2f}",
+                f"{stats['p90_ms']:.2f}",
+                f"{stats['p99_ms']:.2f}",
+                f"{stats['max_ms']:.2f}",
+            ]
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        lines = []
+        watchdog = self.owner.stall_watchdog
+        if watchdog is not None and watchdog.stall_count:
+            lines.append(f"{watchdog.stall_count} UI stall(s); latest:")
+            lines.append(format_stall(watchdog.recent[-1]))
+            lines.append("")
+        lines.extend(
+            f"{record['name']:<32} {record['ms']:>9.2f} ms  {('in ' + record['parent']) if record['parent'] else ''}"
+            for record in reversed(TRACER.recent()[-50:])
+        )
+        self.recent_view.setPlainText("\n".join(lines))
+
+
+class MemoryDialog(HelpAwareDialog):
+    """Memory accounting per subsystem, allocation sites and before/after snapshots."""
+
+    HELP_TEXT = (
+        "Snapshot records the process size, an estimate per subsystem (transactions, list items, budget "
+        "widgets, chart windows, caches) and, while allocations are traced, the lines that allocated the most. "
+        "Each snapshot is compared with the previous one. Reload && Compare reloads the ledger and budgets "
+        "between two snapshots, so anything that keeps growing across reloads is listed as a suspect. "
+        "Tracing only attributes allocations made after it was switched on, and slows the app down."
+    )
+    RELOAD_SETTLE_MS = 300  # let deferred deletes and the background filter query finish
+
+    def __init__(self, owner: "BudgetTracker"):
+        super().__init__(owner, "Memory", self.HELP_TEXT)
+        self.setWindowTitle("Memory")
+        self.resize(760, 560)
+        self.owner = owner
+        self.snapshots: deque = deque(maxlen=MEMORY_SNAPSHOTS_KEPT)
+        self.taken = 0
+        self.comparisons: list[dict] = []
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.trace_check = QCheckBox("Trace allocations")
+        self.trace_check.setChecked(tracemalloc.is_tracing())
+        self.trace_check.toggled.connect(self._toggle_tracing)
+        self.snapshot_btn = QPushButton("Snapshot")
+        self.snapshot_btn.clicked.connect(lambda: self.snapshot("snapshot"))
+        self.reload_btn = QPushButton("Reload && Compare")
+        self.reload_btn.clicked.connect(self.reload_and_compare)
+        export_btn = QPushButton("Export JSON...")
+        export_btn.clicked.connect(self._export)
+        controls.addWidget(self.trace_check)
+        controls.addWidget(self.snapshot_btn)
+        controls.addWidget(self.reload_btn)
+        controls.addStretch(1)
+        controls.addWidget(export_btn)
+        layout.addLayout(controls)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        layout.addWidget(self.view, 1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.snapshot("opened")
+
+    def _toggle_tracing(self, enabled: bool) -> None:
+        if enabled:
+            start_memory_tracing()
+        else:
+            stop_memory_tracing()
+
+    def snapshot(self, label: str):
+        self.taken += 1
+        snapshot = self.owner.take_memory_snapshot(f"#{self.taken} {label}")
+        previous = self.snapshots[-1] if self.snapshots else None
+        self.snapshots.append(snapshot)
+        if previous is not None:
+            self.comparisons.append(compare_memory(previous, snapshot))
+        self._show()
+        return snapshot
+
+    def reload_and_compare(self) -> None:
+        self.snapshot("before reload")
+        self.snapshot_btn.setEnabled(False)
+        self.reload_btn.setEnabled(False)
+        self.owner.load_ledger()
+        self.owner.load_budgets()
+        self.owner.update_summary()
+        QTimer.singleShot(self.RELOAD_SETTLE_MS, self._finish_reload)
+
+    def _finish_reload(self) -> None:
+        if _is_deleted(self):
+            return
+        self.snapshot("after reload")
+        self.snapshot_btn.setEnabled(True)
+        self.reload_btn.setEnabled(True)
+
+    def _show(self) -> None:
+        lines = [format_memory_snapshot(self.snapshots[-1])]
+        for comparison in reversed(self.comparisons[-5:]):
+            lines.append("")
+            lines.append(format_memory_comparison(comparison))
+        self.view.setPlainText("\n".join(lines))
+
+    def _export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "Export Memory Report", str(Path.home() / "finfix_memory.json"), "JSON (*.json)")
+        if not path:
+            return
+        try:
+            save_memory_report(build_memory_report(list(self.snapshots), self.comparisons), Path(path))
+        except OSError as exc:
+            QMessageBox.critical(self, "Export failed", f"Unable to write {path}:\n{exc}")
+            return
+        self.owner.toast(f"Memory report saved to {path}")
+
+
 class BudgetTracker(QMainWindow):
     def __init__(self):
+        startup_phase("init.window")
         super().__init__()
-        self.setWindowTitle("FinFix : Student Budget Tracker")
+        self.setWindowTitle(self._window_title())
         # Set main window icon
         try:
             self.setWindowIcon(get_app_icon())
@@ -1022,19 +1719,64 @@ class BudgetTracker(QMainWindow):
             pass
         self.setGeometry(200, 200, 520, 720)
         self.theme_mode = "dark"
-        self.transactions = []
-        self.categories = set()
+        self.ledger = Ledger()
+        self.transactions = self.ledger.transactions
+        self.categories = self.ledger.categories
         self.budget_map = {}
         self.balance = Decimal("0.00")
-        self.undo_stack = []
+        self.command_log = CommandLog(UNDO_DEPTH)
         self.last_tx_type = "expense"
         self.show_converter = False
         self.toggle_converter_action: QAction | None = None
         self.converter_window: FloatingConverterWindow | None = None
         self.chart_windows: dict[str, ChartWindow] = {}
+        self.batch_export_dialog: BatchExportDialog | None = None
+        self.diagnostics_dialog: DiagnosticsDialog | None = None
+        self.memory_dialog: MemoryDialog | None = None
+        self.stall_watchdog: StallWatchdog | None = None
+        self._heartbeat_timer: QTimer | None = None
+        self._background_tasks: set[_FunctionTask] = set()
+        self.search_index = TextIndex()
+        self._search_index_dirty = False
+        self._search_keys_plain = True  # every document key is a unique tx_id, so rows can be re-indexed one by one
+        self.ledger_query = LedgerQuery([])
+        self.profile_name = ACTIVE_PROFILE
+        self.ledger_cache = LedgerCache(PROFILE_CACHE_SIZE)
+        self._profile_indexes: OrderedDict[Path, TextIndex] = OrderedDict()  # search indexes of recent profiles
+        self._prepared_dirs: set[Path] = set()
+        self._filter_generation = 0
+        self._visible_rows: set[int] | None = None  # None: every row is shown
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(TRANSACTION_FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.apply_transaction_filter)
+        self.chart_renderer = None
+        startup_phase("init.storage")
+        ensure_storage()
+        self._prepared_dirs.add(DATA_DIR)
+        # Another window or a script may change this profile's files; see check_external_changes.
+        self._ledger_state: FileState | None = None
+        self._budget_state: FileState | None = None
+        self._external_reload_running = False
+        self._external_change_timer = QTimer(self)
+        self._external_change_timer.setSingleShot(True)
+        self._external_change_timer.setInterval(EXTERNAL_RELOAD_DEBOUNCE_MS)
+        self._external_change_timer.timeout.connect(self.check_external_changes)
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(lambda _path: self._external_change_timer.start())
+        self.file_watcher.directoryChanged.connect(lambda _path: self._external_change_timer.start())
+        self._watch_storage()
+        if ENABLE_RENDER_DISK_CACHE:
+            ensure_private_dir(RENDER_CACHE_DIR)
+        self.render_cache = RenderCache(disk_dir=RENDER_CACHE_DIR if ENABLE_RENDER_DISK_CACHE else None)
+        if ENABLE_SEARCH_INDEX_CACHE:
+            self.search_index = load_search_index(SEARCH_INDEX_JSON) or self.search_index
+        if MATPLOTLIB_AVAILABLE and chart_render is not None:
+            self.chart_renderer = chart_render.ChartRenderService(self, cache=self.render_cache)
+            self.chart_renderer.rendered.connect(self._on_chart_rendered)
+            self.chart_renderer.failed.connect(self._on_chart_render_failed)
         self._entrance_anims: list[QParallelAnimationGroup] = []
         self._focus_glow = FocusGlowFilter(parent=self) if ENABLE_FOCUS_GLOW else None
-        ensure_storage()
         rate_snapshot = load_cached_rates()
         self.exchange_rates = rate_snapshot.get("rates", {"MYR": 1.0})
         self.base_currency = rate_snapshot.get("base", "MYR")
@@ -1048,12 +1790,14 @@ class BudgetTracker(QMainWindow):
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(16)
 
+        startup_phase("init.menu")
         self._build_menu()
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Welcome to FinFix", 4000)
         self._install_shortcuts()
 
+        startup_phase("init.header")
         header = QFrame()
         header.setObjectName("HeaderBar")
         header_layout = QHBoxLayout(header)
@@ -1119,6 +1863,7 @@ class BudgetTracker(QMainWindow):
         header_wrapper.setFixedHeight(header_height)
         header_wrapper.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
 
+        startup_phase("init.form_card")
         form_card = QFrame()
         form_card.setObjectName("Card")
         form_layout = QVBoxLayout(form_card)
@@ -1191,6 +1936,7 @@ class BudgetTracker(QMainWindow):
         btn_layout.addWidget(self.savings_btn)
         form_layout.addLayout(btn_layout)
 
+        startup_phase("init.budget_card")
         budget_card = QFrame()
         budget_card.setObjectName("Card")
         budget_layout = QVBoxLayout(budget_card)
@@ -1222,8 +1968,10 @@ class BudgetTracker(QMainWindow):
         self.budget_list.itemDoubleClicked.connect(self.edit_budget_item)
         budget_layout.addWidget(self.budget_list)
 
+        startup_phase("init.converter")
         self._build_converter_window()
 
+        startup_phase("init.ledger_card")
         ledger_card = QFrame()
         ledger_card.setObjectName("Card")
         ledger_layout = QVBoxLayout(ledger_card)
@@ -1232,6 +1980,7 @@ class BudgetTracker(QMainWindow):
         ledger_header = QLabel("Transactions")
         ledger_header.setObjectName("SectionTitle")
         ledger_layout.addWidget(ledger_header)
+        ledger_layout.addWidget(self._build_transaction_filter_bar())
 
         self.transaction_list = TweenListWidget()
         self.transaction_list.setMinimumHeight(220)
@@ -1264,6 +2013,7 @@ class BudgetTracker(QMainWindow):
         self.edit_transaction_btn.setEnabled(False)
         self.delete_btn.setEnabled(False)
 
+        startup_phase("init.summary_card")
         self.summary_card = QFrame()
         self.summary_card.setObjectName("Card")
         summary_layout = QVBoxLayout(self.summary_card)
@@ -1281,13 +2031,13 @@ class BudgetTracker(QMainWindow):
             name = date(2000, month_index, 1).strftime("%B")
             self.month_combo.addItem(name, month_index)
         self.month_combo.setCurrentIndex(today.month - 1)
-        self.month_combo.currentIndexChanged.connect(self.update_summary)
+        self.month_combo.currentIndexChanged.connect(lambda _index: self.update_summary())
 
         self.year_combo = QComboBox()
         for year in range(today.year - 3, today.year + 2):
             self.year_combo.addItem(str(year))
         self.year_combo.setCurrentText(str(today.year))
-        self.year_combo.currentIndexChanged.connect(self.update_summary)
+        self.year_combo.currentIndexChanged.connect(lambda _index: self.update_summary())
 
         self.compare_checkbox = QCheckBox("Compare with previous month")
         self.compare_checkbox.stateChanged.connect(lambda _: self.update_summary())
@@ -1400,13 +2150,15 @@ class BudgetTracker(QMainWindow):
             figure_cls = cast(type, Figure)
             canvas_cls = cast(type, FigureCanvasQTAgg)
             self.sparkline_fig = figure_cls(figsize=(4.0, 1.4))
-            self.sparkline_ax = self.sparkline_fig.add_subplot(111)
             self.sparkline_canvas = canvas_cls(self.sparkline_fig)
+            self.sparkline_chart = charts.SparklineChart(self.sparkline_fig)
+            self.sparkline_ax = self.sparkline_chart.ax
             sparkline_layout.addWidget(self.sparkline_canvas)
         else:
             self.sparkline_fig = None
             self.sparkline_ax = None
             self.sparkline_canvas = None
+            self.sparkline_chart = None
             self.sparkline_placeholder = QLabel("Install matplotlib to view spending sparkline.")
             self.sparkline_placeholder.setObjectName("SummaryText")
             sparkline_layout.addWidget(self.sparkline_placeholder)
@@ -1438,6 +2190,7 @@ class BudgetTracker(QMainWindow):
         self.summary_scroll.setWidget(self.summary_frame)
         summary_layout.addWidget(self.summary_scroll, 1)
 
+        startup_phase("init.layout")
         for card in (form_card, budget_card, ledger_card, self.summary_card):
             card.setMinimumWidth(340)
             card.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
@@ -1471,10 +2224,11 @@ class BudgetTracker(QMainWindow):
         self.expense_chart_btn.clicked.connect(self.show_expense_pie_chart)
         self.currency_convert_btn.clicked.connect(self.perform_currency_conversion)
         self.currency_update_btn.clicked.connect(self.refresh_exchange_rates)
-        self.use_savings_btn.clicked.connect(self.use_savings_funds)
+        self.use_savings_btn.clicked.connect(lambda _checked=False: self.use_savings_funds())
         self.edit_transaction_btn.clicked.connect(self.edit_selected_transaction)
         self.delete_btn.clicked.connect(self.delete_selected_transaction)
 
+        startup_phase("init.styling")
         # Enhance all secondary buttons with shadow effects
         for btn in [self.add_budget_btn, self.use_savings_btn, self.edit_transaction_btn, 
                     self.delete_btn, self.export_btn, self.chart_btn, self.expense_chart_btn,
@@ -1483,6 +2237,7 @@ class BudgetTracker(QMainWindow):
 
         self.refresh_currency_options()
         self.apply_theme()
+        startup_phase("init.data")
         self.load_ledger()
         self.load_budgets()
         self.refresh_category_options()
@@ -1554,6 +2309,11 @@ class BudgetTracker(QMainWindow):
 
         file_menu = menu_bar.addMenu("&File")
         if file_menu is not None:
+            import_statement_action = QAction("Import Bank CSV...", self)
+            import_statement_action.triggered.connect(self.import_bank_statement)
+            file_menu.addAction(import_statement_action)
+            file_menu.addSeparator()
+
             export_csv_action = QAction("Export Monthly CSV", self)
             export_csv_action.triggered.connect(self.export_monthly_data)
             file_menu.addAction(export_csv_action)
@@ -1566,6 +2326,20 @@ class BudgetTracker(QMainWindow):
             export_pdf_action.triggered.connect(self.export_summary_as_pdf)
             file_menu.addAction(export_pdf_action)
 
+            export_range_action = QAction("Export Date Range CSV...", self)
+            export_range_action.triggered.connect(self.export_date_range_csv)
+            file_menu.addAction(export_range_action)
+
+            export_columnar_action = QAction("Export for Analysis (Parquet/Arrow)...", self)
+            export_columnar_action.triggered.connect(self.export_columnar_data)
+            if not columnar.available_formats():
+                export_columnar_action.setToolTip("Install pyarrow to enable Parquet/Arrow export.")
+            file_menu.addAction(export_columnar_action)
+
+            batch_export_action = QAction("Batch Export...", self)
+            batch_export_action.triggered.connect(self.show_batch_export)
+            file_menu.addAction(batch_export_action)
+
             file_menu.addSeparator()
             exit_action = QAction("Exit", self)
             exit_action.triggered.connect(self.handle_exit)
@@ -1578,6 +2352,10 @@ class BudgetTracker(QMainWindow):
             toggle_theme_action.triggered.connect(self.toggle_theme)
             view_menu.addAction(toggle_theme_action)
 
+            cache_stats_action = QAction("Render Cache Statistics", self)
+            cache_stats_action.triggered.connect(self.show_render_cache_stats)
+            view_menu.addAction(cache_stats_action)
+
             toggle_converter_action = QAction("Show Currency Converter", self)
             toggle_converter_action.setCheckable(True)
             toggle_converter_action.setChecked(self.show_converter)
@@ -1585,11 +2363,99 @@ class BudgetTracker(QMainWindow):
             view_menu.addAction(toggle_converter_action)
             self.toggle_converter_action = toggle_converter_action
 
+        profile_menu = menu_bar.addMenu("&Profile")
+        if profile_menu is not None:
+            self.profile_menu = profile_menu
+            profile_menu.aboutToShow.connect(self._populate_profile_menu)
+            self._populate_profile_menu()
+
+    def _populate_profile_menu(self):
+        menu = self.profile_menu
+        menu.clear()
+        group = QActionGroup(menu)
+        group.setExclusive(True)
+        for name in profile_names():
+            action = QAction(name, menu)
+            action.setCheckable(True)
+            action.setChecked(name == self.profile_name)
+            action.triggered.connect(lambda _checked=False, name=name: self.switch_profile(name))
+            group.addAction(action)
+            menu.addAction(action)
+        menu.addSeparator()
+        new_action = QAction("New Profile...", menu)
+        new_action.triggered.connect(self.create_profile)
+        menu.addAction(new_action)
+
+    def _window_title(self) -> str:
+        title = "FinFix : Student Budget Tracker"
+        return title if ACTIVE_PROFILE == DEFAULT_PROFILE else f"{title} [{ACTIVE_PROFILE}]"
+
+    def switch_profile(self, name: str) -> None:
+        """Show profile ``name``; recently used profiles come back from memory instead of being re-parsed."""
+        if name == self.profile_name:
+            return
+        try:
+            folder = profile_dir(name)
+        except ValueError as exc:
+            self.show_error_popup("Profile", str(exc))
+            return
+        started = time.perf_counter()
+        self._save_search_index()
+        self._profile_indexes[DATA_DIR] = self.search_index
+        self._profile_indexes.move_to_end(DATA_DIR)
+        use_profile(name)
+        if folder not in self._prepared_dirs:
+            try:
+                ensure_storage()
+            except OSError as exc:
+                use_profile(self.profile_name)
+                self.show_error_popup("Profile", f"Could not open profile {name}: {exc}")
+                return
+            self._prepared_dirs.add(folder)
+        self.profile_name = name
+        index = self._profile_indexes.pop(folder, None)
+        if index is None:
+            index = (load_search_index(SEARCH_INDEX_JSON) if ENABLE_SEARCH_INDEX_CACHE else None) or TextIndex()
+        self.search_index = index
+        self._search_index_dirty = False
+        while len(self._profile_indexes) >= PROFILE_CACHE_SIZE:
+            self._profile_indexes.popitem(last=False)
+        self.command_log.clear()
+        self._watch_storage()
+        self.load_ledger(reuse_cached=True)
+        self.load_budgets()
+        self.refresh_category_options()
+        self.update_balance()
+        self.update_summary()
+        self.setWindowTitle(self._window_title())
+        try:
+            save_active_profile(name)
+        except OSError:
+            pass
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.toast(f"Switched to profile {name} ({elapsed_ms:.0f} ms)")
+
+    def create_profile(self) -> None:
+        name, ok = QInputDialog.getText(self, "New Profile", "Profile name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in profile_names():
+            self.switch_profile(name)
+            return
+        if not is_valid_profile_name(name):
+            self.show_error_popup("Profile", "Use letters, digits, spaces, '.', '_' or '-' (up to 64 characters).")
+            return
+        self.switch_profile(name)
+
     def _install_shortcuts(self):
         QShortcut(QKeySequence("Return"), self, self.submit_default_transaction)
         QShortcut(QKeySequence("Enter"), self, self.submit_default_transaction)
         QShortcut(QKeySequence("Ctrl+Z"), self, self.undo_last_transaction)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo_last_transaction)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo_last_transaction)
         QShortcut(QKeySequence("Ctrl+E"), self, self.export_monthly_data)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_diagnostics)
 
     def _build_converter_window(self):
         if self.converter_window is not None:
@@ -1759,8 +2625,12 @@ class BudgetTracker(QMainWindow):
 
             def _cleanup(_=None, chart_key=key):
                 self.chart_windows.pop(chart_key, None)
+                if self.chart_renderer is not None:
+                    self.chart_renderer.cancel(chart_key)
 
             window.destroyed.connect(_cleanup)
+            window.promote_requested.connect(lambda chart_key=key: self._promote_chart(chart_key))
+            window.rerender_requested.connect(lambda chart_key=key: self._rerender_chart(chart_key))
             self.chart_windows[key] = window
         else:
             window.setWindowTitle(title)
@@ -1773,6 +2643,315 @@ class BudgetTracker(QMainWindow):
     def handle_exit(self):
         self.close()
 
+    def closeEvent(self, a0: QCloseEvent) -> None:
+        self._save_search_index()
+        self.set_stall_watchdog(False)
+        super().closeEvent(a0)
+
+    def set_stall_watchdog(self, enabled: bool, threshold_ms: int = STALL_THRESHOLD_MS) -> None:
+        """Start or stop watching the GUI thread for stalls longer than ``threshold_ms``."""
+        if not enabled:
+            if self._heartbeat_timer is not None:
+                self._heartbeat_timer.stop()
+            if self.stall_watchdog is not None:
+                self.stall_watchdog.stop()
+            return
+        if self.stall_watchdog is None:
+            self.stall_watchdog = StallWatchdog(
+                threshold=threshold_ms / 1000,
+                heartbeat_interval=STALL_HEARTBEAT_MS / 1000,
+                on_stall=self._on_ui_stall,
+                log_path=STALL_LOG,
+            )
+            self._heartbeat_timer = QTimer(self)
+            self._heartbeat_timer.setInterval(STALL_HEARTBEAT_MS)
+            self._heartbeat_timer.timeout.connect(self.stall_watchdog.beat)
+        self.stall_watchdog.threshold = threshold_ms / 1000
+        self.stall_watchdog.start()
+        self._heartbeat_timer.start()
+
+    @staticmethod
+    def _on_ui_stall(record: dict) -> None:
+        # Runs on the watchdog thread: no Qt calls here.
+        print(format_stall(record), file=sys.stderr)
+
+    def _budget_item_widgets(self) -> list[QWidget]:
+        widgets = []
+        for row in range(self.budget_list.count()):
+            widget = self.budget_list.itemWidget(self.budget_list.item(row))
+            if widget is not None:
+                widgets.append(widget)
+                widgets.extend(widget.findChildren(QWidget))
+        return widgets
+
+    def memory_subsystems(self) -> dict[str, int]:
+        """Estimated bytes per subsystem; objects shared between the Python structures are counted once."""
+        seen: set[int] = set()
+        sizes = {
+            "transactions (dicts)": deep_sizeof(self.transactions, seen),
+            "query indexes": deep_sizeof(self.ledger_query, seen),
+            "search index": deep_sizeof(self.search_index, seen),
+        }
+        list_bytes = 0
+        for row in range(self.transaction_list.count()):
+            item = self.transaction_list.item(row)
+            list_bytes += QT_ITEM_BYTES + 2 * QSTRING_BYTES + 2 * (len(item.text()) + len(item.toolTip()))
+        sizes["transaction list items"] = list_bytes
+        widgets = self._budget_item_widgets()
+        sizes["budget widgets"] = (
+            self.budget_list.count() * QT_ITEM_BYTES
+            + len(widgets) * QWIDGET_BYTES
+            + sum(2 * len(widget.styleSheet()) for widget in widgets)
+        )
+        sizes["chart windows"] = sum(window.memory_bytes() for window in self.chart_windows.values())
+        sizes["render cache (memory)"] = self.render_cache.stats()["memory_bytes"]
+        return sizes
+
+    def memory_counters(self) -> dict[str, int]:
+        return {
+            "transactions": len(self.transactions),
+            "transaction list items": self.transaction_list.count(),
+            "budget widgets": len(self._budget_item_widgets()),
+            "chart windows": len(self.chart_windows),
+            "_list_anim_* attributes": sum(1 for name in vars(self) if name.startswith("_list_anim_")),
+            "QObject children": len(self.findChildren(QObject)),
+            "Python objects": len(gc.get_objects()),
+        }
+
+    def take_memory_snapshot(self, label: str):
+        with span("diagnostics.memory_snapshot"):
+            return take_memory_snapshot(label, self.memory_subsystems(), self.memory_counters(), vars(self).keys())
+
+    def _sync_search_index(self) -> None:
+        """Bring the index in line with a freshly loaded ledger; single changes go through ``_update_search_index``."""
+        keys = self.ledger_query.keys
+        self._search_keys_plain = all("#" not in key for key in keys)
+        fingerprint = ledger_fingerprint(LEDGER_CSV)
+        index = self.search_index
+        if fingerprint is not None and fingerprint == index.fingerprint and len(index) == len(keys):
+            # Saved index was built from this exact ledger file.
+            return
+        # Only rows whose text changed since the last load are re-tokenized.
+        index.sync(self.transactions, keys)
+        index.fingerprint = fingerprint
+        self._search_index_dirty = True
+
+    def _update_search_index(self, changes: list[tuple[str, int, dict]]) -> None:
+        """Re-index only the rows ``apply_to_ledger`` changed.
+
+        Rows without an id, or sharing one, are keyed by position, and those
+        keys shift when rows move; a ledger with any falls back to a full sync.
+        """
+        index = self.search_index
+        if not self._search_keys_plain or any(
+            not tx["tx_id"] or (kind == "insert" and tx["tx_id"] in index) for kind, _row, tx in changes
+        ):
+            self._sync_search_index()
+            return
+        for kind, _row, tx in changes:
+            if kind == "remove":
+                index.remove(tx["tx_id"])
+            else:
+                index.add(tx["tx_id"], document_text(tx))  # add() updates a key it already has
+        index.fingerprint = ledger_fingerprint(LEDGER_CSV)
+        self._search_index_dirty = True
+
+    def _save_search_index(self) -> None:
+        if not ENABLE_SEARCH_INDEX_CACHE or not self._search_index_dirty:
+            return
+        try:
+            save_search_index(self.search_index, SEARCH_INDEX_JSON)
+            ensure_private_file(SEARCH_INDEX_JSON)
+        except OSError:
+            return
+        self._search_index_dirty = False
+
+    def search_transactions(self, query: str) -> list[int]:
+        """Rows of ``self.transactions`` whose description/category match every term of ``query``."""
+        keys = self.search_index.search(query)
+        if keys is None:
+            return list(range(len(self.transactions)))
+        row_of_key = self.ledger_query.row_of_key
+        return sorted(row_of_key[key] for key in keys if key in row_of_key)
+
+    def _build_transaction_filter_bar(self) -> QWidget:
+        bar = QFrame()
+        layout = QVBoxLayout(bar)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.filter_text_input = QLineEdit()
+        self.filter_text_input.setPlaceholderText("Search description or category")
+        self.filter_text_input.setClearButtonEnabled(True)
+        self.filter_type_combo = QComboBox()
+        self.filter_type_combo.addItem("All types", "")
+        for tx_type in TRANSACTION_TYPES:
+            self.filter_type_combo.addItem(tx_type.capitalize(), tx_type)
+        self.filter_category_combo = QComboBox()
+        self.filter_category_combo.addItem("All categories", "")
+        first_row = QHBoxLayout()
+        first_row.setSpacing(8)
+        first_row.addWidget(self.filter_text_input, 1)
+        first_row.addWidget(self.filter_type_combo)
+        first_row.addWidget(self.filter_category_combo)
+        layout.addLayout(first_row)
+
+        self.filter_dates_check = QCheckBox("Dates")
+        today = QDate.currentDate()
+        self.filter_from_edit = QDateEdit(QDate(today.year(), 1, 1))
+        self.filter_to_edit = QDateEdit(today)
+        for edit in (self.filter_from_edit, self.filter_to_edit):
+            edit.setDisplayFormat("yyyy-MM-dd")
+            edit.setCalendarPopup(True)
+            edit.setEnabled(False)
+        self.filter_min_input = QLineEdit()
+        self.filter_min_input.setPlaceholderText("Min RM")
+        self.filter_max_input = QLineEdit()
+        self.filter_max_input.setPlaceholderText("Max RM")
+        for edit in (self.filter_min_input, self.filter_max_input):
+            edit.setValidator(QDoubleValidator(0.00, 1_000_000_000.0, 2))
+            edit.setMaximumWidth(90)
+        clear_btn = QPushButton("Clear")
+        clear_btn.setObjectName("SecondaryButton")
+        clear_btn.clicked.connect(self.clear_transaction_filter)
+        self.filter_status_label = QLabel("")
+        self.filter_status_label.setObjectName("InfoText")
+        second_row = QHBoxLayout()
+        second_row.setSpacing(8)
+        second_row.addWidget(self.filter_dates_check)
+        second_row.addWidget(self.filter_from_edit)
+        second_row.addWidget(self.filter_to_edit)
+        second_row.addWidget(self.filter_min_input)
+        second_row.addWidget(self.filter_max_input)
+        second_row.addWidget(clear_btn)
+        second_row.addStretch(1)
+        second_row.addWidget(self.filter_status_label)
+        layout.addLayout(second_row)
+
+        self.filter_dates_check.toggled.connect(self.filter_from_edit.setEnabled)
+        self.filter_dates_check.toggled.connect(self.filter_to_edit.setEnabled)
+        self.filter_dates_check.toggled.connect(self._schedule_transaction_filter)
+        self.filter_text_input.textChanged.connect(self._schedule_transaction_filter)
+        self.filter_min_input.textChanged.connect(self._schedule_transaction_filter)
+        self.filter_max_input.textChanged.connect(self._schedule_transaction_filter)
+        self.filter_from_edit.dateChanged.connect(self._schedule_transaction_filter)
+        self.filter_to_edit.dateChanged.connect(self._schedule_transaction_filter)
+        self.filter_type_combo.currentIndexChanged.connect(self._schedule_transaction_filter)
+        self.filter_category_combo.currentIndexChanged.connect(self._schedule_transaction_filter)
+        return bar
+
+    def _refresh_filter_categories(self) -> None:
+        if not hasattr(self, "filter_category_combo"):
+            return
+        combo = self.filter_category_combo
+        selected = combo.currentData() or ""
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("All categories", "")
+        for category in sorted({cat for cat in self.categories if cat}, key=str.lower):
+            combo.addItem(category, category)
+        index = combo.findData(selected)
+        combo.setCurrentIndex(index if index >= 0 else 0)
+        combo.blockSignals(False)
+        if index < 0 and selected:
+            self._schedule_transaction_filter()
+
+    def current_transaction_filter(self) -> TransactionFilter:
+        def amount(edit: QLineEdit) -> Decimal | None:
+            text = edit.text().strip()
+            if not text:
+                return None
+            try:
+                return Decimal(text)
+            except ArithmeticError:
+                return None
+
+        tx_type = self.filter_type_combo.currentData() or ""
+        category = self.filter_category_combo.currentData() or ""
+        dates_on = self.filter_dates_check.isChecked()
+        return TransactionFilter(
+            text=self.filter_text_input.text().strip(),
+            start=self.filter_from_edit.date().toPyDate() if dates_on else None,
+            end=self.filter_to_edit.date().toPyDate() if dates_on else None,
+            types=frozenset({tx_type}) if tx_type else frozenset(),
+            categories=frozenset({category}) if category else frozenset(),
+            min_amount=amount(self.filter_min_input),
+            max_amount=amount(self.filter_max_input),
+        )
+
+    def clear_transaction_filter(self) -> None:
+        for widget in (self.filter_text_input, self.filter_min_input, self.filter_max_input):
+            widget.blockSignals(True)
+            widget.clear()
+            widget.blockSignals(False)
+        for combo in (self.filter_type_combo, self.filter_category_combo):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(0)
+            combo.blockSignals(False)
+        self.filter_dates_check.setChecked(False)
+        self.apply_transaction_filter()
+
+    def _schedule_transaction_filter(self, *_args) -> None:
+        # Bumping the generation makes any query still running give up early.
+        self._filter_generation += 1
+        self._filter_timer.start()
+
+    def apply_transaction_filter(self) -> None:
+        """Run the filter bar's query off the UI thread and show only the matching rows."""
+        if not hasattr(self, "filter_text_input"):
+            return
+        self._filter_timer.stop()
+        self._filter_generation += 1
+        generation = self._filter_generation
+        query = self.current_transaction_filter()
+        if query.is_empty():
+            self._show_transaction_rows(None)
+            return
+        # Text lookup is a few set intersections; the index is only safe to read on this thread.
+        text_keys = self.search_index.search(query.text) if query.text else None
+        ledger_query = self.ledger_query
+
+        def run() -> list[int]:
+            return ledger_query.run(query, text_keys, cancelled=lambda: self._filter_generation != generation)
+
+        def finished(result: object) -> None:
+            if generation != self._filter_generation or ledger_query is not self.ledger_query:
+                return
+            if isinstance(result, QueryCancelled):
+                return
+            if isinstance(result, Exception):
+                self.toast(f"Filter failed: {result}")
+                return
+            self._show_transaction_rows(cast(list, result))
+
+        self._run_in_background(run, finished)
+
+    def _show_transaction_rows(self, rows: list[int] | None) -> None:
+        """Hide/show only the rows whose visibility changed since the last filter."""
+        total = self.transaction_list.count()
+        wanted = None if rows is None else set(rows)
+        previous = self._visible_rows
+        if wanted is None and previous is None:
+            changes: list[tuple[int, bool]] = []
+        elif wanted is None:
+            changes = [(row, False) for row in range(total) if row not in previous]  # type: ignore[operator]
+        elif previous is None:
+            changes = [(row, True) for row in range(total) if row not in wanted]
+        else:
+            changes = [(row, True) for row in previous - wanted] + [(row, False) for row in wanted - previous]
+        if changes:
+            self.transaction_list.setUpdatesEnabled(False)
+            for row, hidden in changes:
+                if row < total:
+                    self.transaction_list.setRowHidden(row, hidden)
+            self.transaction_list.setUpdatesEnabled(True)
+        self._visible_rows = wanted
+        shown = total if wanted is None else len(wanted)
+        self.filter_status_label.setText("" if wanted is None else f"Showing {shown:,} of {total:,}")
+        current = self.transaction_list.currentRow()
+        if wanted is not None and current >= 0 and current not in wanted:
+            self.transaction_list.setCurrentRow(-1)
+
     def createGradientButton(self, text, color1, color2):
         btn = TweenButton(text)
         btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -1846,72 +3025,237 @@ class BudgetTracker(QMainWindow):
         )
 
     def _normalize_transaction(self, row: dict) -> dict:
-        tx_id = row.get("tx_id", "").strip()
-        ttype = (row.get("type", "expense") or "expense").lower()
-        if ttype not in {"income", "expense", "savings"}:
-            ttype = "expense"
-        raw_amount = row.get("amount_rm", row.get("amount", "0"))
-        try:
-            amount = money(raw_amount)
-        except Exception:
-            amount = Decimal("0.00")
-        category = row.get("category") or ("Savings" if ttype == "savings" else "General")
-        category = category.strip() or ("Savings" if ttype == "savings" else "General")
-        desc = (row.get("desc") or row.get("description") or "").strip()
-        tx_date = (row.get("date") or "").strip()
-        try:
-            if tx_date:
-                date.fromisoformat(tx_date)
-            else:
-                raise ValueError
-        except ValueError:
-            tx_date = date.today().isoformat()
-        return {
-            "tx_id": tx_id,
-            "date": tx_date,
-            "type": ttype,
-            "category": category,
-            "amount": amount,
-            "desc": desc,
-        }
+        return normalize_transaction(row)
+
+    @traced("refresh.load_ledger")
+    def load_ledger(self, reuse_cached: bool = False):
+        """Read the active profile's ledger and rebuild the list.
 
-    def load_ledger(self):
+        ``reuse_cached`` keeps a ledger already parsed for this folder (switching
+        back to a recent profile) as long as its files did not change on disk.
+        """
         self.transaction_list.clear()
-        self.balance = Decimal("0.00")
-        self.transactions = []
-        self.categories = set()
+        self.ledger = Ledger(budgets=self.budget_map)
+        self.transactions = self.ledger.transactions
+        self.categories = self.ledger.categories
+        self.balance = self.ledger.balance
+        self._ledger_state = file_state(LEDGER_CSV)  # taken before reading, so nothing appended meanwhile is missed
         if not LEDGER_CSV.exists():
             return
+        if not reuse_cached:
+            self.ledger_cache.evict(DATA_DIR)
         try:
-            with LEDGER_CSV.open(newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for raw in reader:
-                    tx = self._normalize_transaction(raw)
-                    self.transactions.append(tx)
-                    if tx["category"]:
-                        self.categories.add(tx["category"])
-                    if tx["type"] == "income":
-                        self.balance += tx["amount"]
-                    elif tx["type"] == "expense":
-                        self.balance -= tx["amount"]
-                    else:
-                        # Savings are neutral (transfer) - do not change balance
-                        pass
+            with span("ledger.read"):
+                entry = self.ledger_cache.get(DATA_DIR)
         except FileNotFoundError:
             self.show_error_popup("Error", "Ledger file not found!")
             return
 
-        for tx in self.transactions:
-            sign = "+" if tx["type"] == "income" else "-"
-            tx_id = tx["tx_id"] or "-"
-            display_amount = abs(tx["amount"])
-            display = f"{tx['date']} | {tx['category']} | {sign} RM{display_amount:.2f} | {tx['desc']}  ({tx_id})"
-            item = QListWidgetItem(display)
+        with span("ledger.normalize"):
+            self.ledger = entry.ledger
+            self.transactions = self.ledger.transactions
+            self.categories = self.ledger.categories
+            self.balance = self.ledger.balance
+
+        with span("ledger.index"):
+            self.ledger_query = self._query_for(entry)
+            self._sync_search_index()
+        with span("ledger.list_rebuild"):
+            self._add_transaction_items(self.transactions)
+        self._visible_rows = None
+        self.apply_transaction_filter()
+        self.refresh_period_controls()
+        self.update_reclass_ui(self.transaction_list.currentRow())
+        self.update_use_savings_button()
+
+    @staticmethod
+    def _transaction_item_text(tx: dict) -> str:
+        sign = "+" if tx["type"] == "income" else "-"
+        return f"{tx['date']} | {tx['category']} | {sign} RM{abs(tx['amount']):.2f} | {tx['desc']}  ({tx['tx_id'] or '-'})"
+
+    def _add_transaction_items(self, transactions: list[dict]) -> None:
+        animate_from = len(transactions) - LIST_ANIMATED_ROWS
+        for row, tx in enumerate(transactions):
+            item = QListWidgetItem(self._transaction_item_text(tx))
             self.transaction_list.addItem(item)
-            self._animate_new_item(item)
+            if row >= animate_from:
+                self._animate_new_item(item)
+
+    def _next_tx_id(self) -> str:
+        """``next_tx_id()`` without re-reading the file when the open ledger is what is on disk. Call under the ledger lock."""
+        if self._ledger_state is not None and file_state(LEDGER_CSV) == self._ledger_state:
+            return self.ledger.next_tx_id()
+        return next_tx_id()
+
+    def run_command(self, build: Callable[[], Command], select: bool = False) -> Command | None:
+        """Write the command ``build`` returns to the ledger file and apply it to the open ledger in place.
+
+        ``build`` runs under the ledger lock, so ids it takes from ``_next_tx_id``
+        cannot collide with another writer's. If the file changed behind this
+        window's back, the ledger is reloaded instead of patched.
+        """
+        try:
+            with ledger_lock(LEDGER_CSV):
+                journal = EventLog.existing(LEDGER_CSV)
+                if journal is not None:
+                    journal.catch_up()  # journal edits made without FinFix before this one
+                in_sync = self._ledger_state is not None and file_state(LEDGER_CSV) == self._ledger_state
+                command = build()
+                ensure_writable(LEDGER_CSV)
+                with span("ledger.apply_command"):
+                    apply_to_file(LEDGER_CSV, command)
+                if journal is not None:
+                    journal.record(command)
+                state = file_state(LEDGER_CSV)
+                stamp = file_stamp(DATA_DIR)
+        except LockTimeout as exc:
+            self.show_lock_timeout(exc)
+            return None
+        except CommandConflict as exc:
+            # Another window changed the rows this history refers to; it cannot be replayed any more.
+            self.command_log.clear()
+            self.toast(f"Ledger changed elsewhere: {exc}.", 5000)
+            self.load_ledger()
+            return None
+        ensure_private_file(LEDGER_CSV)
+        row = -1
+        if in_sync:
+            try:
+                row = self._apply_in_memory(command, stamp)
+                self._ledger_state = state
+            except CommandConflict:
+                self.load_ledger()
+        else:
+            self.load_ledger()
+        self.load_budgets()
+        self.refresh_category_options()
+        self.update_balance()
+        self.update_summary()
+        if select and 0 <= row < self.transaction_list.count():
+            self.transaction_list.setCurrentRow(row)
+        return command
+
+    def _query_for(self, entry: CachedLedger | None) -> LedgerQuery:
+        """The filter indexes for ``self.transactions``, shared through ``entry``'s memo when it holds them."""
+        if entry is None:
+            return LedgerQuery(self.transactions)
+        return entry.memo("query", lambda: LedgerQuery(self.transactions))
+
+    def _apply_in_memory(self, command: Command, stamp: tuple) -> int:
+        """Patch the ledger and the list rows ``command`` touches; returns the last row changed.
+
+        ``stamp`` is the ``file_stamp`` of the files ``command`` was written to.
+        """
+        with self.ledger_cache.patch(DATA_DIR, self.ledger, stamp) as entry:
+            changes = apply_to_ledger(self.ledger, command)
+        self.transactions = self.ledger.transactions
+        self.categories = self.ledger.categories
+        self.balance = self.ledger.balance
+        self.transaction_list.setUpdatesEnabled(False)
+        row = -1
+        for kind, row, tx in changes:
+            if kind == "replace":
+                self.transaction_list.item(row).setText(self._transaction_item_text(tx))
+            elif kind == "remove":
+                self.transaction_list.takeItem(row)
+            else:
+                item = QListWidgetItem(self._transaction_item_text(tx))
+                self.transaction_list.insertItem(row, item)
+                self._animate_new_item(item)
+        self.transaction_list.setUpdatesEnabled(True)
+        self.ledger_query = self._query_for(entry)
+        self._update_search_index(changes)
+        if self._visible_rows is not None:
+            # Hidden flags moved with their items; re-read them before the filter diffs against them.
+            self._visible_rows = {
+                index for index in range(self.transaction_list.count()) if not self.transaction_list.isRowHidden(index)
+            }
+        self.apply_transaction_filter()
         self.refresh_period_controls()
         self.update_reclass_ui(self.transaction_list.currentRow())
         self.update_use_savings_button()
+        return min(row, len(self.transactions) - 1)
+
+    def _watch_storage(self) -> None:
+        """Watch the active profile's files; a rewrite replaces the file, which drops its watch, so re-add it."""
+        wanted = [str(path) for path in (DATA_DIR, LEDGER_CSV, BUDGET_CSV) if path.exists()]
+        stale = [path for path in self.file_watcher.files() + self.file_watcher.directories() if path not in wanted]
+        if stale:
+            self.file_watcher.removePaths(stale)
+        watched = set(self.file_watcher.files() + self.file_watcher.directories())
+        missing = [path for path in wanted if path not in watched]
+        if missing:
+            self.file_watcher.addPaths(missing)
+
+    def check_external_changes(self) -> None:
+        """Reload what another window or script changed; the ledger is read on a pool thread."""
+        self._watch_storage()
+        budget_state = file_state(BUDGET_CSV)
+        if budget_state != self._budget_state:
+            self.load_budgets()
+            self.update_summary()
+        ledger_state = file_state(LEDGER_CSV)
+        if ledger_state is not None and self._ledger_state is not None and (
+            (ledger_state.size, ledger_state.mtime_ns) == (self._ledger_state.size, self._ledger_state.mtime_ns)
+        ):
+            return
+        if ledger_state is None and self._ledger_state is None:
+            return
+        if self._external_reload_running:
+            self._external_change_timer.start()  # look again once the running reload is applied
+            return
+        self._external_reload_running = True
+        data_dir, ledger_path, since = DATA_DIR, LEDGER_CSV, self._ledger_state
+
+        def read() -> tuple:
+            stamp = file_stamp(data_dir)  # taken first: at worst older than the rows read, which only costs a reload
+            kind, rows, state = read_changes(ledger_path, since)
+            if kind == "replaced":
+                self.ledger_cache.get(data_dir)  # parse here so the window only swaps in the result
+            return kind, rows, state, stamp
+
+        self._run_in_background(read, lambda result: self._apply_external_changes(data_dir, since, result))
+
+    def _apply_external_changes(self, data_dir: Path, since: FileState | None, result: object) -> None:
+        self._external_reload_running = False
+        if data_dir != DATA_DIR or since is not self._ledger_state:
+            # Switched profile or reloaded after a local edit meanwhile; compare again from the new state.
+            self._external_change_timer.start()
+            return
+        if isinstance(result, Exception):
+            self.status_bar.showMessage(f"Could not reload the ledger: {result}", 6000)
+            return
+        kind, rows, state, stamp = result
+        if kind == "unchanged":
+            return
+        if kind == "replaced":
+            self.load_ledger(reuse_cached=True)
+            message = "Ledger changed in another window; reloaded."
+        else:
+            known = {tx["tx_id"] for tx in self.transactions if tx["tx_id"]}
+            rows = [tx for tx in rows if not tx["tx_id"] or tx["tx_id"] not in known]
+            self._ledger_state = state
+            if not rows:
+                return
+            first_row = len(self.transactions)
+            with self.ledger_cache.patch(DATA_DIR, self.ledger, stamp) as entry:
+                self.ledger.extend(rows)
+            self.transactions = self.ledger.transactions
+            self.categories = self.ledger.categories
+            self.balance = self.ledger.balance
+            self.ledger_query = self._query_for(entry)
+            self._update_search_index([("insert", first_row + offset, tx) for offset, tx in enumerate(rows)])
+            self._add_transaction_items(rows)
+            self._visible_rows = None
+            self.apply_transaction_filter()
+            self.refresh_period_controls()
+            self.update_use_savings_button()
+            message = f"{len(rows)} transaction(s) added in another window."
+        self.load_budgets()
+        self.refresh_category_options()
+        self.update_balance()
+        self.update_summary()
+        self.toast(message)
 
     def current_month_transactions(
         self,
@@ -1925,37 +3269,24 @@ class BudgetTracker(QMainWindow):
                 year = selected_year
             if month is None:
                 month = selected_month
-        matches: list[dict] = []
-        for tx in self.transactions:
-            try:
-                tx_date = date.fromisoformat(tx["date"])
-            except ValueError:
-                continue
-            if tx_date.year != year or tx_date.month != month:
-                continue
-            if type_filter and tx["type"] != type_filter:
-                continue
-            matches.append(tx)
-        return matches
+        return self.ledger.month_transactions(year, month, type_filter)
 
     def update_use_savings_button(self):
         if not hasattr(self, "use_savings_btn"):
             return
-        totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0.00"))
-        for tx in self.transactions:
-            if tx["type"] == "savings":
-                category = tx["category"] or "Savings"
-                totals[category] += tx["amount"]
-        has_available = any(amount > 0 for amount in totals.values())
+        has_available = any(amount > 0 for amount in self.ledger.savings_totals().values())
         self.use_savings_btn.setEnabled(has_available)
 
+    @traced("refresh.load_budgets")
     def load_budgets(self):
         self.budget_list.clear()
         self.budget_map = {}
+        self.ledger.budgets = self.budget_map
+        self._budget_state = file_state(BUDGET_CSV)
         if not BUDGET_CSV.exists():
             return
         try:
-            with BUDGET_CSV.open(newline="", encoding="utf-8") as f:
+            with span("budgets.read"), BUDGET_CSV.open(newline="", encoding="utf-8") as f:
                 reader = csv.DictReader(f)
                 for row in reader:
                     category = (row.get("category") or "").strip()
@@ -1969,7 +3300,14 @@ class BudgetTracker(QMainWindow):
         except FileNotFoundError:
             return
 
-        today_spend = {cat: self.category_monthly_expense_total(cat) for cat in self.budget_map}
+        with span("budgets.spend"):
+            today = date.today()
+            spent = self.ledger.aggregate_month(today.year, today.month)[1]
+            today_spend = {cat: spent.get(cat, Decimal("0.00")) for cat in self.budget_map}
+        with span("budgets.widgets"):
+            self._build_budget_items(today_spend)
+
+    def _build_budget_items(self, today_spend: dict[str, Decimal]) -> None:
         for category in sorted(self.budget_map.keys()):
             allowance = self.budget_map[category]
             spent = today_spend.get(category, Decimal("0.00"))
@@ -2034,19 +3372,31 @@ class BudgetTracker(QMainWindow):
             QMessageBox.warning(self, "Invalid amount", "Enter a valid budget amount, e.g. 250.00")
             return
         self.budget_map[category] = amount
-        self.save_budgets()
+        self.save_budgets({category: amount})
         self.load_budgets()
         self.update_summary()
         self.toast(f"{category} budget updated.")
 
-    def save_budgets(self):
-        ensure_writable(BUDGET_CSV)
-        with BUDGET_CSV.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(BUDGET_HEADER)
-            for category in sorted(self.budget_map.keys()):
-                writer.writerow([category, f"{self.budget_map[category]:.2f}"])
+    def save_budgets(self, changed: dict[str, Decimal]) -> bool:
+        """Write the ``changed`` budgets over the file as it is now, keeping other windows' edits to other categories."""
+        try:
+            with ledger_lock(BUDGET_CSV):
+                budgets = read_budgets(BUDGET_CSV)
+                budgets.update(changed)
+                ensure_writable(BUDGET_CSV)
+                with atomic_write(BUDGET_CSV) as f:
+                    writer = csv.writer(f)
+                    writer.writerow(BUDGET_HEADER)
+                    for category in sorted(budgets.keys()):
+                        writer.writerow([category, f"{budgets[category]:.2f}"])
+        except LockTimeout as exc:
+            self.show_lock_timeout(exc)
+            return False
         ensure_private_file(BUDGET_CSV)
+        return True
+
+    def show_lock_timeout(self, exc: LockTimeout) -> None:
+        QMessageBox.warning(self, "Ledger busy", f"{exc}\nNothing was saved; please try again.")
 
     def add_budget(self):
         category = self.budget_category_input.text().strip()
@@ -2066,7 +3416,7 @@ class BudgetTracker(QMainWindow):
             return
 
         self.budget_map[category] = amount
-        self.save_budgets()
+        self.save_budgets({category: amount})
         self.load_budgets()
         self.refresh_category_options()
         self.update_summary()
@@ -2074,6 +3424,7 @@ class BudgetTracker(QMainWindow):
         self.budget_amount_input.clear()
         QMessageBox.information(self, "Budget saved", f"{category} budget set to RM {amount:.2f}.")
 
+    @traced("refresh.category_options")
     def refresh_category_options(self):
         current_text = self.category_input.currentText().strip()
         categories = sorted(set(self.categories) | set(self.budget_map.keys()))
@@ -2086,6 +3437,7 @@ class BudgetTracker(QMainWindow):
         else:
             self.category_input.setCurrentIndex(-1)
         self.category_input.blockSignals(False)
+        self._refresh_filter_categories()
         self.refresh_currency_options()
 
     def refresh_currency_options(self):
@@ -2159,59 +3511,10 @@ class BudgetTracker(QMainWindow):
 
     @staticmethod
     def _previous_period(year: int, month: int) -> tuple[int, int]:
-        if month == 1:
-            return year - 1, 12
-        return year, month - 1
+        return previous_period(year, month)
 
     def _aggregate_month(self, year: int, month: int):
-        totals = {
-            "income": Decimal("0.00"),
-            "expense": Decimal("0.00"),
-            "savings": Decimal("0.00"),
-            "savings_balance": Decimal("0.00"),
-        }
-        category_totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0.00"))
-        daily_expense: defaultdict[int, Decimal] = defaultdict(lambda: Decimal("0.00"))
-        month_transactions: list[tuple[dict, date]] = []
-        month_end = date(year, month, calendar.monthrange(year, month)[1])
-
-        for tx in self.transactions:
-            try:
-                tx_date = date.fromisoformat(tx["date"])
-            except ValueError:
-                continue
-            if tx_date.year != year or tx_date.month != month:
-                continue
-            month_transactions.append((tx, tx_date))
-            amount = tx["amount"]
-            ttype = tx["type"]
-            category = tx["category"] or "Uncategorised"
-            if ttype == "income":
-                totals["income"] += amount
-            elif ttype == "savings":
-                # Savings should not appear in the expense category breakdown
-                # Track savings total only; exclude from category_totals and daily expense
-                totals["savings"] += amount
-            else:
-                totals["expense"] += amount
-                category_totals[category] += amount
-                daily_expense[tx_date.day] += amount
-
-        savings_balance = Decimal("0.00")
-        for tx in self.transactions:
-            if tx["type"] != "savings":
-                continue
-            try:
-                tx_date = date.fromisoformat(tx["date"])
-            except ValueError:
-                continue
-            if tx_date > month_end:
-                continue
-            savings_balance += tx["amount"]
-
-        totals["savings_balance"] = savings_balance
-
-        return totals, category_totals, month_transactions, daily_expense
+        return self.ledger.aggregate_month(year, month)
 
     def _update_kpi_cards(
         self,
@@ -2354,53 +3657,15 @@ class BudgetTracker(QMainWindow):
             running += daily_expense.get(day, Decimal("0.00"))
             cumulative.append(float(running))
             x_values.append(day)
-        fig = self.sparkline_fig
-        canvas = self.sparkline_canvas
-        if fig is None or canvas is None or not hasattr(fig, "add_subplot"):
-            return
-        fig.clear()
-        ax = fig.add_subplot(111)
-        self.sparkline_ax = ax
-        line_color = "#4CAF50" if self.theme_mode == "light" else "#81C784"
-        ax.plot(x_values, cumulative, color=line_color, linewidth=2.2)
-        ax.fill_between(x_values, cumulative, color=line_color, alpha=0.15)
-        ax.set_xlim(1, max(1, days_in_month))
-        max_value = max(cumulative) if cumulative else 0
-        ax.set_ylim(bottom=0, top=max(1, max_value * 1.1 if max_value else 1))
-        ax.set_xticks([])
-        ax.set_yticks([])
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-        ax.set_facecolor("none")
-        fig.patch.set_facecolor("none")
-        canvas.draw_idle()
+        chart = getattr(self, "sparkline_chart", None)
+        if chart is None:
+            return
+        chart.update(x_values, cumulative, self.theme_mode == "dark")
 
     def _update_alerts(self, category_totals: defaultdict, month_transactions: list[tuple[dict, date]]) -> None:
         if not hasattr(self, "alerts_frame") or self.alerts_frame is None or self.alerts_list is None:
             return
-        alerts: list[str] = []
-        for category, spent in category_totals.items():
-            budget = self.budget_map.get(category)
-            if budget and spent > budget:
-                over = spent - budget
-                alerts.append(f"{category} over budget by RM {over:.2f}")
-        today = date.today()
-        for tx, tx_date in month_transactions:
-            category = (tx["category"] or "").lower()
-            desc = (tx["desc"] or "").lower()
-            if "subscription" in category or "subscription" in desc or "due" in desc:
-                next_due = tx_date + timedelta(days=30)
-                days_until = (next_due - today).days
-                if 0 <= days_until <= 3:
-                    alerts.append(
-                        f"{tx['category'] or 'Subscription'} billing due in {days_until} day(s) ({tx['desc']})"
-                    )
-        unique_alerts = []
-        seen = set()
-        for alert in alerts:
-            if alert not in seen:
-                seen.add(alert)
-                unique_alerts.append(alert)
+        unique_alerts = month_alerts(category_totals, month_transactions, self.budget_map)
         self.alerts_list.clear()
         if unique_alerts:
             for alert in unique_alerts:
@@ -2412,29 +3677,15 @@ class BudgetTracker(QMainWindow):
     def _update_forecast(self, totals: dict, month_transactions: list[tuple[dict, date]], year: int, month: int) -> None:
         if not hasattr(self, "forecast_label"):
             return
-        today = date.today()
-        if year != today.year or month != today.month:
+        forecast = month_forecast(month_transactions, year, month)
+        if forecast is None:
             self.forecast_label.setText("Forecasts shown for the current month only.")
             return
-        days_in_month = Decimal(calendar.monthrange(year, month)[1])
-        current_transactions = [(tx, tx_date) for tx, tx_date in month_transactions if tx_date <= today]
-        if not current_transactions:
-            self.forecast_label.setText("Forecast month-end: RM 0.00 | Safe-to-spend today: RM 0.00")
-            return
-        days_elapsed = Decimal(today.day)
-        days_remaining = max(Decimal("0.00"), days_in_month - days_elapsed)
-        expense = sum((tx["amount"] for tx, tx_date in current_transactions if tx["type"] == "expense"), Decimal("0.00"))
-        income = sum((tx["amount"] for tx, tx_date in current_transactions if tx["type"] == "income"), Decimal("0.00"))
-        daily_burn = expense / days_elapsed if days_elapsed > 0 else Decimal("0.00")
-        projected_spend = expense + (daily_burn * days_remaining)
-        net_forecast = income - projected_spend
-        if days_remaining > 0:
-            safe_to_spend = (income - expense) / days_remaining
-        else:
-            safe_to_spend = income - expense
         self.forecast_label.setText(
-            f"Forecast month-end: RM {net_forecast:.2f} | Safe-to-spend today: RM {safe_to_spend:.2f}"
+            f"Forecast month-end: RM {forecast['net_forecast']:.2f} | "
+            f"Safe-to-spend today: RM {forecast['safe_to_spend']:.2f}"
         )
+
     def update_rates_info_label(self):
         if not hasattr(self, "currency_info_label"):
             return
@@ -2573,6 +3824,7 @@ class BudgetTracker(QMainWindow):
             )
         return True
 
+    @traced("refresh.update_summary")
     def update_summary(self):
         if not hasattr(self, "summary_overview_label"):
             return
@@ -2617,6 +3869,7 @@ class BudgetTracker(QMainWindow):
         self._update_alerts(category_totals, month_transactions)
         self._update_sparkline(daily_expense, year, month)
         self._update_forecast(totals, month_transactions, year, month)
+        self.refresh_chart_windows()
 
     def category_monthly_total(self, category: str) -> Decimal:
         today = date.today()
@@ -2718,43 +3971,37 @@ class BudgetTracker(QMainWindow):
             QMessageBox.warning(self, "Invalid amount", "Enter a valid amount, e.g. 42.00")
             return
 
-        updated = self.update_transaction_record(
-            tx["tx_id"],
-            new_type=type_combo.currentText(),
-            new_category=category_edit.text().strip(),
-            new_amount=amount_val,
-            new_desc=desc_edit.text().strip(),
-        )
-        if not updated:
+        if not tx["tx_id"]:
             QMessageBox.critical(self, "Update failed", "Could not update the transaction in the ledger file.")
             return
-        self.load_ledger()
-        self.load_budgets()
-        self.refresh_category_options()
-        self.update_balance()
-        self.update_summary()
-        self.transaction_list.setCurrentRow(row)
+        new = normalize_transaction(
+            {
+                "tx_id": tx["tx_id"],
+                "date": tx["date"],
+                "type": type_combo.currentText(),
+                "category": category_edit.text().strip(),
+                "amount_rm": f"{amount_val:.2f}",
+                "desc": desc_edit.text().strip(),
+            }
+        )
+        command = self.run_command(lambda: Command.edit("edit", tx, new), select=True)
+        if command is None:
+            return
+        self.command_log.record(command)
         self.toast("Transaction updated.")
 
+    @traced("action.duplicate_transaction")
     def duplicate_transaction(self, row: int):
         if row < 0 or row >= len(self.transactions):
             return
         tx = self.transactions[row]
-        txid = next_tx_id()
-        ensure_writable(LEDGER_CSV)
-        with LEDGER_CSV.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([txid, tx["date"], tx["type"], tx["category"], f"{tx['amount']:.2f}", tx["desc"]])
-        ensure_private_file(LEDGER_CSV)
-        self.undo_stack.append(("transaction", txid))
-        self.undo_stack = self.undo_stack[-20:]
-        self.load_ledger()
-        self.load_budgets()
-        self.refresh_category_options()
-        self.update_balance()
-        self.update_summary()
+        command = self.run_command(lambda: Command.addition("duplicate", {**tx, "tx_id": self._next_tx_id()}))
+        if command is None:
+            return
+        self.command_log.record(command)
         self.toast("Transaction duplicated.")
 
+    @traced("action.delete_transaction")
     def delete_transaction(self, row: int):
         if row < 0 or row >= len(self.transactions):
             return
@@ -2762,25 +4009,24 @@ class BudgetTracker(QMainWindow):
         confirm = QMessageBox.question(
             self,
             "Delete transaction",
-            f"Remove transaction {tx['tx_id']}?\nThis cannot be undone.",
+            f"Remove transaction {tx['tx_id']}?",
             QMessageBox.Yes | QMessageBox.No,
         )
         if confirm != QMessageBox.Yes:
             return
-        if not self._remove_transaction_by_id(tx["tx_id"]):
+        if not tx["tx_id"]:
             QMessageBox.critical(self, "Delete failed", "Unable to remove the transaction.")
             return
-        self.load_ledger()
-        self.load_budgets()
-        self.refresh_category_options()
-        self.update_balance()
-        self.update_summary()
+        command = self.run_command(lambda: Command.deletion("delete", self.ledger, self.ledger.index_of(tx["tx_id"])))
+        if command is None:
+            return
+        self.command_log.record(command)
         if self.transaction_list.count() > 0:
             next_row = min(row, self.transaction_list.count() - 1)
             self.transaction_list.setCurrentRow(next_row)
         else:
             self.update_reclass_ui(-1)
-        self.toast("Transaction deleted.")
+        self.toast("Transaction deleted. Ctrl+Z to undo.")
 
     def delete_selected_transaction(self):
         if not hasattr(self, "transaction_list"):
@@ -2800,6 +4046,7 @@ class BudgetTracker(QMainWindow):
             return
         self.edit_transaction(row)
 
+    @traced("action.use_savings")
     def use_savings_funds(self):
         if not self.transactions:
             QMessageBox.information(self, "No savings available", "Record savings deposits before using them.")
@@ -2897,107 +4144,62 @@ class BudgetTracker(QMainWindow):
         expense_category = expense_combo.currentText().strip() or "General"
         description = desc_edit.text().strip() or f"Used savings for {expense_category}"
 
-        first_tx_id = next_tx_id()
-        try:
-            base_number = int(first_tx_id[2:])
-        except ValueError:
-            base_number = 0
-        second_tx_id = f"TX{base_number + 1:03d}"
         today_str = date.today().isoformat()
+        def build() -> Command:
+            first_tx_id = self._next_tx_id()
+            try:
+                base_number = int(first_tx_id[2:])
+            except ValueError:
+                base_number = 0
+            second_tx_id = f"TX{base_number + 1:03d}"
+            withdrawal = {
+                "tx_id": first_tx_id,
+                "date": today_str,
+                "type": "savings",
+                "category": savings_category,
+                "amount_rm": f"{-amount:.2f}",
+                "desc": f"Withdrawal: {description}",
+            }
+            expense = {
+                "tx_id": second_tx_id,
+                "date": today_str,
+                "type": "expense",
+                "category": expense_category,
+                "amount_rm": f"{amount:.2f}",
+                "desc": description,
+            }
+            return Command.addition("savings withdrawal", normalize_transaction(withdrawal), normalize_transaction(expense))
 
-        ensure_writable(LEDGER_CSV)
-        with LEDGER_CSV.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [first_tx_id, today_str, "savings", savings_category, f"{-amount:.2f}", f"Withdrawal: {description}"]
-            )
-            writer.writerow(
-                [second_tx_id, today_str, "expense", expense_category, f"{amount:.2f}", description]
-            )
-        ensure_private_file(LEDGER_CSV)
-
-        self.undo_stack.append(("transaction", second_tx_id))
-        self.undo_stack.append(("transaction", first_tx_id))
-        self.undo_stack = self.undo_stack[-20:]
-
-        self.load_ledger()
-        self.load_budgets()
-        self.refresh_category_options()
-        self.update_balance()
-        self.update_summary()
+        command = self.run_command(build)
+        if command is None:
+            return
+        self.command_log.record(command)
         self.toast("Savings applied to expense.")
 
-    def _remove_transaction_by_id(self, tx_id: str) -> bool:
-        if not tx_id:
-            return False
-        try:
-            with LEDGER_CSV.open(newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                header = reader.fieldnames or LEDGER_HEADER
-        except FileNotFoundError:
-            return False
-        remaining = [row for row in rows if row.get("tx_id") != tx_id]
-        if len(remaining) == len(rows):
-            return False
-        ensure_writable(LEDGER_CSV)
-        with LEDGER_CSV.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=header)
-            writer.writeheader()
-            for row in remaining:
-                writer.writerow({field: row.get(field, "") for field in header})
-        ensure_private_file(LEDGER_CSV)
-        return True
+    def _summary_render_key(self, kind: str, year: int, month: int, size: tuple[int, int], theme: str | None = None) -> str:
+        totals, category_totals, month_transactions, _ = self._aggregate_month(year, month)
+        compare_enabled = hasattr(self, "compare_checkbox") and self.compare_checkbox.isChecked()
+        payload = {
+            "totals": totals,
+            "categories": dict(category_totals),
+            "budgets": self.budget_map,
+            "rows": [
+                (tx["tx_id"], tx["date"], tx["type"], tx["category"], tx["amount"], tx["desc"])
+                for tx, _tx_date in month_transactions
+            ],
+            "compare": compare_enabled,
+            "previous": self._aggregate_month(*self._previous_period(year, month))[0] if compare_enabled else None,
+            # Alerts and forecasts are relative to today.
+            "today": date.today().isoformat(),
+        }
+        return cache_key(kind, f"{year}-{month:02d}", theme or self.theme_mode, size, 1.0, payload)
 
-    def update_transaction_record(
-        self,
-        tx_id: str,
-        new_type: str | None = None,
-        new_category: str | None = None,
-        new_amount: Decimal | None = None,
-        new_desc: str | None = None,
-    ) -> bool:
-        if not tx_id:
-            return False
+    def _write_export_bytes(self, file_path: str, data: bytes) -> bool:
         try:
-            with LEDGER_CSV.open(newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                header = reader.fieldnames or []
-        except FileNotFoundError:
+            with open(file_path, "wb") as f:
+                f.write(data)
+        except OSError:
             return False
-
-        updated = False
-        for row in rows:
-            if row.get("tx_id") == tx_id:
-                if new_type is not None:
-                    row["type"] = new_type
-                if new_category is not None:
-                    row["category"] = new_category
-                if new_amount is not None:
-                    row["amount_rm"] = f"{Decimal(new_amount):.2f}"
-                if new_desc is not None:
-                    row["desc"] = new_desc
-                updated = True
-                break
-        if not updated:
-            return False
-
-        ensure_writable(LEDGER_CSV)
-        fieldnames = []
-        for key in header:
-            if key and key not in fieldnames:
-                fieldnames.append(key)
-        for key in LEDGER_HEADER:
-            if key not in fieldnames:
-                fieldnames.append(key)
-
-        with LEDGER_CSV.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in rows:
-                writer.writerow({field: row.get(field, "") for field in fieldnames})
-        ensure_private_file(LEDGER_CSV)
         return True
 
     def export_summary_as_png(self):
@@ -3014,8 +4216,20 @@ class BudgetTracker(QMainWindow):
         )
         if not file_path:
             return
-        pixmap = self.summary_card.grab()
-        if not pixmap.save(file_path, "PNG"):
+        card_size = self.summary_card.size()
+        key = self._summary_render_key("summary_png", year, month, (card_size.width(), card_size.height()))
+        data = self.render_cache.get(key)
+        if data is None:
+            encoded = QByteArray()
+            buffer = QBuffer(encoded)
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            if not self.summary_card.grab().save(buffer, "PNG"):
+                QMessageBox.critical(self, "Export failed", "Unable to save the summary as PNG.")
+                return
+            buffer.close()
+            data = bytes(encoded)
+            self.render_cache.put(key, data)
+        if not self._write_export_bytes(file_path, data):
             QMessageBox.critical(self, "Export failed", "Unable to save the summary as PNG.")
             return
         self.toast(f"Summary image exported to {file_path}")
@@ -3034,24 +4248,63 @@ class BudgetTracker(QMainWindow):
         )
         if not file_path:
             return
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-        printer.setOutputFileName(file_path)
-        painter = QPainter(printer)
-        pixmap = self.summary_card.grab()
-        rect = painter.viewport()
-        size = pixmap.size()
-        size.scale(rect.size(), Qt.AspectRatioMode.KeepAspectRatio)
-        painter.setViewport(rect.x(), rect.y(), size.width(), size.height())
-        painter.setWindow(pixmap.rect())
-        painter.drawPixmap(0, 0, pixmap)
-        painter.end()
+        compare_enabled = hasattr(self, "compare_checkbox") and self.compare_checkbox.isChecked()
+        # Vector reports ignore the window size and theme; key them on the page format instead.
+        key = self._summary_render_key("summary_pdf", year, month, (595, 842), theme="print")
+        data = self.render_cache.get(key)
+        if data is None:
+            summary = self.ledger.summary(year, month, compare=compare_enabled)
+            try:
+                render_report_pdf(Path(file_path), [summary])
+                data = Path(file_path).read_bytes()
+            except Exception as exc:
+                QMessageBox.critical(self, "Export failed", f"Unable to save the summary as PDF.\n{exc}")
+                return
+            self.render_cache.put(key, data)
+        elif not self._write_export_bytes(file_path, data):
+            QMessageBox.critical(self, "Export failed", "Unable to save the summary as PDF.")
+            return
         self.toast(f"Summary PDF exported to {file_path}")
 
+    def show_batch_export(self):
+        if self.batch_export_dialog is None:
+            self.batch_export_dialog = BatchExportDialog(self)
+        self.batch_export_dialog.show()
+        self.batch_export_dialog.raise_()
+        self.batch_export_dialog.activateWindow()
+
+    def show_diagnostics(self):
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+        self.diagnostics_dialog.activateWindow()
+
+    def show_memory_diagnostics(self):
+        if self.memory_dialog is None:
+            self.memory_dialog = MemoryDialog(self)
+        self.memory_dialog.show()
+        self.memory_dialog.raise_()
+        self.memory_dialog.activateWindow()
+
+    def show_render_cache_stats(self):
+        stats = self.render_cache.stats()
+        QMessageBox.information(
+            self,
+            "Render Cache Statistics",
+            (
+                f"Hit rate: {stats['hit_rate'] * 100:.1f}%\n"
+                f"Memory hits: {stats['memory_hits']} | Disk hits: {stats['disk_hits']} | Misses: {stats['misses']}\n"
+                f"Entries in memory: {stats['memory_entries']} ({stats['memory_bytes'] / 1024:.0f} KiB)\n"
+                f"On disk: {stats['disk_bytes'] / 1024:.0f} KiB | Evictions: {stats['evictions']}"
+            ),
+        )
+
     def export_monthly_data(self):
         year, month = self._selected_period()
-        monthly = self.current_month_transactions(year=year, month=month)
-        if not monthly:
+        start = date(year, month, 1)
+        end = date(year, month, calendar.monthrange(year, month)[1])
+        if next(filter_transactions(self.transactions, start, end), None) is None:
             QMessageBox.information(self, "Nothing to export", "No transactions recorded for the selected month.")
             return
         default_name = f"finfix_transactions_{year}_{month:02d}.csv"
@@ -3065,39 +4318,366 @@ class BudgetTracker(QMainWindow):
         if not file_path:
             return
         try:
-            with open(file_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["date", "type", "category", "amount_rm", "description", "tx_id"])
-                for tx in monthly:
-                    writer.writerow([
-                        tx["date"],
-                        tx["type"],
-                        tx["category"],
-                        f"{tx['amount']:.2f}",
-                        tx["desc"],
-                        tx["tx_id"],
-                    ])
+            export_csv(self.transactions, Path(file_path), start=start, end=end)
         except Exception as exc:
             QMessageBox.critical(self, "Export failed", f"Could not export data:\n{exc}")
             return
         self.toast(f"Monthly data exported to {file_path}")
 
-    def show_savings_visual(self):
+    def _ask_export_filters(self, title: str) -> dict | None:
+        dialog = QDialog(self)
+        dialog.setWindowTitle(title)
+        layout = QVBoxLayout(dialog)
+
+        form = QFormLayout()
+        year, _month = self._selected_period()
+        from_edit = QDateEdit(QDate(year, 1, 1))
+        to_edit = QDateEdit(QDate.currentDate())
+        for edit in (from_edit, to_edit):
+            edit.setDisplayFormat("yyyy-MM-dd")
+            edit.setCalendarPopup(True)
+        type_combo = QComboBox()
+        type_combo.addItem("All types", "")
+        for ttype in TRANSACTION_TYPES:
+            type_combo.addItem(ttype.capitalize(), ttype)
+        category_combo = QComboBox()
+        category_combo.setEditable(True)
+        category_combo.addItem("")
+        category_combo.addItems(sorted(set(self.categories) | set(self.budget_map.keys()), key=str.lower))
+        line_edit = category_combo.lineEdit()
+        if line_edit is not None:
+            line_edit.setPlaceholderText("All categories")
+        form.addRow("From", from_edit)
+        form.addRow("To", to_edit)
+        form.addRow("Type", type_combo)
+        form.addRow("Category", category_combo)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        if dialog.exec_() != QDialog.Accepted:
+            return None
+        start = from_edit.date().toPyDate()
+        end = to_edit.date().toPyDate()
+        if end < start:
+            QMessageBox.warning(self, "Invalid range", "The end date is before the start date.")
+            return None
+        ttype = type_combo.currentData()
+        category = category_combo.currentText().strip()
+        return {
+            "start": start,
+            "end": end,
+            "types": [ttype] if ttype else None,
+            "categories": [category] if category else None,
+        }
+
+    def export_date_range_csv(self):
+        filters = self._ask_export_filters("Export Date Range")
+        if filters is None:
+            return
+        suggested_path = Path.home() / f"finfix_transactions_{filters['start'].isoformat()}_{filters['end'].isoformat()}.csv"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Date Range",
+            str(suggested_path),
+            "CSV Files (*.csv)",
+        )
+        if not file_path:
+            return
+        # Stream straight from the ledger file so large ranges never sit in memory or block the UI.
+        self._run_in_background(
+            lambda: export_ledger_csv(LEDGER_CSV, Path(file_path), **filters),
+            lambda result: self._on_range_export_finished(file_path, result),
+        )
+        self.toast("Exporting transactions...")
+
+    def export_columnar_data(self):
+        formats = columnar.available_formats()
+        if not formats:
+            QMessageBox.information(
+                self,
+                "pyarrow not installed",
+                "Arrow, Feather and Parquet exports need the optional pyarrow package.\n\npip install pyarrow",
+            )
+            return
+        filters = self._ask_export_filters("Export for Analysis")
+        if filters is None:
+            return
+        labels = {"parquet": "Parquet Files (*.parquet)", "feather": "Feather Files (*.feather)", "arrow": "Arrow IPC Files (*.arrow)"}
+        ordered = [fmt for fmt in ("parquet", "feather", "arrow") if fmt in formats]
+        suggested_path = Path.home() / f"finfix_transactions_{filters['start'].isoformat()}_{filters['end'].isoformat()}{columnar.FORMAT_SUFFIXES[ordered[0]]}"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export for Analysis",
+            str(suggested_path),
+            ";;".join(labels[fmt] for fmt in ordered),
+        )
+        if not file_path:
+            return
+        suffix = Path(file_path).suffix.lower()
+        fmt = next((name for name in ordered if columnar.FORMAT_SUFFIXES[name] == suffix), None)
+        if fmt is None:
+            fmt = next((name for name in ordered if labels[name] == selected_filter), ordered[0])
+        # Snapshot the already-normalized records; reloads replace the list rather than mutating it.
+        transactions = list(self.transactions)
+        self._run_in_background(
+            lambda: columnar.export_columnar(transactions, Path(file_path), fmt, **filters),
+            lambda result: self._on_range_export_finished(file_path, result),
+        )
+        self.toast(f"Exporting transactions as {fmt.capitalize()}...")
+
+    def import_bank_statement(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Bank CSV",
+            str(Path.home()),
+            "CSV Files (*.csv);;All Files (*)",
+        )
+        if not file_path:
+            return
+        try:
+            header = read_statement_header(Path(file_path))
+        except (OSError, UnicodeDecodeError) as exc:
+            QMessageBox.critical(self, "Import failed", f"Could not read the statement:\n{exc}")
+            return
+        if not header:
+            QMessageBox.warning(self, "Import failed", "The statement file is empty.")
+            return
+        mapping = self._ask_import_mapping(header)
+        if mapping is None:
+            return
+        try:
+            save_import_mapping(IMPORT_MAPPING_JSON, mapping)
+            ensure_private_file(IMPORT_MAPPING_JSON)
+        except OSError:
+            pass
+        existing = list(self.transactions)
+        ensure_writable(LEDGER_CSV)
+        self._run_in_background(
+            lambda: import_statement(Path(file_path), mapping, LEDGER_CSV, existing=existing),
+            self._on_import_finished,
+        )
+        self.toast("Importing statement...")
+
+    def _ask_import_mapping(self, header: list[str]) -> StatementMapping | None:
+        saved = load_import_mapping(IMPORT_MAPPING_JSON)
+        if saved is not None and not all(
+            column in header for column in (saved.date, saved.description, saved.amount, saved.debit, saved.credit) if column
+        ):
+            saved = None
+        initial = saved or guess_statement_mapping(header)
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Map Statement Columns")
+        layout = QVBoxLayout(dialog)
+        intro = QLabel("Choose which statement columns hold each field. Use either a signed amount or debit/credit columns.")
+        intro.setWordWrap(True)
+        layout.addWidget(intro)
+
+        form = QFormLayout()
+        combos: dict[str, QComboBox] = {}
+        for field_name, label in (
+            ("date", "Date"),
+            ("description", "Description"),
+            ("amount", "Amount (signed)"),
+            ("debit", "Debit / money out"),
+            ("credit", "Credit / money in"),
+            ("type", "Debit/credit marker"),
+            ("category", "Category"),
+        ):
+            combo = QComboBox()
+            combo.addItem("(none)", "")
+            for column in header:
+                combo.addItem(column, column)
+            current = getattr(initial, field_name) if initial is not None else None
+            if current:
+                combo.setCurrentIndex(max(0, combo.findData(current)))
+            combos[field_name] = combo
+            form.addRow(label, combo)
+        date_format_combo = QComboBox()
+        date_format_combo.setEditable(True)
+        date_format_combo.addItem("Auto detect", "")
+        for fmt in STATEMENT_DATE_FORMATS:
+            date_format_combo.addItem(fmt, fmt)
+        if initial is not None and initial.date_format:
+            date_format_combo.setEditText(initial.date_format)
+        default_category_edit = QLineEdit(initial.default_category if initial is not None else "General")
+        form.addRow("Date format", date_format_combo)
+        form.addRow("Default category", default_category_edit)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        if dialog.exec_() != QDialog.Accepted:
+            return None
+        values = {name: (combo.currentData() or None) for name, combo in combos.items()}
+        if not values["date"] or not values["description"]:
+            QMessageBox.warning(self, "Incomplete mapping", "Choose the date and description columns.")
+            return None
+        date_format = date_format_combo.currentText().strip()
+        mapping = StatementMapping(
+            date=values["date"],
+            description=values["description"],
+            amount=values["amount"],
+            debit=values["debit"],
+            credit=values["credit"],
+            type=values["type"],
+            category=values["category"],
+            date_format=None if date_format in ("", "Auto detect") else date_format,
+            default_category=default_category_edit.text().strip() or "General",
+        )
+        try:
+            mapping.validate(header)
+        except ValueError as exc:
+            QMessageBox.warning(self, "Incomplete mapping", str(exc))
+            return None
+        return mapping
+
+    def _on_import_finished(self, result: object) -> None:
+        if isinstance(result, Exception):
+            QMessageBox.critical(self, "Import failed", f"Could not import the statement:\n{result}")
+            return
+        ensure_private_file(LEDGER_CSV)
+        if result.transactions:
+            self.load_ledger()
+            self.load_budgets()
+            self.refresh_category_options()
+            self.update_balance()
+            self.update_summary()
+        lines = [
+            f"Imported {len(result.transactions)} of {result.rows_read} row(s) in {result.elapsed:.2f} s.",
+            f"Skipped {result.duplicates} duplicate(s) already in the ledger.",
+        ]
+        if result.errors:
+            lines.append(f"{len(result.errors)} row(s) could not be read:")
+            lines.extend(f"  line {line}: {message}" for line, message in result.errors[:8])
+            if len(result.errors) > 8:
+                lines.append(f"  ...and {len(result.errors) - 8} more")
+        QMessageBox.information(self, "Import complete", "\n".join(lines))
+
+    def _on_range_export_finished(self, file_path: str, result: object) -> None:
+        if isinstance(result, Exception):
+            QMessageBox.critical(self, "Export failed", f"Could not export data:\n{result}")
+            return
+        self.toast(f"Exported {result} transaction(s) to {file_path}")
+
+    def _run_in_background(self, fn, on_finished) -> None:
+        """Run ``fn`` on the global thread pool and hand its result (or exception) to ``on_finished``."""
+        task = _FunctionTask(fn, self)
+        self._background_tasks.add(task)
+
+        def finished(result: object) -> None:
+            self._background_tasks.discard(task)
+            task.signals.deleteLater()  # parented to the window, so it would otherwise live as long as the window
+            on_finished(result)
+
+        task.signals.finished.connect(finished)
+        QThreadPool.globalInstance().start(task)
+
+    def _savings_chart_data(self, year: int, month: int) -> tuple[list[str], list[float], bool]:
+        period_end = date(year, month, calendar.monthrange(year, month)[1])
+        totals = self.ledger.savings_totals(period_end)
+        positive_totals = {cat: amt for cat, amt in totals.items() if amt > Decimal("0.00")}
+        categories = sorted(positive_totals.keys(), key=str.lower)
+        values = [float(positive_totals[cat]) for cat in categories]
+        return categories, values, bool(totals)
+
+    def _expense_chart_data(self, year: int, month: int) -> tuple[list[str], list[float]]:
+        totals: defaultdict[str, Decimal] = defaultdict(lambda: Decimal("0.00"))
+        for tx in self.current_month_transactions("expense", year=year, month=month):
+            totals[tx["category"] or "General"] += tx["amount"]
+        categories = [cat for cat, total in totals.items() if total > 0]
+        values = [float(totals[cat]) for cat in categories]
+        return categories, values
+
+    def _chart_series(self, key: str) -> tuple[list[str], list[float], str]:
         year, month = self._selected_period()
-        last_day = calendar.monthrange(year, month)[1]
-        period_end = date(year, month, last_day)
-        savings_entries: list[dict] = []
-        for tx in self.transactions:
-            if tx.get("type") != "savings":
-                continue
-            try:
-                tx_date = date.fromisoformat(tx["date"])
-            except ValueError:
-                continue
-            if tx_date > period_end:
+        period_label = date(year, month, 1).strftime("%B %Y")
+        if key == "savings_chart":
+            categories, values, _ = self._savings_chart_data(year, month)
+        else:
+            categories, values = self._expense_chart_data(year, month)
+        return categories, values, period_label
+
+    def _refresh_chart(self, key: str, window: ChartWindow) -> None:
+        """Push the selected period's data into the window's chart.
+
+        Interactive windows update their live painter in place; image windows
+        get a fresh off-thread render, cancelling any render still in flight.
+        """
+        if not MATPLOTLIB_AVAILABLE or charts is None:
+            return
+        categories, values, period_label = self._chart_series(key)
+        title = "Monthly Savings" if key == "savings_chart" else "Monthly Expenses"
+        window.setWindowTitle(f"{title} ({period_label})")
+        dark_mode = self.theme_mode == "dark"
+        if window.is_interactive or self.chart_renderer is None or chart_render is None:
+            with span(f"chart.interactive.{key}"):
+                chart = window.ensure_chart(charts.CHART_PAINTERS[key])
+                chart.update(categories, values, period_label, dark_mode)
+                window.redraw()
+            return
+        width, height = window.render_size()
+        request = chart_render.ChartRequest(
+            kind=key,
+            categories=tuple(categories),
+            values=tuple(values),
+            period_label=period_label,
+            dark_mode=dark_mode,
+            width_px=width,
+            height_px=height,
+        )
+        window.show_pending()
+        self.chart_renderer.submit(key, request)
+
+    def _promote_chart(self, key: str) -> None:
+        window = self.chart_windows.get(key)
+        if window is None or window.is_interactive or charts is None:
+            return
+        if self.chart_renderer is not None:
+            self.chart_renderer.cancel(key)
+        window.ensure_chart(charts.CHART_PAINTERS[key])
+        self._refresh_chart(key, window)
+
+    def _rerender_chart(self, key: str) -> None:
+        window = self.chart_windows.get(key)
+        if window is not None and window.isVisible():
+            self._refresh_chart(key, window)
+
+    def _on_chart_rendered(self, key: str, rendered) -> None:
+        window = self.chart_windows.get(key)
+        if window is None or _is_deleted(window):
+            return
+        window.set_image(rendered)
+
+    def _on_chart_render_failed(self, key: str, message: str) -> None:
+        window = self.chart_windows.get(key)
+        if window is not None and not _is_deleted(window):
+            window.set_render_error(message)
+        self.toast(f"Chart rendering failed: {message}")
+
+    @traced("refresh.chart_windows")
+    def refresh_chart_windows(self) -> None:
+        for key, window in list(self.chart_windows.items()):
+            if window is None or _is_deleted(window) or not window.isVisible():
                 continue
-            savings_entries.append(tx)
-        if not savings_entries:
+            self._refresh_chart(key, window)
+
+    def _present_chart_window(self, window: ChartWindow) -> None:
+        window.show()
+        window.raise_()
+        window.activateWindow()
+
+    def show_savings_visual(self):
+        year, month = self._selected_period()
+        _, values, has_entries = self._savings_chart_data(year, month)
+        if not has_entries:
             QMessageBox.information(
                 self,
                 "No savings recorded",
@@ -3118,130 +4698,15 @@ class BudgetTracker(QMainWindow):
                 "matplotlib could not be loaded in this environment.",
             )
             return
-        totals = defaultdict(lambda: Decimal("0.00"))
-        for tx in savings_entries:
-            category = tx["category"] or "Savings"
-            totals[category] += tx["amount"]
-        positive_totals = {cat: amt for cat, amt in totals.items() if amt > Decimal("0.00")}
-        if not positive_totals:
+        if not values:
             QMessageBox.information(
                 self,
                 "No savings balance",
                 "All savings have been used for the selected period.",
             )
             return
-        categories = sorted(positive_totals.keys(), key=str.lower)
-        values = [float(positive_totals[cat]) for cat in categories]
 
         period_label = date(year, month, 1).strftime("%B %Y")
-        dark_mode = getattr(self, "theme_mode", "dark") == "dark"
-        text_color = "#E0E0E0" if dark_mode else "#212121"
-        background_color = "#121212" if dark_mode else "#FFFFFF"
-        axes_color = "#1C1C21" if dark_mode else "#FFFFFF"
-
-        fig = Figure(figsize=(6, 4))
-        fig.patch.set_facecolor(background_color)
-        ax = fig.add_subplot(111)
-        ax.set_facecolor(axes_color)
-
-        max_value = max(values) if values else 0.0
-        if max_value <= 0:
-            QMessageBox.information(
-                self,
-                "No savings balance",
-                "All savings have been used for the selected period.",
-            )
-            return
-
-        try:
-            from matplotlib.patches import Rectangle
-        except Exception:
-            QMessageBox.warning(
-                self,
-                "Visualization unavailable",
-                "matplotlib is required to render charts.\nInstall it with: pip install matplotlib",
-            )
-            return
-
-        outline_color = "#29B6F6" if dark_mode else "#1565C0"
-        battery_height = 0.6
-        tip_width = max(max_value * 0.04, 0.25)
-        y_positions = list(range(len(categories)))
-
-        def level_color(value: float) -> str:
-            if max_value <= 0:
-                return "#90A4AE"
-            ratio = value / max_value
-            if ratio >= 0.75:
-                return "#4CAF50" if dark_mode else "#2E7D32"
-            if ratio >= 0.4:
-                return "#FFD740" if dark_mode else "#F9A825"
-            return "#FF7043" if dark_mode else "#E64A19"
-
-        ax.set_title(f"Monthly Savings ({period_label})", color=text_color)
-        ax.set_yticks(y_positions)
-        ax.set_yticklabels(categories, color=text_color, fontsize=9)
-        ax.set_xticks([])
-        ax.set_xlim(0, max_value + tip_width + max_value * 0.15)
-        ax.set_ylim(-0.75, len(categories) - 0.25)
-        ax.tick_params(axis="y", colors=text_color, length=0)
-        ax.tick_params(axis="x", length=0)
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-
-        # Draw each savings category as a battery-style cell.
-        for idx, value in enumerate(values):
-            y_center = y_positions[idx]
-            bottom = y_center - battery_height / 2
-            outline = Rectangle(
-                (0, bottom),
-                max_value,
-                battery_height,
-                linewidth=2,
-                edgecolor=outline_color,
-                facecolor="none",
-            )
-            ax.add_patch(outline)
-            tip = Rectangle(
-                (max_value, y_center - battery_height / 4),
-                tip_width,
-                battery_height / 2,
-                linewidth=0,
-                facecolor=outline_color,
-            )
-            ax.add_patch(tip)
-            fill_height = battery_height - 0.12
-            fill_bottom = bottom + (battery_height - fill_height) / 2
-            fill = Rectangle(
-                (0, fill_bottom),
-                value,
-                fill_height,
-                linewidth=0,
-                facecolor=level_color(value),
-            )
-            ax.add_patch(fill)
-            label_inside = value > max_value * 0.35
-            if label_inside:
-                label_x = value - max_value * 0.02
-                label_align = "right"
-            else:
-                label_x = value + max_value * 0.02
-                label_align = "left"
-            label_color = text_color
-            if label_inside and not dark_mode:
-                label_color = "#FFFFFF"
-            ax.text(
-                label_x,
-                y_center,
-                f"RM {value:.2f}",
-                va="center",
-                ha=label_align,
-                color=label_color,
-                fontsize=9,
-            )
-
-        fig.tight_layout()
-
         help_text = (
             "Each battery shows cumulative savings per category up to the selected month. "
             "The fill level reflects deposits minus any withdrawals recorded for that category."
@@ -3251,12 +4716,8 @@ class BudgetTracker(QMainWindow):
             f"Monthly Savings ({period_label})",
             help_text,
         )
-        canvas = FigureCanvasQTAgg(fig)
-        window.set_canvas(canvas)
-        canvas.draw()
-        window.show()
-        window.raise_()
-        window.activateWindow()
+        self._present_chart_window(window)
+        self._refresh_chart("savings_chart", window)
 
     def show_expense_pie_chart(self):
         monthly_expenses = self.current_month_transactions("expense")
@@ -3270,65 +4731,13 @@ class BudgetTracker(QMainWindow):
                 "matplotlib is required to render charts.\nInstall it by typing this into the terminal: pip install matplotlib",
             )
             return
-        totals = defaultdict(lambda: Decimal("0.00"))
-        for tx in monthly_expenses:
-            category = tx["category"] or "General"
-            totals[category] += tx["amount"]
-        categories = [cat for cat, total in totals.items() if total > 0]
-        if not categories:
-            QMessageBox.information(self, "No expenses recorded", "No positive expenses available for this month.")
-            return
-        values = [float(totals[cat]) for cat in categories]
-        total_sum = sum(values)
-        if total_sum <= 0:
+        year, month = self._selected_period()
+        _, values = self._expense_chart_data(year, month)
+        if not values or sum(values) <= 0:
             QMessageBox.information(self, "No expenses recorded", "No positive expenses available for this month.")
             return
 
-        year, month = self._selected_period()
         period_label = date(year, month, 1).strftime("%B %Y")
-        dark_mode = getattr(self, "theme_mode", "dark") == "dark"
-        text_color = "#E0E0E0" if dark_mode else "#212121"
-        background_color = "#121212" if dark_mode else "#FFFFFF"
-        panel_color = "#1C1C21" if dark_mode else "#FFFFFF"
-        legend_face = "#1F1F26" if dark_mode else "#F2F2F2"
-        legend_border = "#2E2E38" if dark_mode else "#D0D0D0"
-
-        fig = Figure(figsize=(6, 4))
-        fig.patch.set_facecolor(background_color)
-        ax = fig.add_subplot(111)
-        ax.set_facecolor(panel_color)
-        try:
-            import matplotlib
-            cmap = matplotlib.colormaps["viridis"]
-            colors = [cmap(i / len(values)) for i in range(len(values))]
-        except Exception:
-            colors = None
-        wedges, texts = ax.pie(
-            values,
-            labels=None,
-            autopct=None,
-            startangle=90,
-            colors=colors,
-            textprops={"color": text_color},
-            wedgeprops={"linewidth": 1.0, "edgecolor": background_color if dark_mode else "#FFFFFF"},
-        )
-        legend_labels = [f"{cat}: RM {val:.2f}" for cat, val in zip(categories, values, strict=False)]
-        legend = ax.legend(
-            wedges,
-            legend_labels,
-            title="Categories",
-            loc="center left",
-            bbox_to_anchor=(1, 0.5),
-            facecolor=legend_face,
-            edgecolor=legend_border,
-        )
-        for text in legend.get_texts():
-            text.set_color(text_color)
-        legend.get_title().set_color(text_color)
-        ax.axis("equal")
-        ax.set_title(f"Monthly Expenses ({period_label})", color=text_color)
-        fig.tight_layout()
-
         help_text = (
             "This chart shows the expense distribution for the current month. "
             "Amounts include every expense transaction recorded for the selected period. "
@@ -3339,12 +4748,8 @@ class BudgetTracker(QMainWindow):
             f"Monthly Expenses ({period_label})",
             help_text,
         )
-        canvas = FigureCanvasQTAgg(fig)
-        window.set_canvas(canvas)
-        canvas.draw()
-        window.show()
-        window.raise_()
-        window.activateWindow()
+        self._present_chart_window(window)
+        self._refresh_chart("expense_pie_chart", window)
 
 
     def submit_default_transaction(self):
@@ -3354,6 +4759,7 @@ class BudgetTracker(QMainWindow):
         self.last_tx_type = ttype
         self.add_tx(ttype)
 
+    @traced("action.add_transaction")
     def add_tx(self, ttype: str):
         amt_text = self.amount_input.text().strip()
         if not amt_text:
@@ -3371,22 +4777,23 @@ class BudgetTracker(QMainWindow):
         raw_category = self.category_input.currentText().strip()
         if not raw_category:
             raw_category = "Savings" if ttype == "savings" else "General"
-        txid = next_tx_id()
         tx_date = date.today().isoformat()
 
-        ensure_writable(LEDGER_CSV)
-        with LEDGER_CSV.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([txid, tx_date, ttype, raw_category, f"{amt:.2f}", desc])
-        ensure_private_file(LEDGER_CSV)
-        self.undo_stack.append(("transaction", txid))
-        self.undo_stack = self.undo_stack[-20:]
+        def build() -> Command:
+            tx = {
+                "tx_id": self._next_tx_id(),
+                "date": tx_date,
+                "type": ttype,
+                "category": raw_category,
+                "amount_rm": f"{amt:.2f}",
+                "desc": desc,
+            }
+            return Command.addition(f"add {ttype}", normalize_transaction(tx))
 
-        self.load_ledger()
-        self.load_budgets()
-        self.refresh_category_options()
-        self.update_balance()
-        self.update_summary()
+        command = self.run_command(build)
+        if command is None:
+            return
+        self.command_log.record(command)
         self.clear_inputs()
 
         if ttype == "expense":
@@ -3402,6 +4809,7 @@ class BudgetTracker(QMainWindow):
                     )
         self.toast(f"{ttype.capitalize()} added.")
 
+    @traced("refresh.update_balance")
     def update_balance(self):
         positive = self.balance >= 0
         arrow = "^" if positive else "v"
@@ -3457,8 +4865,13 @@ class BudgetTracker(QMainWindow):
                 "rgba(99, 102, 241, 0)"     # End: transparent
             ]
             
+            def paint(color: str) -> None:
+                # The list may have been rebuilt (and this item deleted) before the timer fires.
+                if not _is_deleted(item):
+                    item.setBackground(QColor(color))
+
             for i, color in enumerate(colors):
-                QTimer.singleShot(i * 75, lambda c=color: item.setBackground(QColor(c)))
+                QTimer.singleShot(i * 75, lambda c=color: paint(c))
         
         animate_highlight()
         
@@ -3467,31 +4880,42 @@ class BudgetTracker(QMainWindow):
     
     def _animate_table_row(self, table, row, delay_ms):
         """Highlight table row with staggered indigo tint."""
+        def clear(item: QTableWidgetItem) -> None:
+            # The table may have been repopulated (and this item deleted) in the meantime.
+            if not _is_deleted(item):
+                item.setBackground(QColor())
+
         def animate_row():
+            if _is_deleted(table):
+                return
             for col in range(table.columnCount()):
                 item = table.item(row, col)
                 if item:
                     item.setBackground(QColor(99, 102, 241, 30))
-                    QTimer.singleShot(200, lambda: item.setBackground(QColor()))
+                    QTimer.singleShot(200, lambda item=item: clear(item))
         QTimer.singleShot(delay_ms, animate_row)
     
+    @traced("action.undo")
     def undo_last_transaction(self):
-        if not self.undo_stack:
+        label = self.command_log.undo_label()
+        if label is None:
             self.toast("Nothing to undo.", 3000)
             return
-        action, txid = self.undo_stack.pop()
-        if action != "transaction":
-            self.toast("Nothing to undo.", 3000)
+        if self.command_log.undo(lambda command: self.run_command(lambda: command, select=True) is not None) is None:
+            self.toast(f"Unable to undo {label}.", 4000)
+            return
+        self.toast(f"Undid {label}.", 4000)
+
+    @traced("action.redo")
+    def redo_last_transaction(self):
+        label = self.command_log.redo_label()
+        if label is None:
+            self.toast("Nothing to redo.", 3000)
             return
-        if not self._remove_transaction_by_id(txid):
-            self.toast("Unable to undo last transaction.", 4000)
+        if self.command_log.redo(lambda command: self.run_command(lambda: command, select=True) is not None) is None:
+            self.toast(f"Unable to redo {label}.", 4000)
             return
-        self.load_ledger()
-        self.load_budgets()
-        self.refresh_category_options()
-        self.update_balance()
-        self.update_summary()
-        self.toast("Last transaction undone.", 4000)
+        self.toast(f"Redid {label}.", 4000)
 
     def clear_inputs(self):
         self.amount_input.clear()
@@ -3564,15 +4988,83 @@ def install_ctrl_c_quit(app: QApplication) -> None:
         pass
 
 
+class _FirstPaintWatcher(QObject):
+    """Ends the startup profile at the main window's first paint and reports it."""
+
+    def __init__(self, window: QWidget, output: Path | None, quit_after: bool):
+        super().__init__(window)
+        self._window = window
+        self._output = output
+        self._quit_after = quit_after
+        self.shown_at = time.perf_counter()
+        window.installEventFilter(self)
+
+    def eventFilter(self, a0, a1) -> bool:
+        if a0 is self._window and a1.type() == QEvent.Paint:
+            self._window.removeEventFilter(self)
+            STARTUP_PROFILE.record("startup.first_paint", self.shown_at, time.perf_counter(), kind="section")
+            QTimer.singleShot(0, self._report)
+        return False
+
+    def _report(self) -> None:
+        report = STARTUP_PROFILE.finish()
+        print(format_startup_report(report), file=sys.stderr)
+        if self._output is not None:
+            try:
+                save_startup_report(report, self._output)
+            except OSError as exc:
+                print(f"Could not save startup profile: {exc}", file=sys.stderr)
+        if self._quit_after:
+            QApplication.quit()
+
+
+def _profile_argument(argv: list[str]) -> str | None:
+    for position, arg in enumerate(argv):
+        if arg.startswith("--profile="):
+            return arg.split("=", 1)[1]
+        if arg == "--profile" and position + 1 < len(argv):
+            return argv[position + 1]
+    return None
+
+
+def _startup_profile_output(argv: list[str]) -> Path | None:
+    for arg in argv:
+        if arg.startswith(STARTUP_PROFILE_FLAG + "="):
+            return Path(arg.split("=", 1)[1])
+    return None
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    install_ctrl_c_quit(app)
-    # Set application-wide icon (affects taskbar/dock on many systems)
+    STARTUP_PROFILE.record("startup.imports", STARTUP_PROFILE.origin, time.perf_counter(), kind="section")
+    if not enable_tracing_from_environment() and ENABLE_INSTRUMENTATION:
+        TRACER.enable()
+    memory_setting = os.environ.get("FINFIX_MEMPROFILE", "").strip()
+    if ENABLE_MEMORY_TRACING or memory_setting not in ("", "0"):
+        if memory_setting.isdigit() and memory_setting != "1":
+            start_memory_tracing(int(memory_setting))
+        else:
+            start_memory_tracing()
+    with STARTUP_PROFILE.section("startup.qapplication"):
+        app = QApplication(sys.argv)
+        install_ctrl_c_quit(app)
+        # Set application-wide icon (affects taskbar/dock on many systems)
+        try:
+            app.setWindowIcon(get_app_icon())
+        except Exception:
+            pass
+    profile = _profile_argument(sys.argv[1:]) or load_active_profile()
     try:
-        app.setWindowIcon(get_app_icon())
-    except Exception:
-        pass
-    win = BudgetTracker()
+        use_profile(profile)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(2)
+    with STARTUP_PROFILE.section("startup.window"):
+        win = BudgetTracker()
+    watchdog_setting = os.environ.get("FINFIX_WATCHDOG", "").strip()
+    if ENABLE_STALL_WATCHDOG or watchdog_setting not in ("", "0"):
+        win.set_stall_watchdog(True, int(watchdog_setting) if watchdog_setting.isdigit() and watchdog_setting != "1" else STALL_THRESHOLD_MS)
+    if STARTUP_PROFILE.active:
+        _first_paint_watcher = _FirstPaintWatcher(win, _startup_profile_output(sys.argv[1:]), "--quit-after-startup" in sys.argv[1:])
     win.show()
     try:
         sys.exit(app.exec_())
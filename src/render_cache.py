@@ -0,0 +1,193 @@
+"""Content-addressed cache for rendered charts and exported images.
+
+Keys are SHA-256 digests of everything that affects the pixels: chart kind,
+period, theme, size/DPI and the aggregate values drawn. Identical inputs map to
+the same key, so an unchanged month is served from the in-memory LRU or the
+optional on-disk tier instead of being rendered again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from pathlib import Path
+
+
+def _canonical(value):
+    if isinstance(value, Decimal):
+        return f"{value:.2f}"
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(str(v) for v in value)
+    return value
+
+
+def cache_key(kind: str, period: str, theme: str, size: tuple[int, int], dpi: float, payload) -> str:
+    """Stable digest of a render's inputs; ``payload`` holds the aggregate values."""
+    document = {
+        "kind": kind,
+        "period": period,
+        "theme": theme,
+        "size": list(size),
+        "dpi": round(float(dpi), 3),
+        "payload": _canonical(payload),
+    }
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU of rendered bytes with an optional disk tier.
+
+    Both tiers evict least recently used entries once their byte budget is
+    exceeded. All methods are safe to call from render worker threads.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 48 * 1024 * 1024,
+        disk_dir: Path | None = None,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.disk_dir is not None:
+            try:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+                self._disk_bytes = sum(p.stat().st_size for p in self.disk_dir.glob("*/*.bin"))
+            except OSError:
+                self.disk_dir = None
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.bin"
+
+    def get(self, key: str, memory_only: bool = False) -> bytes | None:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+        if memory_only or self.disk_dir is None:
+            if not memory_only:
+                with self._lock:
+                    self.misses += 1
+            return None
+        path = self._disk_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+            self._store_memory(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        data = bytes(data)
+        with self._lock:
+            self._store_memory(key, data)
+        if self.disk_dir is None or len(data) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            existed = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes += len(data) - existed
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _store_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _evict_disk(self) -> None:
+        assert self.disk_dir is not None
+        entries = []
+        for path in self.disk_dir.glob("*/*.bin"):
+            try:
+                info = path.stat()
+            except OSError:
+                continue
+            entries.append((info.st_mtime, info.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*/*.bin"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
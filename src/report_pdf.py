@@ -0,0 +1,582 @@
+"""Vector PDF reports painted straight from month summaries.
+
+The report engine never looks at the live window: it takes the plain data from
+``finfix.core.month_summary`` and paints KPIs, the category table, charts,
+alerts and the forecast as vector content onto a ``QPdfWriter``. Long tables
+flow onto extra pages, and several months can share one document. The same
+pages can be rasterized to PNG. Only a ``QGuiApplication`` is needed, so
+reports also run under the offscreen platform:
+
+    python report_pdf.py --from 2025-01 --to 2025-12 --output finfix_2025.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from PyQt5.QtCore import QMarginsF, QPointF, QRectF, Qt
+from PyQt5.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QGuiApplication,
+    QImage,
+    QPageLayout,
+    QPageSize,
+    QPainter,
+    QPainterPath,
+    QPdfWriter,
+    QPen,
+)
+
+from finfix.core import DEFAULT_DATA_DIR, month_range, month_summary, read_budgets, read_transactions
+
+RESOLUTION = 72  # one device unit per PostScript point
+PAGE_MARGINS = QMarginsF(16, 16, 16, 12)  # millimetres
+PALETTE = {
+    "title": "#1B5E20",
+    "section": "#3949AB",
+    "text": "#212121",
+    "muted": "#5F6368",
+    "border": "#DADFE6",
+    "panel": "#F4F6FB",
+    "positive": "#2E7D32",
+    "negative": "#C62828",
+    "warning": "#EF6C00",
+    "outline": "#1565C0",
+    "sparkline": "#4CAF50",
+}
+# Sampled from matplotlib's viridis so printed pies match the on-screen chart.
+PIE_COLORS = [
+    "#440154", "#482878", "#3E4A89", "#31688E", "#26828E",
+    "#1F9E89", "#35B779", "#6DCD59", "#B4DE2C", "#FDE725",
+]
+
+_app: QGuiApplication | None = None
+
+
+def ensure_gui_application() -> QGuiApplication:
+    """Return a QGuiApplication, creating an offscreen one when running headless."""
+    global _app
+    app = QGuiApplication.instance()
+    if app is not None:
+        return app  # type: ignore[return-value]
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    _app = QGuiApplication([sys.argv[0] if sys.argv else "finfix"])
+    return _app
+
+
+def _font(size: float, bold: bool = False) -> QFont:
+    font = QFont("Helvetica")
+    font.setPointSizeF(size)
+    font.setBold(bold)
+    return font
+
+
+def _rm(value) -> str:
+    return f"RM {value:.2f}"
+
+
+class _PdfPages:
+    """A4 pages of a QPdfWriter, in points."""
+
+    def __init__(self, path: Path, title: str):
+        self.writer = QPdfWriter(str(path))
+        self.writer.setResolution(RESOLUTION)
+        self.writer.setTitle(title)
+        self.writer.setCreator("FinFix")
+        self.writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        self.writer.setPageMargins(PAGE_MARGINS, QPageLayout.Unit.Millimeter)
+        self.page_size = (float(self.writer.width()), float(self.writer.height()))
+
+    def begin(self) -> QPainter:
+        painter = QPainter(self.writer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        return painter
+
+    def next_page(self, painter: QPainter) -> QPainter:
+        self.writer.newPage()
+        return painter
+
+
+class _ImagePages:
+    """A4-sized raster pages; painted in points and scaled to ``dpi``."""
+
+    def __init__(self, dpi: float):
+        self.scale = dpi / RESOLUTION
+        page = QPageSize(QPageSize.PageSizeId.A4).size(QPageSize.Unit.Point)
+        self.paper = (page.width(), page.height())
+        mm = PAGE_MARGINS
+        self.margins = QMarginsF(*(value * 72 / 25.4 for value in (mm.left(), mm.top(), mm.right(), mm.bottom())))
+        self.page_size = (
+            self.paper[0] - self.margins.left() - self.margins.right(),
+            self.paper[1] - self.margins.top() - self.margins.bottom(),
+        )
+        self.images: list[QImage] = []
+
+    def begin(self) -> QPainter:
+        image = QImage(
+            int(round(self.paper[0] * self.scale)),
+            int(round(self.paper[1] * self.scale)),
+            QImage.Format.Format_RGB32,
+        )
+        image.fill(QColor("#FFFFFF"))
+        # 72 dpi keeps font point sizes equal to painter units, as on the PDF writer.
+        dots_per_meter = int(round(RESOLUTION / 0.0254))
+        image.setDotsPerMeterX(dots_per_meter)
+        image.setDotsPerMeterY(dots_per_meter)
+        self.images.append(image)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+        painter.scale(self.scale, self.scale)
+        painter.translate(self.margins.left(), self.margins.top())
+        return painter
+
+    def next_page(self, painter: QPainter) -> QPainter:
+        painter.end()
+        return self.begin()
+
+
+class _ReportCanvas:
+    """QPainter over a paged device with a flowing cursor and automatic page breaks."""
+
+    FOOTER = 20.0
+
+    def __init__(self, pages, footer_text: str = "FinFix"):
+        self.pages = pages
+        self.painter = pages.begin()
+        self.width, self.height = pages.page_size
+        self.y = 0.0
+        self.page = 1
+        self.footer_text = footer_text
+
+    def ensure_space(self, height: float) -> bool:
+        """Start a new page unless ``height`` fits; return True if a page was added."""
+        if self.y + height <= self.height - self.FOOTER:
+            return False
+        self.new_page()
+        return True
+
+    def new_page(self) -> None:
+        self._paint_footer()
+        self.painter = self.pages.next_page(self.painter)
+        self.page += 1
+        self.y = 0.0
+
+    def finish(self) -> None:
+        self._paint_footer()
+        self.painter.end()
+
+    def _paint_footer(self) -> None:
+        rect = QRectF(0, self.height - self.FOOTER + 6, self.width, self.FOOTER - 6)
+        self.text(rect, f"{self.footer_text}  •  Page {self.page}", 8, PALETTE["muted"], align=Qt.AlignmentFlag.AlignCenter)
+
+    def text(
+        self,
+        rect: QRectF,
+        value: str,
+        size: float,
+        color: str,
+        bold: bool = False,
+        align=Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+    ) -> None:
+        self.painter.setFont(_font(size, bold))
+        self.painter.setPen(QColor(color))
+        self.painter.drawText(rect, int(align), value)
+
+    def box(self, rect: QRectF, fill: str | None = None, border: str | None = PALETTE["border"], radius: float = 6) -> None:
+        self.painter.setPen(QPen(QColor(border), 0.8) if border else Qt.PenStyle.NoPen)
+        self.painter.setBrush(QBrush(QColor(fill)) if fill else Qt.BrushStyle.NoBrush)
+        self.painter.drawRoundedRect(rect, radius, radius)
+
+    def section_title(self, title: str) -> None:
+        self.ensure_space(40)
+        self.y += 10
+        self.text(QRectF(0, self.y, self.width, 18), title.upper(), 10, PALETTE["section"], bold=True)
+        self.y += 22
+
+
+class ReportWriter:
+    """Paints one or more month summaries onto PDF or raster pages."""
+
+    def __init__(self, pages, title: str = "FinFix Monthly Report"):
+        ensure_gui_application()
+        self.pages = pages
+        self.title = title
+        self.canvas = _ReportCanvas(pages, title)
+        self._months = 0
+
+    def add_month(self, summary: dict) -> None:
+        canvas = self.canvas
+        if self._months:
+            canvas.new_page()
+        self._months += 1
+        canvas.footer_text = f"{self.title}  •  {summary['period_label']}"
+        self._header(summary)
+        self._kpis(summary)
+        self._category_table(summary)
+        self._charts(summary)
+        self._alerts_and_forecast(summary)
+
+    def close(self) -> None:
+        self.canvas.finish()
+
+    def _header(self, summary: dict) -> None:
+        canvas = self.canvas
+        canvas.text(QRectF(0, canvas.y, canvas.width, 26), self.title, 18, PALETTE["title"], bold=True)
+        canvas.text(
+            QRectF(0, canvas.y, canvas.width, 26),
+            f"Generated {date.today().isoformat()}",
+            8,
+            PALETTE["muted"],
+            align=Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+        )
+        canvas.y += 28
+        count = summary["transaction_count"]
+        canvas.text(
+            QRectF(0, canvas.y, canvas.width, 16),
+            f"{summary['period_label']}  •  {count} transaction{'s' if count != 1 else ''}  •  Net {_rm(summary['net'])}",
+            11,
+            PALETTE["text"],
+        )
+        canvas.y += 22
+
+    def _kpis(self, summary: dict) -> None:
+        canvas = self.canvas
+        totals = summary["totals"]
+        previous = summary.get("previous_totals")
+        metrics = [
+            ("Income", "income", totals["income"], previous["income"] if previous else None),
+            ("Spending", "expense", totals["expense"], previous["expense"] if previous else None),
+            ("Savings", "savings", totals["savings_balance"], previous["savings_balance"] if previous else None),
+            (
+                "Net",
+                "net",
+                totals["income"] - totals["expense"],
+                (previous["income"] - previous["expense"]) if previous else None,
+            ),
+        ]
+        gap = 8.0
+        card_width = (canvas.width - gap * 3) / 4
+        height = 58.0
+        canvas.ensure_space(height + 6)
+        for idx, (label, key, value, prev_value) in enumerate(metrics):
+            x = idx * (card_width + gap)
+            rect = QRectF(x, canvas.y, card_width, height)
+            canvas.box(rect, fill=PALETTE["panel"])
+            inner = rect.adjusted(8, 6, -8, -6)
+            canvas.text(QRectF(inner.x(), inner.y(), inner.width(), 12), label, 8, PALETTE["muted"], bold=True)
+            value_color = PALETTE["text"]
+            if key == "net":
+                value_color = PALETTE["positive"] if value >= 0 else PALETTE["negative"]
+            canvas.text(QRectF(inner.x(), inner.y() + 14, inner.width(), 18), _rm(value), 13, value_color, bold=True)
+            if prev_value is not None:
+                diff = value - prev_value
+                arrow = "▲" if diff > 0 else ("▼" if diff < 0 else "■")
+                canvas.text(
+                    QRectF(inner.x(), inner.y() + 34, inner.width(), 12),
+                    f"{arrow} {_rm(abs(diff))} vs last month",
+                    7,
+                    PALETTE["muted"],
+                )
+        canvas.y += height + 6
+
+    def _category_table(self, summary: dict) -> None:
+        canvas = self.canvas
+        canvas.section_title("Category breakdown")
+        rows = summary["categories"]
+        if not rows:
+            canvas.text(QRectF(0, canvas.y, canvas.width, 14), "No spending recorded for this month.", 9, PALETTE["muted"])
+            canvas.y += 18
+            return
+        columns = [("Category", 0.40), ("Spent", 0.15), ("Budget", 0.15), ("Variance", 0.15), ("Used", 0.15)]
+        row_height = 17.0
+
+        def header() -> None:
+            canvas.box(QRectF(0, canvas.y, canvas.width, row_height), fill="#ECEFF1", border=None, radius=3)
+            x = 0.0
+            for name, share in columns:
+                align = Qt.AlignmentFlag.AlignLeft if name == "Category" else Qt.AlignmentFlag.AlignRight
+                canvas.text(
+                    QRectF(x + 6, canvas.y, canvas.width * share - 12, row_height),
+                    name,
+                    8,
+                    "#37474F",
+                    bold=True,
+                    align=align | Qt.AlignmentFlag.AlignVCenter,
+                )
+                x += canvas.width * share
+            canvas.y += row_height
+
+        canvas.ensure_space(row_height * 2)
+        header()
+        for index, row in enumerate(rows):
+            if canvas.ensure_space(row_height):
+                header()
+            if index % 2:
+                canvas.box(QRectF(0, canvas.y, canvas.width, row_height), fill="#F8FAFE", border=None, radius=0)
+            used = row["used_percent"]
+            color = PALETTE["text"]
+            if used is not None and used > 100:
+                color = PALETTE["negative"]
+            elif used is not None and used >= 80:
+                color = PALETTE["warning"]
+            cells = [
+                row["category"],
+                _rm(row["spent"]),
+                _rm(row["budget"]) if row["budget"] is not None else "--",
+                _rm(row["variance"]) if row["variance"] is not None else "--",
+                f"{used:.0f}%" if used is not None else "--",
+            ]
+            x = 0.0
+            for (name, share), value in zip(columns, cells):
+                align = Qt.AlignmentFlag.AlignLeft if name == "Category" else Qt.AlignmentFlag.AlignRight
+                canvas.text(
+                    QRectF(x + 6, canvas.y, canvas.width * share - 12, row_height),
+                    value,
+                    8.5,
+                    color,
+                    align=align | Qt.AlignmentFlag.AlignVCenter,
+                )
+                x += canvas.width * share
+            canvas.y += row_height
+
+    def _charts(self, summary: dict) -> None:
+        canvas = self.canvas
+        chart_height = 170.0
+        sparkline_height = 64.0
+        canvas.ensure_space(40 + chart_height + sparkline_height + 16)
+        canvas.section_title("Charts")
+        half = (canvas.width - 10) / 2
+        self._expense_pie(QRectF(0, canvas.y, half, chart_height), summary)
+        self._savings_batteries(QRectF(half + 10, canvas.y, half, chart_height), summary)
+        canvas.y += chart_height + 10
+        self._sparkline(QRectF(0, canvas.y, canvas.width, sparkline_height), summary)
+        canvas.y += sparkline_height + 6
+
+    def _expense_pie(self, rect: QRectF, summary: dict) -> None:
+        canvas = self.canvas
+        painter = canvas.painter
+        canvas.box(rect)
+        canvas.text(QRectF(rect.x() + 8, rect.y() + 4, rect.width() - 16, 14), "Expenses by category", 9, PALETTE["text"], bold=True)
+        slices = [(row["category"], row["spent"]) for row in summary["categories"] if row["spent"] > 0]
+        total = sum((amount for _, amount in slices), Decimal("0.00"))
+        if total <= 0:
+            canvas.text(rect, "No expenses recorded.", 8, PALETTE["muted"], align=Qt.AlignmentFlag.AlignCenter)
+            return
+        diameter = min(rect.height() - 34, rect.width() * 0.45)
+        pie_rect = QRectF(rect.x() + 10, rect.y() + 24, diameter, diameter)
+        start = 90.0
+        legend_x = pie_rect.right() + 10
+        legend_y = rect.y() + 24
+        max_legend = int((rect.bottom() - legend_y - 4) // 12)
+        for index, (category, amount) in enumerate(slices):
+            color = QColor(PIE_COLORS[(index * len(PIE_COLORS)) // len(slices)])
+            sweep = 360.0 * float(amount / total)
+            painter.setPen(QPen(QColor("#FFFFFF"), 0.8))
+            painter.setBrush(QBrush(color))
+            painter.drawPie(pie_rect, int(start * 16), int(round(sweep * 16)))
+            start += sweep
+            if index < max_legend:
+                y = legend_y + index * 12
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.drawRect(QRectF(legend_x, y + 2, 7, 7))
+                canvas.text(
+                    QRectF(legend_x + 11, y, rect.right() - legend_x - 16, 11),
+                    f"{category}: {_rm(amount)}",
+                    7,
+                    PALETTE["text"],
+                )
+        hidden = len(slices) - max_legend
+        if hidden > 0:
+            canvas.text(
+                QRectF(legend_x, legend_y + max_legend * 12, rect.right() - legend_x - 8, 11),
+                f"+{hidden} more",
+                7,
+                PALETTE["muted"],
+            )
+
+    def _savings_batteries(self, rect: QRectF, summary: dict) -> None:
+        canvas = self.canvas
+        painter = canvas.painter
+        canvas.box(rect)
+        canvas.text(QRectF(rect.x() + 8, rect.y() + 4, rect.width() - 16, 14), "Savings balance", 9, PALETTE["text"], bold=True)
+        entries = summary["savings_by_category"]
+        if not entries:
+            canvas.text(rect, "No savings balance.", 8, PALETTE["muted"], align=Qt.AlignmentFlag.AlignCenter)
+            return
+        max_value = max(amount for _, amount in entries)
+        label_width = rect.width() * 0.28
+        area = QRectF(rect.x() + 8 + label_width, rect.y() + 24, rect.width() - label_width - 26, rect.height() - 30)
+        row_height = min(22.0, area.height() / len(entries))
+        for index, (category, amount) in enumerate(entries):
+            y = area.y() + index * row_height
+            if y + row_height > rect.bottom():
+                break
+            cell = QRectF(area.x(), y + row_height * 0.2, area.width(), row_height * 0.6)
+            canvas.text(QRectF(rect.x() + 8, y, label_width - 4, row_height), category, 7, PALETTE["text"])
+            ratio = float(amount / max_value)
+            if ratio >= 0.75:
+                fill = "#2E7D32"
+            elif ratio >= 0.4:
+                fill = "#F9A825"
+            else:
+                fill = "#E64A19"
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QBrush(QColor(fill)))
+            painter.drawRect(QRectF(cell.x(), cell.y() + 1.5, cell.width() * ratio, cell.height() - 3))
+            painter.setPen(QPen(QColor(PALETTE["outline"]), 1.2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(cell)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QBrush(QColor(PALETTE["outline"])))
+            painter.drawRect(QRectF(cell.right(), cell.y() + cell.height() * 0.25, 4, cell.height() * 0.5))
+            label_inside = ratio > 0.35
+            if label_inside:
+                label_rect = QRectF(cell.x() + 4, cell.y(), cell.width() * ratio - 8, cell.height())
+                align = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            else:
+                label_rect = QRectF(cell.x() + cell.width() * ratio + 4, cell.y(), cell.width(), cell.height())
+                align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            canvas.text(label_rect, _rm(amount), 6.5, "#FFFFFF" if label_inside else PALETTE["text"], align=align)
+
+    def _sparkline(self, rect: QRectF, summary: dict) -> None:
+        canvas = self.canvas
+        painter = canvas.painter
+        canvas.box(rect)
+        canvas.text(QRectF(rect.x() + 8, rect.y() + 4, rect.width() - 16, 12), "Daily spend (cumulative)", 8, PALETTE["text"], bold=True)
+        days = summary["days_in_month"]
+        daily = summary["daily_expense"]
+        running = Decimal("0.00")
+        cumulative = []
+        for day in range(1, days + 1):
+            running += daily.get(day, Decimal("0.00"))
+            cumulative.append(float(running))
+        peak = max(cumulative) if cumulative else 0.0
+        plot = rect.adjusted(10, 20, -10, -8)
+        if peak <= 0:
+            canvas.text(plot, "No spending this month.", 7, PALETTE["muted"], align=Qt.AlignmentFlag.AlignCenter)
+            return
+
+        def point(index: int, value: float) -> QPointF:
+            x = plot.x() + plot.width() * (index / max(1, days - 1))
+            y = plot.bottom() - plot.height() * (value / (peak * 1.1))
+            return QPointF(x, y)
+
+        line = QPainterPath(point(0, cumulative[0]))
+        for index, value in enumerate(cumulative[1:], start=1):
+            line.lineTo(point(index, value))
+        area = QPainterPath(line)
+        area.lineTo(QPointF(plot.right(), plot.bottom()))
+        area.lineTo(QPointF(plot.x(), plot.bottom()))
+        area.closeSubpath()
+        fill = QColor(PALETTE["sparkline"])
+        fill.setAlphaF(0.15)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(fill))
+        painter.drawPath(area)
+        painter.setPen(QPen(QColor(PALETTE["sparkline"]), 1.6))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(line)
+        canvas.text(
+            QRectF(rect.x() + 8, rect.y() + 4, rect.width() - 16, 12),
+            f"Month total {_rm(running)}",
+            7,
+            PALETTE["muted"],
+            align=Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+        )
+
+    def _alerts_and_forecast(self, summary: dict) -> None:
+        canvas = self.canvas
+        alerts = summary["alerts"]
+        if alerts:
+            canvas.section_title("Alerts")
+            for alert in alerts:
+                canvas.ensure_space(14)
+                canvas.text(QRectF(8, canvas.y, canvas.width - 8, 13), f"• {alert}", 8.5, PALETTE["text"])
+                canvas.y += 14
+        forecast = summary.get("forecast")
+        if forecast is not None:
+            canvas.section_title("Forecast")
+            canvas.ensure_space(14)
+            canvas.text(
+                QRectF(0, canvas.y, canvas.width, 13),
+                f"Forecast month-end: {_rm(forecast['net_forecast'])}  |  Safe-to-spend today: {_rm(forecast['safe_to_spend'])}",
+                9,
+                PALETTE["text"],
+            )
+            canvas.y += 16
+
+
+def render_report_pdf(path: Path, summaries: list[dict], title: str = "FinFix Monthly Report") -> Path:
+    """Write ``summaries`` (one per month) to a single vector PDF at ``path``."""
+    ensure_gui_application()
+    path = Path(path)
+    report = ReportWriter(_PdfPages(path, title), title)
+    try:
+        for summary in summaries:
+            report.add_month(summary)
+    finally:
+        report.close()
+    return path
+
+
+def render_report_images(summary: dict, dpi: float = 150.0, title: str = "FinFix Monthly Report") -> list[QImage]:
+    """Rasterize one month's report; long category tables yield more than one page."""
+    ensure_gui_application()
+    pages = _ImagePages(dpi)
+    report = ReportWriter(pages, title)
+    try:
+        report.add_month(summary)
+    finally:
+        report.close()
+    return pages.images
+
+
+def render_report_png(path: Path, summary: dict, dpi: float = 150.0) -> list[Path]:
+    """Save a month's report as PNG; extra pages go next to it as ``<name>_p2.png`` etc."""
+    path = Path(path)
+    written = []
+    for index, image in enumerate(render_report_images(summary, dpi)):
+        target = path if index == 0 else path.with_name(f"{path.stem}_p{index + 1}{path.suffix}")
+        if not image.save(str(target), "PNG"):
+            raise OSError(f"could not write {target}")
+        written.append(target)
+    return written
+
+
+def _parse_period(text: str) -> tuple[int, int]:
+    year_text, _, month_text = text.partition("-")
+    year, month = int(year_text), int(month_text)
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(f"invalid month: {text}")
+    return year, month
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Render FinFix monthly reports to a vector PDF.")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="folder holding transactions.csv and budgets.csv")
+    parser.add_argument("--from", dest="start", type=_parse_period, required=True, help="first month, YYYY-MM")
+    parser.add_argument("--to", dest="end", type=_parse_period, help="last month, YYYY-MM (defaults to --from)")
+    parser.add_argument("--compare", action="store_true", help="show deltas against the previous month")
+    parser.add_argument("--output", type=Path, required=True, help="PDF file to write")
+    args = parser.parse_args(argv)
+
+    transactions = read_transactions(args.data_dir / "transactions.csv")
+    budgets = read_budgets(args.data_dir / "budgets.csv")
+    periods = month_range(args.start, args.end or args.start)
+    summaries = [month_summary(transactions, budgets, year, month, compare=args.compare) for year, month in periods]
+    render_report_pdf(args.output, summaries)
+    print(f"Wrote {len(summaries)} month(s) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
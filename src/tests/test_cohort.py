@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+from finfix.cohort import CohortTotals, build_report
+
+HEADER = "tx_id,date,type,category,amount_rm,desc\n"
+
+
+def _report(tmp_path, ledgers: list[list[tuple[str, str, str]]], min_cell: int) -> dict:
+    """Report over one folder per entry of ``ledgers``, each a list of March rows ``(type, category, amount)``."""
+    totals = CohortTotals()
+    for number, rows in enumerate(ledgers):
+        folder = tmp_path / f"student{number}"
+        folder.mkdir()
+        lines = [f"TX{index:03d},2025-03-{index:02d},{kind},{category},{amount},x\n" for index, (kind, category, amount) in enumerate(rows, 1)]
+        (folder / "transactions.csv").write_text(HEADER + "".join(lines), encoding="utf-8")
+        totals.add_ledger(folder)
+    return build_report(totals, min_cell=min_cell)
+
+
+def test_single_hidden_category_cannot_be_recovered_from_expense(tmp_path):
+    ledgers = [[("expense", "Food", "10.00"), ("expense", "Transport", "2.00")] for _ in range(5)]
+    ledgers[0].append(("expense", "Therapy", "123.45"))
+    (month,) = _report(tmp_path, ledgers, min_cell=5)["months"]
+
+    published = {item["category"]: item["total"] for item in month["categories"]}
+    assert "Therapy" not in published
+    assert "Transport" not in published  # the next-smallest cell is hidden with it
+    assert month["expense"] - sum(published.values()) != Decimal("123.45")
+
+
+def test_single_hidden_category_without_a_complement_hides_the_expense(tmp_path):
+    ledgers = [[("income", "", "100.00")] for _ in range(5)]
+    ledgers[0].append(("expense", "Therapy", "123.45"))
+    (month,) = _report(tmp_path, ledgers, min_cell=5)["months"]
+
+    assert month["categories"] == []
+    assert month["expense"] is None
+
+
+def test_cells_above_min_cell_are_published(tmp_path):
+    ledgers = [[("expense", "Food", "10.00"), ("expense", "Transport", "2.00")] for _ in range(5)]
+    (month,) = _report(tmp_path, ledgers, min_cell=5)["months"]
+
+    assert {item["category"]: item["total"] for item in month["categories"]} == {"Food": Decimal("50.00"), "Transport": Decimal("10.00")}
+    assert month["expense"] == Decimal("60.00")
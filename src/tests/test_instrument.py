@@ -0,0 +1,19 @@
+import pytest
+
+from finfix.instrument import percentile
+
+
+@pytest.mark.parametrize(
+    ("values", "fraction", "expected"),
+    [
+        (list(range(1, 11)), 0.50, 5),
+        (list(range(1, 11)), 0.90, 9),
+        (list(range(1, 101)), 0.99, 99),
+        (list(range(1, 11)), 0.70, 7),
+        (list(range(1, 11)), 1.00, 10),
+        (list(range(1, 11)), 0.0, 1),
+        ([], 0.5, 0.0),
+    ],
+)
+def test_percentile_is_nearest_rank(values, fraction, expected):
+    assert percentile(values, fraction) == expected